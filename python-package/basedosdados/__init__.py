@@ -1,35 +1,107 @@
 """
-Importing the module will automatically import the submodules.
+Importing the module makes all of its functions and classes available, but
+their submodules (and the Google Cloud and pandas libraries behind them) are
+only imported when first used.
 """
 
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from basedosdados._version import __version__
-from basedosdados.backend import Backend
 from basedosdados.constants import config, constants
-from basedosdados.core.base import Base
-from basedosdados.download.download import download, read_sql, read_table
-from basedosdados.download.metadata import (
-    get_columns,
-    get_datasets,
-    get_tables,
-    search,
-)
-from basedosdados.upload.connection import Connection
-from basedosdados.upload.dataset import Dataset
-from basedosdados.upload.storage import Storage
-from basedosdados.upload.table import Table
+
+if TYPE_CHECKING:
+    from basedosdados.async_backend import AsyncBackend
+    from basedosdados.backend import Backend
+    from basedosdados.core.base import Base
+    from basedosdados.download.catalog import CatalogSnapshot
+    from basedosdados.download.download import (
+        download,
+        download_many,
+        estimate_bytes_processed,
+        iter_sql,
+        read_sql,
+        read_table,
+    )
+    from basedosdados.download.metadata import (
+        get_columns,
+        get_datasets,
+        get_tables,
+        iter_columns,
+        iter_datasets,
+        iter_tables,
+        search,
+    )
+    from basedosdados.upload.connection import Connection
+    from basedosdados.upload.dataset import Dataset
+    from basedosdados.upload.storage import Storage
+    from basedosdados.upload.table import Table
+
+# Module in which each lazily imported attribute is defined
+_LAZY_ATTRIBUTES = {
+    "AsyncBackend": "basedosdados.async_backend",
+    "Backend": "basedosdados.backend",
+    "Base": "basedosdados.core.base",
+    "CatalogSnapshot": "basedosdados.download.catalog",
+    "download": "basedosdados.download.download",
+    "download_many": "basedosdados.download.download",
+    "estimate_bytes_processed": "basedosdados.download.download",
+    "iter_sql": "basedosdados.download.download",
+    "read_sql": "basedosdados.download.download",
+    "read_table": "basedosdados.download.download",
+    "get_columns": "basedosdados.download.metadata",
+    "get_datasets": "basedosdados.download.metadata",
+    "get_tables": "basedosdados.download.metadata",
+    "iter_columns": "basedosdados.download.metadata",
+    "iter_datasets": "basedosdados.download.metadata",
+    "iter_tables": "basedosdados.download.metadata",
+    "search": "basedosdados.download.metadata",
+    "Connection": "basedosdados.upload.connection",
+    "Dataset": "basedosdados.upload.dataset",
+    "Storage": "basedosdados.upload.storage",
+    "Table": "basedosdados.upload.table",
+}
+
+# The `download` subpackage is bound to this module when it is first
+# imported, which would hide the `download` function. Import it now and
+# unbind it, so that `download` always resolves to the function.
+importlib.import_module("basedosdados.download")
+del globals()["download"]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
 
 __all__ = [
     "__version__",
+    "AsyncBackend",
     "Backend",
     "config",
     "constants",
     "Base",
+    "CatalogSnapshot",
     "download",
+    "download_many",
+    "estimate_bytes_processed",
+    "iter_sql",
     "read_sql",
     "read_table",
     "get_columns",
     "get_datasets",
     "get_tables",
+    "iter_columns",
+    "iter_datasets",
+    "iter_tables",
     "search",
     "Connection",
     "Dataset",
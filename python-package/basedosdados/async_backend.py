@@ -0,0 +1,473 @@
+"""
+Module for interacting with the backend from asyncio code.
+"""
+
+import asyncio
+import copy
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+try:
+    from gql import Client, gql
+    from gql.transport.exceptions import TransportServerError
+
+    _backend_dependencies = True
+except ImportError:
+    _backend_dependencies = False
+
+try:
+    import aiohttp
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    _aiohttp_dependencies = True
+except ImportError:
+    _aiohttp_dependencies = False
+
+from basedosdados.backend import (
+    _DATASET_CONFIG_QUERY,
+    _RETRIES,
+    _RETRY_BACKOFF_FACTOR,
+    _TIMEOUT,
+    _columns_query,
+    _dataset_config_from_response,
+    _datasets_query,
+    _is_cacheable,
+    _simplify_response,
+    _table_configs_from_response,
+    _table_configs_query,
+    _tables_query,
+)
+from basedosdados.constants import config, constants
+from basedosdados.exceptions import (
+    BaseDosDadosException,
+    BaseDosDadosMissingDependencyException,
+)
+
+if TYPE_CHECKING:
+    from gql.client import AsyncClientSession
+
+    from basedosdados.core.metadata_cache import MetadataCache
+
+# HTTP status codes of failed requests that are retried
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class AsyncBackend:
+    def __init__(
+        self,
+        search_url: Optional[str] = None,
+        graphql_url: Optional[str] = None,
+        cache: Optional["MetadataCache"] = None,
+        max_connections: Optional[int] = None,
+    ):
+        """
+        Backend class to communicate with the backend from asyncio code,
+        with the same methods as `Backend` as coroutines.
+
+        All requests share a single aiohttp session, opened on first use in
+        the running event loop, and failed requests are retried with
+        exponential backoff. Close it with `aclose`, or use the backend as
+        an async context manager.
+
+        Args:
+            search_url (str): URL of the search endpoint.
+            graphql_url (str): URL of the GraphQL endpoint.
+            cache (MetadataCache, optional): cache of the responses of the
+                backend. Defaults to None, which disables caching.
+            max_connections (int, optional): maximum number of connections
+                kept open to the backend. Defaults to
+                `config.max_connections`.
+        """
+        self.search_url: str = search_url or constants.BACKEND_SEARCH_URL.value
+        self.graphql_url: str = (
+            graphql_url or constants.BACKEND_GRAPHQL_URL.value
+        )
+        self.cache = cache
+        self.max_connections = max_connections or config.max_connections
+        self._graphql_client: Optional["Client"] = None
+        self._graphql_session: Optional["AsyncClientSession"] = None
+        self._graphql_session_lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closer: Optional[AsyncIterator[None]] = None
+
+    async def __aenter__(self) -> "AsyncBackend":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
+
+    async def graphql_session(self) -> "AsyncClientSession":
+        """
+        Session of the GraphQL client, connected on first use and shared by
+        all queries run in the same event loop.
+
+        The session is closed when its event loop shuts down, as in the end
+        of `asyncio.run`.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # sessions can't be used outside of the loop they were opened in,
+            # so the previous one is closed in its own loop, if still running
+            if self._graphql_session is not None and self._loop.is_running():
+                asyncio.run_coroutine_threadsafe(
+                    self._graphql_client.close_async(), self._loop
+                )
+            self._graphql_client = self._graphql_session = None
+            self._graphql_session_lock = asyncio.Lock()
+            self._loop = loop
+            self._closer = self._close_on_shutdown()
+            await self._closer.__anext__()
+
+        async with self._graphql_session_lock:
+            if self._graphql_session is None:
+                client = self._get_client()
+                self._graphql_session = await client.connect_async()
+                self._graphql_client = client
+            return self._graphql_session
+
+    async def _close_on_shutdown(self) -> AsyncIterator[None]:
+        """
+        Close the session once the event loop shuts down. The loop finalizes
+        the async generators still suspended, such as this one, while it can
+        still run them.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            yield
+        finally:
+            # unless a session was opened in another loop since
+            if self._loop is loop:
+                await self.aclose()
+
+    async def aclose(self) -> None:
+        """
+        Close the HTTP session. It is opened again by the next query.
+        """
+        if self._graphql_session is not None and (
+            self._loop is asyncio.get_running_loop()
+        ):
+            await self._graphql_client.close_async()
+        self._graphql_client = self._graphql_session = None
+
+    def invalidate_cache(
+        self, query: Optional[str] = None, variables: Optional[dict] = None
+    ) -> None:
+        """
+        Remove the cached response of a query, or all cached responses if
+        `query` is None.
+
+        Args:
+            query (str, optional): GraphQL query, or the search URL.
+            variables (dict, optional): variables of the query, or the
+                parameters of the search.
+        """
+        if self.cache is None:
+            return
+        self.cache.invalidate(
+            None if query is None else self.cache.key(query, variables)
+        )
+
+    async def get_datasets(
+        self,
+        dataset_id: Optional[str] = None,
+        dataset_name: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 10,
+    ):
+        """
+        Get a list of available datasets,
+        either by `dataset_id` or `dataset_name`
+
+        Args:
+            dataset_id(str): dataset slug in google big query (gbq).
+            dataset_name(str): dataset name in base dos dados metadata.
+
+            page(int): page for pagination.
+            page_size(int): page size for pagination.
+
+        Returns:
+            list[dict]: List of datasets.
+        """
+        query, variables = _datasets_query(
+            dataset_id, dataset_name, page, page_size
+        )
+        response = await self._execute_query(
+            query=query, variables=variables, page=page, page_size=page_size
+        )
+        return response.get("allDataset")
+
+    async def get_tables(
+        self,
+        dataset_id: Optional[str] = None,
+        table_id: Optional[str] = None,
+        table_name: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 10,
+    ):
+        """
+        Get a list of available tables,
+        either by `dataset_id`, `table_id` or `table_name`
+
+        Args:
+            dataset_id(str): dataset slug in google big query (gbq).
+            table_id(str): table slug in google big query (gbq).
+            table_name(str): table name in base dos dados metadata.
+
+            page(int): page for pagination.
+            page_size(int): page size for pagination.
+
+        Returns:
+            list[dict]: List of tables.
+        """
+        query, variables = _tables_query(
+            dataset_id, table_id, table_name, page, page_size
+        )
+        response = await self._execute_query(
+            query=query, variables=variables, page=page, page_size=page_size
+        )
+        return response.get("allTable")
+
+    async def get_columns(
+        self,
+        table_id: Optional[str] = None,
+        column_id: Optional[str] = None,
+        column_name: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 10,
+    ):
+        """
+        Get a list of available columns,
+        either by `table_id`, `column_id` or `column_name`
+
+        Args:
+            table_id(str): table slug in google big query (gbq).
+            column_id(str): column slug in google big query (gbq).
+            column_name(str): table name in base dos dados metadata.
+
+            page(int): page for pagination.
+            page_size(int): page size for pagination.
+
+        Returns:
+            list[dict]: List of columns.
+        """
+        query, variables = _columns_query(
+            table_id, column_id, column_name, page, page_size
+        )
+        response = await self._execute_query(
+            query=query, variables=variables, page=page, page_size=page_size
+        )
+        return response.get("allColumn")
+
+    async def search(
+        self, q: Optional[str] = None, page: int = 1, page_size: int = 10
+    ) -> dict[str, Any]:
+        """
+        Search for datasets, querying all available metadata for the term `q`
+
+        If the backend has a cache, expired results are revalidated with their
+        ETag, so unchanged results are not downloaded again.
+
+        Args:
+            q(str): search term.
+
+            page(int): page for pagination.
+            page_size(int): page size for pagination.
+
+        Returns:
+            dict: page of tables.
+        """
+        params = {"q": q, "page": page, "page_size": page_size}
+
+        key = entry = None
+        if self.cache is not None:
+            key = self.cache.key(self.search_url, params)
+            entry = self.cache.get(key)
+            if entry is not None and not entry.expired:
+                return copy.deepcopy(entry.value)
+
+        session = await self.graphql_session()
+        async with session.transport.session.get(
+            self.search_url,
+            # aiohttp doesn't drop empty parameters, as requests does
+            params={k: v for k, v in params.items() if v is not None},
+            headers={"If-None-Match": entry.etag} if entry else None,
+        ) as response:
+            if response.status == 304 and entry is not None:
+                self.cache.set(key, entry.value, etag=entry.etag)
+                return copy.deepcopy(entry.value)
+            if response.status not in [200]:
+                raise BaseDosDadosException(await response.text())
+            result = await response.json()
+            etag = response.headers.get("ETag")
+
+        if self.cache is not None:
+            self.cache.set(key, copy.deepcopy(result), etag=etag)
+        return result
+
+    async def get_dataset_config(self, dataset_id: str) -> Dict[str, Any]:
+        """
+        Get dataset configuration.
+
+        Args:
+            dataset_id (str): The ID for the dataset.
+        Returns:
+            Dict: Dataset configuration.
+        """
+        response = await self._execute_query(
+            query=_DATASET_CONFIG_QUERY,
+            variables={"gcp_dataset_id": dataset_id},
+        )
+        return _dataset_config_from_response(
+            dataset_id, response, self.graphql_url
+        )
+
+    async def get_table_config(
+        self, dataset_id: str, table_id: str
+    ) -> Dict[str, Any]:
+        """
+        Get table configuration.
+
+        Args:
+            dataset_id (str): The ID for the dataset.
+            table_id (str): The ID for the table.
+        Returns:
+            Dict: Table configuration.
+        """
+        configs = await self.get_table_configs([(dataset_id, table_id)])
+        return configs[0]
+
+    async def get_table_configs(
+        self, tables: List[Tuple[str, str]], batch_size: int = 50
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the configuration of many tables, in a single request per batch.
+        All batches are requested at the same time.
+
+        Args:
+            tables (List[Tuple[str, str]]): `(dataset_id, table_id)` pairs.
+            batch_size (int): maximum number of tables per request.
+        Returns:
+            List[Dict]: Configuration of each table, in the same order as
+                `tables`, or an empty dict for tables not found.
+        """
+        batches = [
+            tables[start : start + batch_size]  # noqa
+            for start in range(0, len(tables), batch_size)
+        ]
+        results = await asyncio.gather(
+            *(self._get_table_configs(batch) for batch in batches)
+        )
+        return [table for batch in results for table in batch]
+
+    async def _get_table_configs(
+        self, tables: List[Tuple[str, str]]
+    ) -> List[Dict[str, Any]]:
+        query, variables = _table_configs_query(tables)
+        response = (
+            await self._execute_query(query=query, variables=variables)
+            if variables
+            else {}
+        )
+        return _table_configs_from_response(tables, response, self.graphql_url)
+
+    def _get_client(self) -> "Client":
+        """
+        Get a GraphQL client on an aiohttp transport.
+
+        Returns:
+            Client: GraphQL client.
+        """
+        if not (_backend_dependencies and _aiohttp_dependencies):
+            raise BaseDosDadosMissingDependencyException(
+                "Optional dependencies for async backend interaction are not "
+                'installed. Please install basedosdados with the "async" '
+                "extra, such as:\n\npip install basedosdados[async]"
+            )
+        transport = AIOHTTPTransport(
+            url=self.graphql_url,
+            timeout=_TIMEOUT,
+            client_session_args={
+                "connector": aiohttp.TCPConnector(
+                    limit_per_host=self.max_connections
+                )
+            },
+        )
+        return Client(transport=transport)
+
+    async def _execute_query(
+        self,
+        query: str,
+        variables: Optional[Dict[str, Any]] = None,
+        page: int = 1,
+        page_size: int = 10,
+    ) -> Dict[str, Any]:
+        """
+        Execute a GraphQL query.
+
+        Responses are kept in the backend's cache, if any, keyed on the
+        query and its variables. Empty results are not kept, so that
+        metadata created afterwards is found.
+
+        Args:
+            query (str): GraphQL query.
+            variables (Dict[str, str], optional): Variables to be passed to
+                the query. Defaults to None.
+
+        Returns:
+            Dict: GraphQL response.
+        """
+        if not _backend_dependencies:
+            raise BaseDosDadosMissingDependencyException(
+                "Optional dependencies for backend interaction are not installed. "
+                'Please install basedosdados with the "upload" extra, such as:'
+                "\n\npip install basedosdados[upload]"
+            )
+
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(query, variables)
+            entry = self.cache.get(key)
+            if entry is not None:
+                return _simplify_response(entry.value, page, page_size)
+
+        session = await self.graphql_session()
+        for attempt in range(_RETRIES + 1):
+            try:
+                response = await session.execute(
+                    gql(query), variable_values=variables
+                )
+                break
+            except Exception as e:
+                if _is_retryable(e) and attempt < _RETRIES:
+                    await asyncio.sleep(_RETRY_BACKOFF_FACTOR * 2**attempt)
+                    continue
+                msg = (
+                    "The API URL in the config.toml file may be incorrect "
+                    "or the API might be temporarily unavailable!\n"
+                )
+                raise BaseDosDadosException(msg) from e
+
+        if key is not None and _is_cacheable(response):
+            self.cache.set(key, response)
+        return _simplify_response(response or {}, page, page_size)
+
+
+def _is_retryable(error: Exception) -> bool:
+    """
+    Whether a failed request may succeed if sent again.
+    """
+    if isinstance(error, asyncio.TimeoutError):
+        return True
+    if _aiohttp_dependencies and isinstance(error, aiohttp.ClientError):
+        return True
+    return (
+        isinstance(error, TransportServerError)
+        and error.code in _RETRY_STATUSES
+    )
@@ -2,13 +2,17 @@
 Module for interacting with the backend.
 """
 
-from typing import Any, Dict, Optional
+import copy
+import math
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
 from loguru import logger
-from requests import get
 
 try:
     from gql import Client, gql
+    from gql.client import SyncClientSession
     from gql.transport.requests import RequestsHTTPTransport
 
     _backend_dependencies = True
@@ -21,24 +25,422 @@ from basedosdados.exceptions import (
     BaseDosDadosMissingDependencyException,
 )
 
+if TYPE_CHECKING:
+    from basedosdados.core.metadata_cache import MetadataCache
+    from basedosdados.download.catalog import CatalogSnapshot
+
+# Retries of failed requests to the backend, with exponential backoff
+_RETRIES = 3
+_RETRY_BACKOFF_FACTOR = 0.5
+
+# Seconds to wait for a response of the backend
+_TIMEOUT = 60
+
+# Fields of the configuration of a dataset
+_DATASET_CONFIG_FIELDS = """
+    slug
+    name
+    descriptionPt
+    createdAt
+    updatedAt
+    themes {
+        edges {
+            node {
+                namePt
+            }
+        }
+    }
+    tags {
+        edges {
+            node {
+                namePt
+            }
+        }
+    }
+    organizations {
+        edges {
+            node {
+                namePt
+            }
+        }
+    }
+"""
+
+# Fields of the configuration of a table
+_TABLE_CONFIG_FIELDS = """
+    slug
+    dataset {
+        slug
+        organizations {
+            edges {
+                node {
+                    slug
+                }
+            }
+        }
+    }
+    namePt
+    descriptionPt
+    columns {
+        edges {
+            node {
+                name
+                isInStaging
+                isPartition
+                descriptionPt
+                observations
+                bigqueryType {
+                    name
+                }
+            }
+        }
+    }
+"""
+
+
+# Configuration of the dataset of a BigQuery dataset
+_DATASET_CONFIG_QUERY = f"""
+    query ($gcp_dataset_id: String!) {{
+        allCloudtable(gcpDatasetId: $gcp_dataset_id, first: 1) {{
+            edges {{
+                node {{
+                    table {{
+                        dataset {{
+                            {_DATASET_CONFIG_FIELDS}
+                        }}
+                    }}
+                }}
+            }}
+        }}
+    }}
+"""
+
+
+def _datasets_query(
+    dataset_id: Optional[str],
+    dataset_name: Optional[str],
+    page: int,
+    page_size: int,
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Build the query and variables of a page of datasets.
+    """
+    query = """
+        query ($first: Int!, $offset: Int!) {
+          allDataset(first: $first, offset: $offset) {
+            edges {
+              node {
+                slug
+                name
+                description
+                organizations {
+                  edges {
+                    node {
+                      name
+                    }
+                  }
+                }
+                tags {
+                  edges {
+                    node {
+                      name
+                    }
+                  }
+                }
+                themes {
+                  edges {
+                    node {
+                      name
+                    }
+                  }
+                }
+                createdAt
+                updatedAt
+              }
+            }
+            totalCount
+          }
+        }
+    """
+    variables = {"first": page_size, "offset": (page - 1) * page_size}
+
+    extra = None
+    if dataset_id:
+        extra = f'id: "{dataset_id}"'
+    if dataset_name:
+        extra = f'name_Icontains: "{dataset_name}"'
+    if extra:
+        query = query.replace("$offset)", f"$offset, {extra})")
+
+    return query, variables
+
+
+def _tables_query(
+    dataset_id: Optional[str],
+    table_id: Optional[str],
+    table_name: Optional[str],
+    page: int,
+    page_size: int,
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Build the query and variables of a page of tables.
+    """
+    query = """
+        query ($first: Int!, $offset: Int!) {
+            allTable(first: $first, offset: $offset) {
+                edges {
+                    node {
+                        slug
+                        name
+                        description
+                        numberRows
+                        numberColumns
+                        uncompressedFileSize
+
+                    }
+                }
+                totalCount
+            }
+        }
+    """
+    variables = {"first": page_size, "offset": (page - 1) * page_size}
+
+    extra = None
+    if table_id:
+        extra = f'id: "{table_id}"'
+    if dataset_id:
+        extra = f'dataset_id: "{dataset_id}"'
+    if table_name:
+        extra = f'name_Icontains: "{table_name}"'
+    if extra:
+        query = query.replace("$offset)", f"$offset, {extra})")
+
+    return query, variables
+
+
+def _columns_query(
+    table_id: Optional[str],
+    column_id: Optional[str],
+    column_name: Optional[str],
+    page: int,
+    page_size: int,
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Build the query and variables of a page of columns.
+    """
+    query = """
+        query ($first: Int!, $offset: Int!) {
+            allColumn(first: $first, offset: $offset) {
+                edges {
+                    node {
+                        name
+                        description
+                        observations
+                        bigqueryType {
+                            name
+                        }
+                    }
+                }
+                totalCount
+            }
+        }
+    """
+    variables = {"first": page_size, "offset": (page - 1) * page_size}
+
+    extra = None
+    if column_id:
+        extra = f'id: "{column_id}"'
+    if table_id:
+        extra = f'table_id: "{table_id}"'
+    if column_name:
+        extra = f'name_Icontains: "{column_name}"'
+    if extra:
+        query = query.replace("$offset)", f"$offset, {extra})")
+
+    return query, variables
+
+
+def _dataset_config_from_response(
+    dataset_id: str, response: Dict[str, Any], graphql_url: str
+) -> Dict[str, Any]:
+    """
+    Get the dataset configuration from the response of
+    `_DATASET_CONFIG_QUERY`, or an empty dict if it was not found.
+    """
+    items = (response.get("allCloudtable") or {}).get("items") or []
+    if items:
+        return items[0]["table"]["dataset"]
+
+    msg = f"{dataset_id} not found. Please create the metadata first in {graphql_url}"
+    logger.info(msg)
+    return {}
+
+
+def _table_configs_query(
+    tables: List[Tuple[str, str]],
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Build a query of the configuration of many tables, looking up each one
+    by an aliased `allCloudtable` field. Tables without dataset are skipped,
+    so the variables are empty if there is nothing to query.
+    """
+    definitions, fields, variables = [], [], {}
+    for i, (dataset_id, table_id) in enumerate(tables):
+        if not dataset_id:
+            continue
+        definitions.append(f"$dataset_{i}: String!, $table_{i}: String!")
+        fields.append(
+            f"""
+            table_{i}: allCloudtable(
+                gcpDatasetId: $dataset_{i}, gcpTableId: $table_{i}, first: 1
+            ) {{
+                edges {{
+                    node {{
+                        table {{
+                            {_TABLE_CONFIG_FIELDS}
+                        }}
+                    }}
+                }}
+            }}
+            """
+        )
+        variables[f"dataset_{i}"] = dataset_id
+        variables[f"table_{i}"] = table_id
+
+    query = f"query ({', '.join(definitions)}) {{{''.join(fields)}}}"
+    return query, variables
+
+
+def _table_configs_from_response(
+    tables: List[Tuple[str, str]], response: Dict[str, Any], graphql_url: str
+) -> List[Dict[str, Any]]:
+    """
+    Get the configuration of each table from the response of
+    `_table_configs_query`, or an empty dict for tables not found.
+    """
+    configs = []
+    for i, (dataset_id, table_id) in enumerate(tables):
+        items = (response.get(f"table_{i}") or {}).get("items") or []
+        if items:
+            configs.append(items[0]["table"])
+            continue
+
+        msg = f"No table {table_id} found in {dataset_id}. Please create in {graphql_url}"
+        logger.info(msg)
+        configs.append({})
+    return configs
+
+
+def _is_cacheable(response: Optional[Dict[str, Any]]) -> bool:
+    """
+    Whether a GraphQL response can be cached, which is not the case if any of
+    its fields has no results, e.g. a dataset whose metadata was not created
+    yet.
+    """
+    return bool(response) and all(
+        value and not (isinstance(value, dict) and value.get("edges") == [])
+        for value in response.values()
+    )
+
+
+def _simplify_response(
+    response: dict, page: int = 1, page_size: int = 10
+) -> dict:
+    """
+    Replace the `edges` of a GraphQL response by the list of their nodes, as
+    `items`, and its `totalCount` by the pagination of the response.
+    """
+    if response is None:
+        return {}
+    if response == {}:
+        return {}
+
+    output_ = {}
+    for key, value in response.items():
+        if isinstance(value, list) and key == "edges":
+            output_["items"] = [
+                _simplify_response(v).get("node") for v in value
+            ]
+        elif isinstance(value, dict):
+            output_[key] = _simplify_response(value, page, page_size)
+        else:
+            output_[key] = value
+
+    if "totalCount" in output_:
+        output_["page"] = page
+        output_["page_size"] = page_size
+        output_["page_total"] = math.ceil(
+            output_.pop("totalCount") / page_size
+        )
+
+    return output_
+
 
 class Backend:
     def __init__(
         self,
         search_url: Optional[str] = None,
         graphql_url: Optional[str] = None,
+        cache: Optional["MetadataCache"] = None,
     ):
         """
         Backend class to communicate with the backend.
 
+        All requests share a single HTTP session, whose connections are kept
+        alive, and failed requests are retried with exponential backoff.
+
         Args:
             graphql_url (str): URL of the GraphQL endpoint.
+            cache (MetadataCache, optional): cache of the responses of the
+                backend, such as `basedosdados.core.metadata_cache.LRUCache`.
+                Defaults to None, which disables caching.
         """
         self.search_url: str = search_url or constants.BACKEND_SEARCH_URL.value
         self.graphql_url: str = (
             graphql_url or constants.BACKEND_GRAPHQL_URL.value
         )
+        self.cache = cache
         self.graphql_client: "Client" = self._get_client()
+        self._graphql_session: Optional["SyncClientSession"] = None
+        self._graphql_session_lock = threading.Lock()
+
+    @property
+    def graphql_session(self) -> "SyncClientSession":
+        """
+        Session of `graphql_client`, connected on first use and shared by all
+        queries.
+        """
+        with self._graphql_session_lock:
+            if self._graphql_session is None:
+                self._graphql_session = self.graphql_client.connect_sync()
+            return self._graphql_session
+
+    def close(self) -> None:
+        """
+        Close the HTTP session. It is opened again by the next query.
+        """
+        with self._graphql_session_lock:
+            if self._graphql_session is not None:
+                self.graphql_client.close_sync()
+                self._graphql_session = None
+
+    def invalidate_cache(
+        self, query: Optional[str] = None, variables: Optional[dict] = None
+    ) -> None:
+        """
+        Remove the cached response of a query, or all cached responses if
+        `query` is None.
+
+        Args:
+            query (str, optional): GraphQL query, or the search URL.
+            variables (dict, optional): variables of the query, or the
+                parameters of the search.
+        """
+        if self.cache is None:
+            return
+        self.cache.invalidate(
+            None if query is None else self.cache.key(query, variables)
+        )
 
     def get_datasets(
         self,
@@ -63,53 +465,9 @@ class Backend:
             list[dict]: List of datasets.
         """
 
-        query = """
-            query ($first: Int!, $offset: Int!) {
-              allDataset(first: $first, offset: $offset) {
-                edges {
-                  node {
-                    slug
-                    name
-                    description
-                    organizations {
-                      edges {
-                        node {
-                          name
-                        }
-                      }
-                    }
-                    tags {
-                      edges {
-                        node {
-                          name
-                        }
-                      }
-                    }
-                    themes {
-                      edges {
-                        node {
-                          name
-                        }
-                      }
-                    }
-                    createdAt
-                    updatedAt
-                  }
-                }
-                totalCount
-              }
-            }
-        """
-        variables = {"first": page_size, "offset": (page - 1) * page_size}
-
-        extra = None
-        if dataset_id:
-            extra = f'id: "{dataset_id}"'
-        if dataset_name:
-            extra = f'name_Icontains: "{dataset_name}"'
-        if extra:
-            query = query.replace("$offset)", f"$offset, {extra})")
-
+        query, variables = _datasets_query(
+            dataset_id, dataset_name, page, page_size
+        )
         return self._execute_query(
             query=query, variables=variables, page=page, page_size=page_size
         ).get("allDataset")
@@ -139,36 +497,9 @@ class Backend:
             list[dict]: List of tables.
         """
 
-        query = """
-            query ($first: Int!, $offset: Int!) {
-                allTable(first: $first, offset: $offset) {
-                    edges {
-                        node {
-                            slug
-                            name
-                            description
-                            numberRows
-                            numberColumns
-                            uncompressedFileSize
-
-                        }
-                    }
-                    totalCount
-                }
-            }
-        """
-        variables = {"first": page_size, "offset": (page - 1) * page_size}
-
-        extra = None
-        if table_id:
-            extra = f'id: "{table_id}"'
-        if dataset_id:
-            extra = f'dataset_id: "{dataset_id}"'
-        if table_name:
-            extra = f'name_Icontains: "{table_name}"'
-        if extra:
-            query = query.replace("$offset)", f"$offset, {extra})")
-
+        query, variables = _tables_query(
+            dataset_id, table_id, table_name, page, page_size
+        )
         return self._execute_query(
             query=query, variables=variables, page=page, page_size=page_size
         ).get("allTable")
@@ -198,35 +529,9 @@ class Backend:
             list[dict]: List of tables.
         """
 
-        query = """
-            query ($first: Int!, $offset: Int!) {
-                allColumn(first: $first, offset: $offset) {
-                    edges {
-                        node {
-                            name
-                            description
-                            observations
-                            bigqueryType {
-                                name
-                            }
-                        }
-                    }
-                    totalCount
-                }
-            }
-        """
-        variables = {"first": page_size, "offset": (page - 1) * page_size}
-
-        extra = None
-        if column_id:
-            extra = f'id: "{column_id}"'
-        if table_id:
-            extra = f'table_id: "{table_id}"'
-        if column_name:
-            extra = f'name_Icontains: "{column_name}"'
-        if extra:
-            query = query.replace("$offset)", f"$offset, {extra})")
-
+        query, variables = _columns_query(
+            table_id, column_id, column_name, page, page_size
+        )
         return self._execute_query(
             query=query, variables=variables, page=page, page_size=page_size
         ).get("allColumn")
@@ -237,6 +542,9 @@ class Backend:
         """
         Search for datasets, querying all available metadata for the term `q`
 
+        If the backend has a cache, expired results are revalidated with their
+        ETag, so unchanged results are not downloaded again.
+
         Args:
             q(str): search term.
 
@@ -247,127 +555,136 @@ class Backend:
         Returns:
             dict: page of tables.
         """
-        response = get(
+        params = {"q": q, "page": page, "page_size": page_size}
+
+        key = entry = None
+        if self.cache is not None:
+            key = self.cache.key(self.search_url, params)
+            entry = self.cache.get(key)
+            if entry is not None and not entry.expired:
+                return copy.deepcopy(entry.value)
+
+        response = self.graphql_session.transport.session.get(
             url=self.search_url,
-            params={"q": q, "page": page, "page_size": page_size},
+            params=params,
+            headers={"If-None-Match": entry.etag} if entry else None,
+            timeout=_TIMEOUT,
         )
+        if response.status_code == 304 and entry is not None:
+            self.cache.set(key, entry.value, etag=entry.etag)
+            return copy.deepcopy(entry.value)
         if response.status_code not in [200]:
             raise BaseDosDadosException(response.text)
-        return response.json()
+
+        result = response.json()
+        if self.cache is not None:
+            self.cache.set(
+                key, copy.deepcopy(result), etag=response.headers.get("ETag")
+            )
+        return result
+
+    def sync_catalog(
+        self,
+        path: Union[str, Path],
+        full: bool = False,
+        page_size: int = 100,
+        max_concurrency: int = 4,
+    ) -> "CatalogSnapshot":
+        """
+        Save datasets, tables and columns to a local SQLite snapshot, or
+        refresh an existing one.
+
+        Only datasets whose `updatedAt` changed since the last sync are
+        fetched again. The snapshot answers `get_datasets`, `get_tables`,
+        `get_columns` and `search` offline, and can be passed as the
+        `backend` of the functions in `basedosdados.download.metadata`.
+
+        Args:
+            path(str): SQLite file of the snapshot.
+            full(bool): whether to fetch all datasets, even unchanged ones.
+            page_size(int): number of datasets listed per request.
+            max_concurrency(int): maximum number of requests at the same time.
+
+        Returns:
+            CatalogSnapshot: the synced snapshot.
+        """
+        from basedosdados.download.catalog import CatalogSnapshot
+
+        snapshot = CatalogSnapshot(path)
+        snapshot.sync(
+            self,
+            full=full,
+            page_size=page_size,
+            max_concurrency=max_concurrency,
+        )
+        return snapshot
 
     def get_dataset_config(self, dataset_id: str) -> Dict[str, Any]:
         """
         Get dataset configuration.
+
+        The dataset is looked up by its BigQuery name and its configuration
+        is fetched in the same request.
+
         Args:
             dataset_id (str): The ID for the dataset.
         Returns:
             Dict: Dataset configuration.
         """
-        query = """
-            query ($dataset_id: ID!){
-                allDataset(id: $dataset_id) {
-                    edges {
-                        node {
-                            slug
-                            name
-                            descriptionPt
-                            createdAt
-                            updatedAt
-                            themes {
-                                edges {
-                                    node {
-                                        namePt
-                                    }
-                                }
-                            }
-                            tags {
-                                edges {
-                                    node {
-                                        namePt
-                                    }
-                                }
-                            }
-                            organizations {
-                                edges {
-                                    node {
-                                        namePt
-                                    }
-                                }
-                            }
-                        }
-                    }
-                }
-            }
-        """
-        dataset_id_from_name = self._get_dataset_id_from_name(dataset_id)
-        if dataset_id_from_name is not None:
-            variables = {"dataset_id": dataset_id_from_name}
-            return self._execute_query(query=query, variables=variables)[
-                "allDataset"
-            ]["items"][0]
-        else:
-            return {}
+        response = self._execute_query(
+            query=_DATASET_CONFIG_QUERY,
+            variables={"gcp_dataset_id": dataset_id},
+        )
+        return _dataset_config_from_response(
+            dataset_id, response, self.graphql_url
+        )
 
     def get_table_config(
         self, dataset_id: str, table_id: str
     ) -> Dict[str, Any]:
         """
         Get table configuration.
+
+        The table is looked up by its BigQuery name and its configuration is
+        fetched in the same request.
+
         Args:
             dataset_id (str): The ID for the dataset.
             table_id (str): The ID for the table.
         Returns:
             Dict: Table configuration.
         """
+        return self.get_table_configs([(dataset_id, table_id)])[0]
 
-        query = """
-            query ($table_id: ID!) {
-                allTable(id: $table_id) {
-                    edges {
-                        node {
-                            slug
-                            dataset {
-                                slug
-                                organizations {
-                                  edges {
-                                    node {
-                                      slug
-                                    }
-                                  }
-                                }
-                            }
-                            namePt
-                            descriptionPt
-                            columns {
-                                edges {
-                                    node {
-                                        name
-                                        isInStaging
-                                        isPartition
-                                        descriptionPt
-                                        observations
-                                        bigqueryType {
-                                            name
-                                        }
-                                    }
-                                }
-                            }
-                        }
-                    }
-                }
-            }
+    def get_table_configs(
+        self, tables: List[Tuple[str, str]], batch_size: int = 50
+    ) -> List[Dict[str, Any]]:
         """
-        table_id_from_name = self._get_table_id_from_name(
-            gcp_dataset_id=dataset_id, gcp_table_id=table_id
-        )
+        Get the configuration of many tables, in a single request per batch.
 
-        if table_id_from_name is not None:
-            variables = {"table_id": table_id_from_name}
-            return self._execute_query(query=query, variables=variables)[
-                "allTable"
-            ]["items"][0]
-        else:
-            return {}
+        Each table is looked up by an aliased `allCloudtable` field of the
+        same GraphQL document.
+
+        Args:
+            tables (List[Tuple[str, str]]): `(dataset_id, table_id)` pairs.
+            batch_size (int): maximum number of tables per request.
+        Returns:
+            List[Dict]: Configuration of each table, in the same order as
+                `tables`, or an empty dict for tables not found.
+        """
+        configs = []
+        for start in range(0, len(tables), batch_size):
+            batch = tables[start : start + batch_size]  # noqa
+            query, variables = _table_configs_query(batch)
+            response = (
+                self._execute_query(query=query, variables=variables)
+                if variables
+                else {}
+            )
+            configs.extend(
+                _table_configs_from_response(batch, response, self.graphql_url)
+            )
+        return configs
 
     def _get_dataset_id_from_name(self, gcp_dataset_id: str) -> Optional[str]:
         query = """
@@ -456,7 +773,12 @@ class Backend:
                 "\n\npip install basedosdados[upload]"
             )
         transport = RequestsHTTPTransport(
-            url=self.graphql_url, headers=headers, use_json=True
+            url=self.graphql_url,
+            headers=headers,
+            use_json=True,
+            timeout=_TIMEOUT,
+            retries=_RETRIES,
+            retry_backoff_factor=_RETRY_BACKOFF_FACTOR,
         )
         return Client(
             transport=transport,
@@ -472,18 +794,27 @@ class Backend:
         page: int = 1,
         page_size: int = 10,
         fetch_schema_from_transport: bool = False,
+        refresh: bool = False,
     ) -> Dict[str, Any]:
         """
         Execute a GraphQL query.
 
+        Responses of queries run on the shared session are kept in the
+        backend's cache, if any, keyed on the query and its variables. Empty
+        results are not kept, so that metadata created afterwards is found.
+
         Args:
             query (str): GraphQL query.
             variables (Dict[str, str], optional): Variables to be passed to the query. Defaults to None.
-            client (Client, optional): GraphQL client. Defaults to None.
+            client (Client, optional): GraphQL client. Defaults to None, which
+                uses the session shared by all queries of this backend.
             headers (Dict[str, str], optional): Headers to be passed to the client. Defaults to
-                None.
+                None. A new client is created if given.
             fetch_schema_from_transport (bool, optional): Whether to fetch the schema from the
-                transport. Defaults to False.
+                transport. Defaults to False. A new client is created if True.
+            refresh (bool, optional): Whether to send the query even if its
+                response is cached, replacing the cached response. Defaults
+                to False.
 
         Returns:
             Dict: GraphQL response.
@@ -495,22 +826,30 @@ class Backend:
                 "\n\npip install basedosdados[upload]"
             )
 
-        client_ = (
-            self._get_client(
+        if client is None and (headers or fetch_schema_from_transport):
+            client = self._get_client(
                 headers=headers,
                 fetch_schema_from_transport=fetch_schema_from_transport,
             )
-            if client is None  # type: ignore
-            else self.graphql_client
-        )
+        key = None
+        if client is None and self.cache is not None:
+            key = self.cache.key(query, variables)
+            entry = None if refresh else self.cache.get(key)
+            if entry is not None:
+                return self._simplify_response(entry.value, page, page_size)
+
+        executor = self.graphql_session if client is None else client
         try:
-            response = client_.execute(gql(query), variable_values=variables)
+            response = executor.execute(gql(query), variable_values=variables)
         except Exception as e:
             msg = (
                 "The API URL in the config.toml file may be incorrect "
                 "or the API might be temporarily unavailable!\n"
             )
             raise BaseDosDadosException(msg) from e
+
+        if key is not None and _is_cacheable(response):
+            self.cache.set(key, response)
         return self._simplify_response(response or {}, page, page_size)
 
     def _simplify_response(
@@ -525,25 +864,4 @@ class Backend:
         Returns:
             dict: the simplified graphql response
         """
-        if response is None:
-            return {}
-        if response == {}:
-            return {}
-
-        output_ = {}
-        for key, value in response.items():
-            if isinstance(value, list) and key == "edges":
-                output_["items"] = [
-                    self._simplify_response(v).get("node") for v in value
-                ]
-            elif isinstance(value, dict):
-                output_[key] = self._simplify_response(value)
-            else:
-                output_[key] = value
-
-        if "totalCount" in output_:
-            output_["page"] = page
-            output_["page_size"] = page_size
-            output_["page_total"] = int(output_.pop("totalCount") / page_size)
-
-        return output_
+        return _simplify_response(response, page, page_size)
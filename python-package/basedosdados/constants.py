@@ -6,6 +6,7 @@ __all__ = ["config", "constants"]
 
 from dataclasses import dataclass
 from enum import Enum
+from typing import Optional
 
 
 @dataclass
@@ -14,12 +15,28 @@ class config:
     Configuration for the project.
     """
 
-    billing_project_id: str = None
-    project_config_path: str = None
+    billing_project_id: Optional[str] = None
+    project_config_path: Optional[str] = None
 
     verbose: bool = True
     from_file: bool = False
 
+    # maximum size, in bytes, of the local query result cache
+    cache_max_size: int = 1024**3
+
+    # queries estimated to process more bytes than this are refused
+    maximum_bytes_billed: Optional[int] = None
+
+    # seconds for which BigQuery table metadata is cached
+    table_metadata_ttl: float = 300
+
+    # seconds for which responses of the metadata backend are cached
+    metadata_cache_ttl: float = 300
+
+    # maximum HTTP connections per host kept open by the Google Cloud clients
+    # and by AsyncBackend
+    max_connections: int = 32
+
 
 class constants(Enum):
     """
@@ -18,8 +18,9 @@ from google.cloud import bigquery, bigquery_connection_v1, storage
 from google.oauth2 import service_account
 from loguru import logger
 
-from basedosdados import Backend
+from basedosdados.backend import Backend
 from basedosdados.constants import config, constants
+from basedosdados.core.metadata_cache import metadata_cache
 
 warnings.filterwarnings("ignore")
 
@@ -68,7 +69,9 @@ class Base:
         self.uri = (
             f"gs://{self.bucket_name}/{self.mode}" + "/{dataset}/{table}/*"
         )
-        self._backend = Backend(self.config.get("api", {}).get("url", None))
+        self._backend = Backend(
+            self.config.get("api", {}).get("url", None), cache=metadata_cache
+        )
 
     @property
     def backend(self):
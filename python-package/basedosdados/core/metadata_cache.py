@@ -0,0 +1,221 @@
+"""
+Caches of responses of the metadata backend.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from basedosdados.constants import config
+
+
+@dataclass
+class CacheEntry:
+    """
+    Cached response.
+
+    Attributes:
+        value: The response.
+        expires_at: Unix timestamp after which the response must be fetched
+            again, or revalidated with its `etag`.
+        etag: ETag of the response, if the server sent one.
+    """
+
+    value: Any
+    expires_at: float
+    etag: Optional[str] = None
+
+    @property
+    def expired(self) -> bool:
+        return time.time() >= self.expires_at
+
+
+class MetadataCache(ABC):
+    """
+    Base class of the caches of `Backend` responses.
+
+    Subclasses store entries in `_get`, `_set` and `_delete`. Expired
+    entries are only returned if they have an ETag, so they can be
+    revalidated.
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        """
+        Args:
+            ttl: Seconds for which responses are kept. Defaults to
+                `config.metadata_cache_ttl`.
+        """
+        self.ttl = ttl
+
+    @staticmethod
+    def key(query: str, variables: Optional[dict[str, Any]] = None) -> str:
+        """
+        Get the cache key of a query and its variables.
+        """
+        content = json.dumps(
+            [" ".join(query.split()), variables or {}],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Get an entry, or None on a miss.
+        """
+        entry = self._get(key)
+        if entry is not None and entry.expired and entry.etag is None:
+            self._delete(key)
+            return None
+        return entry
+
+    def set(self, key: str, value: Any, etag: Optional[str] = None) -> None:
+        """
+        Store a response for `ttl` seconds.
+        """
+        ttl = self.ttl if self.ttl is not None else config.metadata_cache_ttl
+        self._set(key, CacheEntry(value, time.time() + ttl, etag))
+
+    @abstractmethod
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """
+        Remove an entry, or all entries if `key` is None.
+        """
+
+    @abstractmethod
+    def _get(self, key: str) -> Optional[CacheEntry]:
+        pass
+
+    @abstractmethod
+    def _set(self, key: str, entry: CacheEntry) -> None:
+        pass
+
+    @abstractmethod
+    def _delete(self, key: str) -> None:
+        pass
+
+
+class MemoryCache(MetadataCache):
+    """
+    Cache responses in memory, shared by the threads of the process.
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        super().__init__(ttl)
+        self._entries: dict[str, CacheEntry] = {}
+        self._lock = threading.Lock()
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def _get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def _set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+
+    def _delete(self, key: str) -> None:
+        self.invalidate(key)
+
+
+class LRUCache(MemoryCache):
+    """
+    Cache responses in memory, evicting the least recently used ones once
+    there are more than `max_size`.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None):
+        """
+        Args:
+            max_size: Maximum number of responses kept.
+            ttl: Seconds for which responses are kept. Defaults to
+                `config.metadata_cache_ttl`.
+        """
+        super().__init__(ttl)
+        self.max_size = max_size
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+
+    def _get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+class DiskCache(MetadataCache):
+    """
+    Cache responses as JSON files, shared by all processes of the machine
+    and kept across restarts.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        ttl: Optional[float] = None,
+    ):
+        """
+        Args:
+            path: Folder in which responses are stored. Defaults to
+                `metadata_cache` inside the basedosdados config folder.
+            ttl: Seconds for which responses are kept. Defaults to
+                `config.metadata_cache_ttl`.
+        """
+        super().__init__(ttl)
+        config_path = (
+            Path(config.project_config_path)
+            if config.project_config_path is not None
+            else Path.home() / ".basedosdados"
+        )
+        self.path = (
+            Path(path) if path is not None else config_path / "metadata_cache"
+        )
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        paths = self.path.glob("*.json") if key is None else [self._path(key)]
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+    def _get(self, key: str) -> Optional[CacheEntry]:
+        try:
+            data = json.loads(self._path(key).read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return None
+        return CacheEntry(**data)
+
+    def _set(self, key: str, entry: CacheEntry) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        # write to a temporary file first so readers never see partial entries
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(entry.__dict__), encoding="utf-8")
+        tmp_path.replace(path)
+
+    def _delete(self, key: str) -> None:
+        self.invalidate(key)
+
+    def _path(self, key: str) -> Path:
+        return self.path / f"{key}.json"
+
+
+# shared by the backends created by basedosdados itself
+metadata_cache = LRUCache()
@@ -0,0 +1,129 @@
+"""
+In-process cache of BigQuery table metadata.
+"""
+
+import datetime
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from google.cloud import bigquery
+from google.cloud.bigquery import SchemaField
+
+from basedosdados.constants import config
+
+
+@dataclass(frozen=True)
+class TableMetadata:
+    """
+    Metadata of a BigQuery table.
+
+    Attributes:
+        table_id: Table id in the form `project.dataset.table`.
+        table_type: Type of the table, such as `TABLE`, `VIEW` or `EXTERNAL`.
+        schema: Columns of the table.
+        num_rows: Number of rows, if known.
+        num_bytes: Size of the table in bytes, if known.
+        modified: When the table was last modified.
+    """
+
+    table_id: str
+    table_type: str
+    schema: list[SchemaField]
+    num_rows: Optional[int]
+    num_bytes: Optional[int]
+    modified: Optional[datetime.datetime]
+
+
+class TableMetadataCache:
+    """
+    Cache table metadata for `config.table_metadata_ttl` seconds, so that
+    repeated calls for the same table need a single `get_table` request.
+
+    Tables that do not exist are not cached. Code that changes a table
+    should call `invalidate` afterwards.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        """
+        Args:
+            max_size: Maximum number of tables kept. The least recently used
+                tables are evicted first.
+        """
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, TableMetadata]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, client: bigquery.Client, table_id: str) -> TableMetadata:
+        """
+        Get the metadata of a table, fetching it on a miss.
+
+        Args:
+            client: BigQuery client used on a miss.
+            table_id: Table id in the form `project.dataset.table`, or
+                `dataset.table` in the project of `client`.
+
+        Returns:
+            The table metadata.
+
+        Raises:
+            google.api_core.exceptions.NotFound: If the table does not exist.
+        """
+        key = self.key(client, table_id)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] <= (
+                config.table_metadata_ttl
+            ):
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        table = client.get_table(key)
+        metadata = TableMetadata(
+            table_id=key,
+            table_type=table.table_type,
+            schema=list(table.schema),
+            num_rows=table.num_rows,
+            num_bytes=table.num_bytes,
+            modified=table.modified,
+        )
+
+        with self._lock:
+            self._entries[key] = (time.monotonic(), metadata)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+        return metadata
+
+    def invalidate(self, table_id: Optional[str] = None) -> None:
+        """
+        Remove a table from the cache, or all tables if `table_id` is None.
+
+        Args:
+            table_id: Table id in the form `project.dataset.table`.
+        """
+        with self._lock:
+            if table_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(table_id, None)
+
+    @staticmethod
+    def key(client: bigquery.Client, table_id: str) -> str:
+        """
+        Get the cache key of a table, in the form `project.dataset.table`.
+        """
+        ref = bigquery.TableReference.from_string(
+            table_id, default_project=client.project
+        )
+        return f"{ref.project}.{ref.dataset_id}.{ref.table_id}"
+
+
+# shared by downloads and uploads of this process
+table_metadata = TableMetadataCache()
@@ -0,0 +1,295 @@
+"""
+Coroutines to get metadata from BD's API, with the same arguments and results
+as the functions of `basedosdados.download.metadata`.
+"""
+
+import asyncio
+import threading
+from collections import deque
+from functools import partial
+from itertools import islice
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+from basedosdados.async_backend import AsyncBackend
+from basedosdados.core.metadata_cache import metadata_cache
+from basedosdados.download.metadata import (
+    _format_columns,
+    _format_datasets,
+    _format_search,
+)
+
+_local = threading.local()
+
+
+def _default_backend() -> AsyncBackend:
+    """
+    Backend used when none is given, shared by the calls made in the same
+    thread so that its HTTP session is reused. Event loops of different
+    threads get their own backend, while cached responses are shared by all.
+    """
+    backend = getattr(_local, "backend", None)
+    if backend is None:
+        backend = _local.backend = AsyncBackend(cache=metadata_cache)
+    return backend
+
+
+async def get_datasets(
+    dataset_id: Optional[str] = None,
+    dataset_name: Optional[str] = None,
+    page: int = 1,
+    page_size: int = 10,
+    backend: Optional[AsyncBackend] = None,
+) -> list[dict]:
+    """
+    Get a list of available datasets, either by `dataset_id` or `dataset_name`.
+
+    Args:
+        dataset_id: Dataset slug in Google BigQuery (GBQ).
+        dataset_name: Dataset name in Base dos Dados metadata.
+        page: Page for pagination.
+        page_size: Page size for pagination.
+        backend: Backend instance, injected automatically.
+
+    Returns:
+        List of datasets.
+    """
+    backend = _default_backend() if backend is None else backend
+    return _format_datasets(
+        await backend.get_datasets(dataset_id, dataset_name, page, page_size)
+    )
+
+
+async def get_tables(
+    dataset_id: Optional[str] = None,
+    table_id: Optional[str] = None,
+    table_name: Optional[str] = None,
+    page: int = 1,
+    page_size: int = 10,
+    backend: Optional[AsyncBackend] = None,
+) -> list[dict]:
+    """
+    Get a list of available tables, either by `dataset_id`, `table_id` or
+    `table_name`.
+
+    Args:
+        dataset_id: Dataset slug in Google BigQuery (GBQ).
+        table_id: Table slug in Google BigQuery (GBQ).
+        table_name: Table name in Base dos Dados metadata.
+        page: Page for pagination.
+        page_size: Page size for pagination.
+        backend: Backend instance, injected automatically.
+
+    Returns:
+        List of tables.
+    """
+    backend = _default_backend() if backend is None else backend
+    return await backend.get_tables(
+        dataset_id, table_id, table_name, page, page_size
+    )
+
+
+async def get_columns(
+    table_id: Optional[str] = None,
+    column_id: Optional[str] = None,
+    columns_name: Optional[str] = None,
+    page: int = 1,
+    page_size: int = 10,
+    backend: Optional[AsyncBackend] = None,
+) -> list[dict]:
+    """
+    Get a list of available columns, either by `table_id`, `column_id` or
+    `column_name`.
+
+    Args:
+        table_id: Table slug in Google BigQuery (GBQ).
+        column_id: Column slug in Google BigQuery (GBQ).
+        column_name: Column name in Base dos Dados metadata.
+        page: Page for pagination.
+        page_size: Page size for pagination.
+        backend: Backend instance, injected automatically.
+
+    Returns:
+        List of columns.
+    """
+    backend = _default_backend() if backend is None else backend
+    return _format_columns(
+        await backend.get_columns(
+            table_id, column_id, columns_name, page, page_size
+        )
+    )
+
+
+def iter_datasets(
+    dataset_id: Optional[str] = None,
+    dataset_name: Optional[str] = None,
+    page_size: int = 100,
+    max_concurrency: int = 4,
+    backend: Optional[AsyncBackend] = None,
+) -> AsyncIterator[dict]:
+    """
+    Iterate over all datasets, either by `dataset_id` or `dataset_name`.
+
+    Pages are fetched concurrently, up to `max_concurrency` pages ahead of
+    the one being iterated over.
+
+    Args:
+        dataset_id: Dataset slug in Google BigQuery (GBQ).
+        dataset_name: Dataset name in Base dos Dados metadata.
+        page_size: Number of datasets fetched per request.
+        max_concurrency: Maximum number of pages fetched at the same time.
+        backend: Backend instance, injected automatically.
+
+    Yields:
+        Datasets, in the same form as the items of `get_datasets`.
+    """
+    return _iter_pages(
+        partial(
+            get_datasets,
+            dataset_id,
+            dataset_name,
+            page_size=page_size,
+            backend=backend,
+        ),
+        max_concurrency,
+    )
+
+
+def iter_tables(
+    dataset_id: Optional[str] = None,
+    table_id: Optional[str] = None,
+    table_name: Optional[str] = None,
+    page_size: int = 100,
+    max_concurrency: int = 4,
+    backend: Optional[AsyncBackend] = None,
+) -> AsyncIterator[dict]:
+    """
+    Iterate over all tables, either by `dataset_id`, `table_id` or
+    `table_name`.
+
+    Pages are fetched concurrently, up to `max_concurrency` pages ahead of
+    the one being iterated over.
+
+    Args:
+        dataset_id: Dataset slug in Google BigQuery (GBQ).
+        table_id: Table slug in Google BigQuery (GBQ).
+        table_name: Table name in Base dos Dados metadata.
+        page_size: Number of tables fetched per request.
+        max_concurrency: Maximum number of pages fetched at the same time.
+        backend: Backend instance, injected automatically.
+
+    Yields:
+        Tables, in the same form as the items of `get_tables`.
+    """
+    return _iter_pages(
+        partial(
+            get_tables,
+            dataset_id,
+            table_id,
+            table_name,
+            page_size=page_size,
+            backend=backend,
+        ),
+        max_concurrency,
+    )
+
+
+def iter_columns(
+    table_id: Optional[str] = None,
+    column_id: Optional[str] = None,
+    columns_name: Optional[str] = None,
+    page_size: int = 100,
+    max_concurrency: int = 4,
+    backend: Optional[AsyncBackend] = None,
+) -> AsyncIterator[dict]:
+    """
+    Iterate over all columns, either by `table_id`, `column_id` or
+    `column_name`.
+
+    Pages are fetched concurrently, up to `max_concurrency` pages ahead of
+    the one being iterated over.
+
+    Args:
+        table_id: Table slug in Google BigQuery (GBQ).
+        column_id: Column slug in Google BigQuery (GBQ).
+        column_name: Column name in Base dos Dados metadata.
+        page_size: Number of columns fetched per request.
+        max_concurrency: Maximum number of pages fetched at the same time.
+        backend: Backend instance, injected automatically.
+
+    Yields:
+        Columns, in the same form as the items of `get_columns`.
+    """
+    return _iter_pages(
+        partial(
+            get_columns,
+            table_id,
+            column_id,
+            columns_name,
+            page_size=page_size,
+            backend=backend,
+        ),
+        max_concurrency,
+    )
+
+
+async def _iter_pages(
+    get_page: Callable[..., Awaitable[Any]], max_concurrency: int
+) -> AsyncIterator[dict]:
+    """
+    Iterate over the items of all pages, in order.
+
+    The first page gives the number of pages. The following ones are fetched
+    as tasks, keeping at most `max_concurrency` requests in flight.
+
+    Args:
+        get_page: Coroutine function returning a page, given its number as
+            `page`.
+        max_concurrency: Maximum number of pages fetched at the same time.
+
+    Yields:
+        The items of each page.
+    """
+    first = await get_page(page=1)
+    for item in first.get("items", []) or []:
+        yield item
+
+    max_concurrency = max(1, max_concurrency)
+    pages = iter(range(2, (first.get("page_total") or 0) + 1))
+    window = deque(
+        asyncio.ensure_future(get_page(page=page))
+        for page in islice(pages, max_concurrency)
+    )
+    try:
+        while window:
+            result = await window.popleft()
+            page = next(pages, None)
+            if page is not None:
+                window.append(asyncio.ensure_future(get_page(page=page)))
+            for item in result.get("items", []) or []:
+                yield item
+    finally:
+        # don't leave requests running if the iteration is stopped early
+        for task in window:
+            task.cancel()
+
+
+async def search(
+    q: Optional[str] = None,
+    page: int = 1,
+    page_size: int = 10,
+    backend: Optional[AsyncBackend] = None,
+) -> list[dict]:
+    """
+    Search for datasets, querying all available metadata for the term `q`.
+
+    Args:
+        q: Search term.
+        page: Page for pagination.
+        page_size: Page size for pagination.
+        backend: Backend instance, injected automatically.
+
+    Returns:
+        List of datasets and metadata.
+    """
+    backend = _default_backend() if backend is None else backend
+    return _format_search(await backend.search(q, page, page_size))
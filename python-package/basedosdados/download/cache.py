@@ -0,0 +1,174 @@
+"""
+Local on-disk cache of query results.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from google.api_core.exceptions import NotFound
+from google.cloud import bigquery
+from loguru import logger
+
+from basedosdados.constants import config
+
+# Quoted strings and identifiers are kept as they are when normalizing SQL
+_SQL_TOKENS = re.compile(
+    r"('(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|`[^`]*`)|\s+", re.DOTALL
+)
+
+
+class QueryCache:
+    """
+    Cache query results as Parquet files under `~/.basedosdados/cache`.
+
+    Entries are keyed by the normalized query and the billing project. An
+    entry is discarded when it is older than the TTL or when one of the tables
+    the query reads was modified after the entry was written. The least
+    recently used entries are evicted once the cache grows above `max_size`.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        max_size: Optional[int] = None,
+    ):
+        """
+        Args:
+            path: Folder in which results are stored. Defaults to `cache`
+                inside the basedosdados config folder.
+            max_size: Maximum size of the cache in bytes. Defaults to
+                `config.cache_max_size`.
+        """
+        config_path = (
+            Path(config.project_config_path)
+            if config.project_config_path is not None
+            else Path.home() / ".basedosdados"
+        )
+        self.path = Path(path) if path is not None else config_path / "cache"
+        self.max_size = (
+            max_size if max_size is not None else config.cache_max_size
+        )
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """
+        Collapse whitespace outside of quoted strings and drop the trailing
+        semicolon, so equivalent queries share a cache entry.
+        """
+
+        def replace(match: re.Match) -> str:
+            return match.group(1) or " "
+
+        return _SQL_TOKENS.sub(replace, query).strip().rstrip(";").strip()
+
+    def key(self, query: str, billing_project_id: str) -> str:
+        """
+        Get the cache key of a query billed to `billing_project_id`.
+        """
+        content = f"{billing_project_id}\n{self.normalize(query)}"
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def get(
+        self,
+        key: str,
+        client: bigquery.Client,
+        ttl: Optional[float] = None,
+    ) -> Optional[pa.Table]:
+        """
+        Load a cached result, if it is still valid.
+
+        Args:
+            key: Cache key, as given by `key`.
+            client: BigQuery client used to check when the source tables were
+                last modified.
+            ttl: Maximum age of the entry in seconds. Never expires if None.
+
+        Returns:
+            The cached result, or None on a cache miss.
+        """
+        data_path, metadata_path = self._paths(key)
+        if not (data_path.exists() and metadata_path.exists()):
+            return None
+
+        metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+        created_at = metadata["created_at"]
+
+        if ttl is not None and time.time() - created_at > ttl:
+            self.delete(key)
+            return None
+
+        for table_id in metadata["tables"]:
+            try:
+                modified = client.get_table(table_id).modified
+            except NotFound:
+                modified = None
+            if modified is None or modified.timestamp() > created_at:
+                logger.info(f"Cached result is outdated: {table_id} changed")
+                self.delete(key)
+                return None
+
+        # mark the entry as recently used
+        os.utime(data_path)
+        return pq.read_table(data_path)
+
+    def set(self, key: str, table: pa.Table, tables: list[str]) -> None:
+        """
+        Store a result in the cache and evict old entries if needed.
+
+        Args:
+            key: Cache key, as given by `key`.
+            table: Query result.
+            tables: Tables read by the query, in the form
+                `project.dataset.table`.
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        data_path, metadata_path = self._paths(key)
+        metadata = {"created_at": time.time(), "tables": tables}
+
+        # write to temporary files first so readers never see partial entries
+        tmp_data_path = data_path.with_suffix(f".{os.getpid()}.tmp")
+        pq.write_table(table, tmp_data_path)
+        os.replace(tmp_data_path, data_path)
+        metadata_path.write_text(json.dumps(metadata), encoding="utf-8")
+
+        self._evict()
+
+    def delete(self, key: str) -> None:
+        """
+        Remove an entry from the cache.
+        """
+        for path in self._paths(key):
+            path.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """
+        Remove all entries from the cache.
+        """
+        for path in self.path.glob("*.parquet"):
+            self.delete(path.stem)
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        return self.path / f"{key}.parquet", self.path / f"{key}.json"
+
+    def _evict(self) -> None:
+        """
+        Remove the least recently used entries until the cache fits in
+        `max_size`.
+        """
+        entries = sorted(
+            (path.stat().st_mtime, path.stat().st_size, path.stem)
+            for path in self.path.glob("*.parquet")
+        )
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, key in entries:
+            if size <= self.max_size:
+                break
+            self.delete(key)
+            size -= entry_size
@@ -0,0 +1,592 @@
+"""
+Local snapshot of the metadata catalog, searchable offline.
+"""
+
+import json
+import math
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+from loguru import logger
+
+from basedosdados.download.metadata import _iter_pages
+from basedosdados.exceptions import BaseDosDadosException
+
+if TYPE_CHECKING:
+    from basedosdados.backend import Backend
+
+_LIST_DATASETS_QUERY = """
+    query ($first: Int!, $offset: Int!) {
+        allDataset(first: $first, offset: $offset) {
+            edges {
+                node {
+                    _id
+                    updatedAt
+                }
+            }
+            totalCount
+        }
+    }
+"""
+
+_GET_DATASET_QUERY = """
+    query ($dataset_id: ID!) {
+        allDataset(id: $dataset_id) {
+            edges {
+                node {
+                    _id
+                    slug
+                    name
+                    description
+                    createdAt
+                    updatedAt
+                    organizations {
+                        edges {
+                            node {
+                                slug
+                                name
+                            }
+                        }
+                    }
+                    tags {
+                        edges {
+                            node {
+                                name
+                            }
+                        }
+                    }
+                    themes {
+                        edges {
+                            node {
+                                name
+                            }
+                        }
+                    }
+                    tables {
+                        edges {
+                            node {
+                                _id
+                                slug
+                                name
+                                description
+                                numberRows
+                                numberColumns
+                                uncompressedFileSize
+                                columns {
+                                    edges {
+                                        node {
+                                            _id
+                                            name
+                                            description
+                                            observations
+                                            bigqueryType {
+                                                name
+                                            }
+                                        }
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+"""
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS datasets (
+        id TEXT PRIMARY KEY,
+        slug TEXT,
+        name TEXT,
+        description TEXT,
+        organizations TEXT,
+        tags TEXT,
+        themes TEXT,
+        created_at TEXT,
+        updated_at TEXT
+    );
+    CREATE TABLE IF NOT EXISTS tables (
+        id TEXT PRIMARY KEY,
+        dataset_id TEXT,
+        slug TEXT,
+        name TEXT,
+        description TEXT,
+        number_rows INTEGER,
+        number_columns INTEGER,
+        uncompressed_file_size INTEGER
+    );
+    CREATE INDEX IF NOT EXISTS tables_dataset_id ON tables (dataset_id);
+    CREATE TABLE IF NOT EXISTS columns (
+        id TEXT PRIMARY KEY,
+        table_id TEXT,
+        name TEXT,
+        description TEXT,
+        observations TEXT,
+        bigquery_type TEXT
+    );
+    CREATE INDEX IF NOT EXISTS columns_table_id ON columns (table_id);
+    CREATE VIRTUAL TABLE IF NOT EXISTS datasets_fts USING fts5(
+        dataset_id UNINDEXED,
+        slug,
+        name,
+        description,
+        organizations,
+        tags,
+        themes,
+        tables,
+        tokenize = 'unicode61 remove_diacritics 2'
+    );
+    CREATE TABLE IF NOT EXISTS sync (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    );
+"""
+
+# Words of a search term, each matched as a prefix
+_WORD = re.compile(r"\w+")
+
+
+class CatalogSnapshot:
+    """
+    Datasets, tables and columns of the catalog, stored in a SQLite file.
+
+    Offers the same `get_datasets`, `get_tables`, `get_columns` and `search`
+    methods as `Backend`, answered locally without network access, so it can
+    be passed as the `backend` of the functions in
+    `basedosdados.download.metadata`. Search uses an FTS5 full-text index of
+    datasets, including the names of their tables.
+
+    Use `Backend.sync_catalog` to create or refresh a snapshot.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Args:
+            path: SQLite file of the snapshot. Created if it does not exist.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+
+        try:
+            with self._lock, self._connection:
+                self._connection.executescript(_SCHEMA)
+        except sqlite3.OperationalError as e:
+            raise BaseDosDadosException(
+                "The catalog snapshot requires SQLite with FTS5 support."
+            ) from e
+
+    def close(self) -> None:
+        """
+        Close the SQLite file.
+        """
+        self._connection.close()
+
+    @property
+    def synced_at(self) -> Optional[float]:
+        """
+        When the snapshot was last synced, as a Unix timestamp.
+        """
+        row = self._fetchone("SELECT value FROM sync WHERE key = 'synced_at'")
+        return None if row is None else float(row["value"])
+
+    def sync(
+        self,
+        backend: "Backend",
+        full: bool = False,
+        page_size: int = 100,
+        max_concurrency: int = 4,
+    ) -> None:
+        """
+        Update the snapshot with the catalog of `backend`.
+
+        Lists the id and `updatedAt` of all datasets, then fetches the
+        datasets that are new or were updated since the last sync, with their
+        tables and columns. Datasets removed from the catalog are removed
+        from the snapshot. Responses cached by the backend are not used, so
+        no update is missed.
+
+        Args:
+            backend: Backend to read the catalog from.
+            full: Whether to fetch all datasets, even the unchanged ones.
+            page_size: Number of datasets listed per request.
+            max_concurrency: Maximum number of requests sent at the same time.
+
+        Returns:
+            None
+        """
+        start = time.time()
+
+        def list_page(page: int) -> dict[str, Any]:
+            variables = {"first": page_size, "offset": (page - 1) * page_size}
+            return backend._execute_query(
+                _LIST_DATASETS_QUERY,
+                variables,
+                page=page,
+                page_size=page_size,
+                refresh=True,
+            ).get("allDataset", {})
+
+        remote = {
+            item["_id"]: item["updatedAt"]
+            for item in _iter_pages(list_page, max_concurrency)
+        }
+        local = {
+            row["id"]: row["updated_at"]
+            for row in self._fetchall("SELECT id, updated_at FROM datasets")
+        }
+        changed = [
+            dataset_id
+            for dataset_id, updated_at in remote.items()
+            if full or local.get(dataset_id) != updated_at
+        ]
+        removed = [
+            dataset_id for dataset_id in local if dataset_id not in remote
+        ]
+
+        def get_dataset(dataset_id: str) -> Optional[dict[str, Any]]:
+            items = (
+                backend._execute_query(
+                    _GET_DATASET_QUERY,
+                    {"dataset_id": dataset_id},
+                    refresh=True,
+                )
+                .get("allDataset", {})
+                .get("items")
+            )
+            return items[0] if items else None
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, max_concurrency)
+        ) as executor:
+            datasets = [
+                dataset
+                for dataset in executor.map(get_dataset, changed)
+                if dataset is not None
+            ]
+
+        with self._lock, self._connection:
+            for dataset_id in removed + changed:
+                self._delete_dataset(dataset_id)
+            for dataset in datasets:
+                self._insert_dataset(dataset)
+            self._connection.execute(
+                "INSERT OR REPLACE INTO sync VALUES ('synced_at', ?)",
+                (str(start),),
+            )
+
+        logger.info(
+            f"Catalog snapshot synced: {len(datasets)} datasets updated, "
+            f"{len(removed)} removed, {len(remote) - len(changed)} unchanged"
+        )
+
+    def get_datasets(
+        self,
+        dataset_id: Optional[str] = None,
+        dataset_name: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 10,
+    ) -> dict[str, Any]:
+        """
+        Get a page of datasets, either by `dataset_id` or `dataset_name`, in
+        the same form as `Backend.get_datasets`.
+        """
+        where, params = self._filters(
+            ("id = ?", dataset_id), ("name LIKE ?", dataset_name, True)
+        )
+        rows, page_total = self._page(
+            f"SELECT * FROM datasets {where} ORDER BY slug",
+            params,
+            page,
+            page_size,
+        )
+        items = [
+            {
+                "slug": row["slug"],
+                "name": row["name"],
+                "description": row["description"],
+                "organizations": {
+                    "items": [
+                        {"name": organization["name"]}
+                        for organization in json.loads(row["organizations"])
+                    ]
+                },
+                "tags": {
+                    "items": [{"name": tag} for tag in json.loads(row["tags"])]
+                },
+                "themes": {
+                    "items": [
+                        {"name": theme} for theme in json.loads(row["themes"])
+                    ]
+                },
+                "createdAt": row["created_at"],
+                "updatedAt": row["updated_at"],
+            }
+            for row in rows
+        ]
+        return self._response(items, page, page_size, page_total)
+
+    def get_tables(
+        self,
+        dataset_id: Optional[str] = None,
+        table_id: Optional[str] = None,
+        table_name: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 10,
+    ) -> dict[str, Any]:
+        """
+        Get a page of tables, either by `dataset_id`, `table_id` or
+        `table_name`, in the same form as `Backend.get_tables`.
+        """
+        where, params = self._filters(
+            ("dataset_id = ?", dataset_id),
+            ("id = ?", table_id),
+            ("name LIKE ?", table_name, True),
+        )
+        rows, page_total = self._page(
+            f"SELECT * FROM tables {where} ORDER BY slug",
+            params,
+            page,
+            page_size,
+        )
+        items = [
+            {
+                "slug": row["slug"],
+                "name": row["name"],
+                "description": row["description"],
+                "numberRows": row["number_rows"],
+                "numberColumns": row["number_columns"],
+                "uncompressedFileSize": row["uncompressed_file_size"],
+            }
+            for row in rows
+        ]
+        return self._response(items, page, page_size, page_total)
+
+    def get_columns(
+        self,
+        table_id: Optional[str] = None,
+        column_id: Optional[str] = None,
+        column_name: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 10,
+    ) -> dict[str, Any]:
+        """
+        Get a page of columns, either by `table_id`, `column_id` or
+        `column_name`, in the same form as `Backend.get_columns`.
+        """
+        where, params = self._filters(
+            ("table_id = ?", table_id),
+            ("id = ?", column_id),
+            ("name LIKE ?", column_name, True),
+        )
+        rows, page_total = self._page(
+            f"SELECT * FROM columns {where} ORDER BY rowid",
+            params,
+            page,
+            page_size,
+        )
+        items = [
+            {
+                "name": row["name"],
+                "description": row["description"],
+                "observations": row["observations"],
+                "bigqueryType": {"name": row["bigquery_type"]},
+            }
+            for row in rows
+        ]
+        return self._response(items, page, page_size, page_total)
+
+    def search(
+        self, q: Optional[str] = None, page: int = 1, page_size: int = 10
+    ) -> dict[str, Any]:
+        """
+        Search for datasets by the term `q`, in the same form as
+        `Backend.search`.
+
+        Every word of `q` must match the start of a word in the slug, name,
+        description, organizations, tags, themes or table names of a
+        dataset, ignoring case and accents. Results are ranked by relevance.
+        """
+        words = _WORD.findall(q or "")
+        offset = (page - 1) * page_size
+
+        if words:
+            match = " ".join(f'"{word}"*' for word in words)
+            count = self._fetchone(
+                "SELECT count(*) FROM datasets_fts WHERE datasets_fts MATCH ?",
+                (match,),
+            )[0]
+            rows = self._fetchall(
+                "SELECT d.*, "
+                "(SELECT count(*) FROM tables t WHERE t.dataset_id = d.id) "
+                "AS n_tables "
+                "FROM datasets_fts f JOIN datasets d ON d.id = f.dataset_id "
+                "WHERE datasets_fts MATCH ? ORDER BY bm25(datasets_fts) "
+                "LIMIT ? OFFSET ?",
+                (match, page_size, offset),
+            )
+        else:
+            count = self._fetchone("SELECT count(*) FROM datasets")[0]
+            rows = self._fetchall(
+                "SELECT d.*, "
+                "(SELECT count(*) FROM tables t WHERE t.dataset_id = d.id) "
+                "AS n_tables "
+                "FROM datasets d ORDER BY slug LIMIT ? OFFSET ?",
+                (page_size, offset),
+            )
+
+        return {
+            "count": count,
+            "results": [
+                {
+                    "id": row["id"],
+                    "slug": row["slug"],
+                    "name": row["name"],
+                    "description": row["description"],
+                    "n_tables": row["n_tables"],
+                    "n_raw_data_sources": None,
+                    "n_information_requests": None,
+                    "organizations": json.loads(row["organizations"]),
+                }
+                for row in rows
+            ],
+        }
+
+    def _delete_dataset(self, dataset_id: str) -> None:
+        self._connection.execute(
+            "DELETE FROM columns WHERE table_id IN "
+            "(SELECT id FROM tables WHERE dataset_id = ?)",
+            (dataset_id,),
+        )
+        for statement in (
+            "DELETE FROM tables WHERE dataset_id = ?",
+            "DELETE FROM datasets WHERE id = ?",
+            "DELETE FROM datasets_fts WHERE dataset_id = ?",
+        ):
+            self._connection.execute(statement, (dataset_id,))
+
+    def _insert_dataset(self, dataset: dict[str, Any]) -> None:
+        organizations = [
+            {"slug": item.get("slug"), "name": item.get("name")}
+            for item in _items(dataset.get("organizations"))
+        ]
+        tags = [item.get("name") for item in _items(dataset.get("tags"))]
+        themes = [item.get("name") for item in _items(dataset.get("themes"))]
+        tables = _items(dataset.get("tables"))
+
+        self._connection.execute(
+            "INSERT INTO datasets VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                dataset["_id"],
+                dataset.get("slug"),
+                dataset.get("name"),
+                dataset.get("description"),
+                json.dumps(organizations),
+                json.dumps(tags),
+                json.dumps(themes),
+                dataset.get("createdAt"),
+                dataset.get("updatedAt"),
+            ),
+        )
+        self._connection.execute(
+            "INSERT INTO datasets_fts VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                dataset["_id"],
+                dataset.get("slug"),
+                dataset.get("name"),
+                dataset.get("description"),
+                " ".join(item["name"] or "" for item in organizations),
+                " ".join(tag or "" for tag in tags),
+                " ".join(theme or "" for theme in themes),
+                " ".join(
+                    f"{table.get('slug') or ''} {table.get('name') or ''}"
+                    for table in tables
+                ),
+            ),
+        )
+        for table in tables:
+            self._connection.execute(
+                "INSERT INTO tables VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    table["_id"],
+                    dataset["_id"],
+                    table.get("slug"),
+                    table.get("name"),
+                    table.get("description"),
+                    table.get("numberRows"),
+                    table.get("numberColumns"),
+                    table.get("uncompressedFileSize"),
+                ),
+            )
+            self._connection.executemany(
+                "INSERT INTO columns VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        column["_id"],
+                        table["_id"],
+                        column.get("name"),
+                        column.get("description"),
+                        column.get("observations"),
+                        (column.get("bigqueryType") or {}).get("name"),
+                    )
+                    for column in _items(table.get("columns"))
+                ],
+            )
+
+    @staticmethod
+    def _filters(*filters: tuple) -> tuple[str, list[Any]]:
+        """
+        Build a `WHERE` clause from `(condition, value[, like])` filters,
+        skipping the ones whose value is empty.
+        """
+        conditions, params = [], []
+        for condition, value, *like in filters:
+            if value:
+                conditions.append(condition)
+                params.append(f"%{value}%" if like else value)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, params
+
+    def _page(
+        self, query: str, params: list[Any], page: int, page_size: int
+    ) -> tuple[list[sqlite3.Row], int]:
+        count = self._fetchone(f"SELECT count(*) FROM ({query})", params)[0]
+        rows = self._fetchall(
+            f"{query} LIMIT ? OFFSET ?",
+            [*params, page_size, (page - 1) * page_size],
+        )
+        return rows, math.ceil(count / page_size)
+
+    @staticmethod
+    def _response(
+        items: list[dict], page: int, page_size: int, page_total: int
+    ) -> dict[str, Any]:
+        return {
+            "items": items,
+            "page": page,
+            "page_size": page_size,
+            "page_total": page_total,
+        }
+
+    def _fetchall(self, query: str, params=()) -> list[sqlite3.Row]:
+        with self._lock:
+            return self._connection.execute(query, params).fetchall()
+
+    def _fetchone(self, query: str, params=()) -> Optional[sqlite3.Row]:
+        with self._lock:
+            return self._connection.execute(query, params).fetchone()
+
+
+def _items(connection: Optional[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Get the items of a simplified GraphQL connection, which may be missing.
+    """
+    return (connection or {}).get("items") or []
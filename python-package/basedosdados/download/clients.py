@@ -0,0 +1,148 @@
+"""
+Pool of Google Cloud clients shared by all downloads of the process.
+"""
+
+import threading
+from typing import Any, Callable, Optional, TypedDict
+
+import google.auth
+import requests
+from google.auth.transport.requests import AuthorizedSession, Request
+from google.cloud import bigquery, bigquery_storage_v1, storage
+from google.cloud.bigquery import client as bigquery_client
+from google.cloud.storage import client as storage_client
+from loguru import logger
+
+from basedosdados.constants import config
+
+_SCOPES = ["https://www.googleapis.com/auth/cloud-platform"]
+
+
+class _GoogleClient(TypedDict):
+    bigquery: bigquery_client.Client
+    bigquery_storage: bigquery_storage_v1.BigQueryReadClient
+    storage: storage_client.Client
+
+
+class _AuthorizedSession(AuthorizedSession):
+    """
+    Authorized HTTP session safe to share between threads.
+
+    Expired credentials are refreshed by a single thread while the others
+    wait, instead of every thread refreshing them at once.
+    """
+
+    def __init__(self, credentials: Any, max_connections: int):
+        super().__init__(credentials)
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=max_connections, pool_maxsize=max_connections
+        )
+        self.mount("https://", adapter)
+        self._refresh_lock = threading.Lock()
+
+    def request(self, method, url, *args, **kwargs):
+        if not self.credentials.valid:
+            with self._refresh_lock:
+                if not self.credentials.valid:
+                    self.credentials.refresh(Request())
+        return super().request(method, url, *args, **kwargs)
+
+
+class ClientPool:
+    """
+    Thread-safe pool of BigQuery, BigQuery Storage and Storage clients.
+
+    Clients are created once per billing project and credentials source and
+    shared by all threads. The BigQuery and Storage clients share a single
+    HTTP session, whose connections are kept open and reused, and a single
+    set of credentials.
+    """
+
+    def __init__(self, max_connections: Optional[int] = None):
+        """
+        Args:
+            max_connections: Maximum number of connections kept open per host.
+                Defaults to `config.max_connections`.
+        """
+        self.max_connections = max_connections
+        self._clients: dict[
+            tuple, tuple[_GoogleClient, _AuthorizedSession]
+        ] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        billing_project_id: str,
+        from_file: bool,
+        reauth: bool,
+        credentials: Callable[[], Any],
+    ) -> _GoogleClient:
+        """
+        Get the clients of a billing project, creating them on first use.
+
+        Args:
+            billing_project_id: Project that will be billed.
+            from_file: Whether the credentials come from file.
+            reauth: Whether the credentials were re-authorized.
+            credentials: Function returning the credentials, called only when
+                the clients are created. If it returns None, the application
+                default credentials are used.
+
+        Returns:
+            BigQuery and Storage clients.
+        """
+        key = (billing_project_id, from_file, reauth)
+
+        with self._lock:
+            if key not in self._clients:
+                self._clients[key] = self._create(
+                    billing_project_id, credentials()
+                )
+            return self._clients[key][0]
+
+    def close(self) -> None:
+        """
+        Close all clients and their connections.
+
+        Clients requested afterwards are created again.
+        """
+        with self._lock:
+            for client, session in self._clients.values():
+                client["bigquery"].close()
+                client["bigquery_storage"].transport.close()
+                session.close()
+            self._clients.clear()
+
+    def _create(
+        self, billing_project_id: str, credentials: Any
+    ) -> tuple[_GoogleClient, _AuthorizedSession]:
+        if credentials is None:
+            credentials, _ = google.auth.default(scopes=_SCOPES)
+
+        max_connections = self.max_connections or config.max_connections
+        session = _AuthorizedSession(credentials, max_connections)
+        logger.debug(
+            f"Creating clients for {billing_project_id} with up to "
+            f"{max_connections} connections per host"
+        )
+
+        client: _GoogleClient = {
+            "bigquery": bigquery.Client(
+                credentials=credentials,
+                project=billing_project_id,
+                _http=session,
+            ),
+            "bigquery_storage": bigquery_storage_v1.BigQueryReadClient(
+                credentials=credentials,
+            ),
+            "storage": storage.Client(
+                credentials=credentials,
+                project=billing_project_id,
+                _http=session,
+            ),
+        }
+        return client, session
+
+
+# shared by all downloads of this process
+client_pool = ClientPool()
@@ -1,38 +1,175 @@
 """Functions for managing downloads."""
 
+import base64
+import datetime
 import gzip
+import json
+import math
+import numbers
 import os
+import random
 import re
 import shutil
 import sys
+import threading
 import time
-from functools import lru_cache, partialmethod
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from functools import partialmethod
 from pathlib import Path
-from typing import Optional, TypedDict, Union
+from typing import Any, BinaryIO, Iterator, Optional, Union
 
+import db_dtypes
+import google_crc32c
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from google.api_core.exceptions import (
+    BadRequest,
+    Conflict,
+    Forbidden,
+    GoogleAPICallError,
+    NotFound,
+)
 from google.cloud import bigquery, bigquery_storage_v1, storage
-from google.cloud.bigquery import client as bigquery_client
-from google.cloud.storage import client as storage_client
-from pandas_gbq import read_gbq
+from google.cloud.bigquery_storage_v1 import types as bigquery_storage_types
+from loguru import logger
 from pandas_gbq.gbq import GenericGBQException
 from pydata_google_auth import cache, get_user_credentials
 from pydata_google_auth.exceptions import PyDataCredentialsError
+from tqdm import tqdm
+
+try:
+    from google.cloud.storage.exceptions import DataCorruption
+except ImportError:
+    # google-cloud-storage < 3
+    from google.resumable_media.common import DataCorruption
 
 from basedosdados.constants import config
 from basedosdados.core.base import Base
+from basedosdados.core.table_metadata import table_metadata
+from basedosdados.download.cache import QueryCache
+from basedosdados.download.clients import _GoogleClient, client_pool
 from basedosdados.exceptions import (
     BaseDosDadosAccessDeniedException,
     BaseDosDadosAuthorizationException,
     BaseDosDadosException,
     BaseDosDadosInvalidProjectIDException,
+    BaseDosDadosMaximumBytesBilledException,
+    BaseDosDadosMissingDependencyException,
     BaseDosDadosNoBillingProjectIDException,
 )
 
+try:
+    import fastavro
+
+    _avro_dependencies = True
+except ImportError:
+    _avro_dependencies = False
+
+try:
+    # fastavro reads and writes SNAPPY blocks with cramjam
+    import cramjam  # noqa: F401
+
+    _snappy_dependencies = True
+except ImportError:
+    _snappy_dependencies = False
+
+# Size of the chunks used when copying exported files to their destination
+_BUFFER_SIZE = 16 * 1024 * 1024
+
+# Result types accepted by the `output` argument of `read_sql` and `read_table`
+_OUTPUT_TYPES = ("pandas", "arrow", "batches")
+
+# Comparison operators accepted in `filters`
+_FILTER_OPERATORS = ("=", "!=", "<>", "<", "<=", ">", ">=", "in", "not in")
+
+# Column names must be plain identifiers, so they can be quoted with backticks
+# without escaping
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# Staging buckets known to exist, shared by all downloads of this process
+_staging_buckets: set[str] = set()
+_staging_buckets_lock = threading.Lock()
+
+# Days after which exported files left in a staging bucket are deleted
+_STAGING_BUCKET_TTL_DAYS = 1
+
+# BigQuery destination format and default compression for each file extension
+_EXPORT_FORMATS = {
+    ".csv": ("CSV", "GZIP"),
+    ".parquet": ("PARQUET", "SNAPPY"),
+    ".avro": ("AVRO", "DEFLATE"),
+}
+
+
+@dataclass
+class QueryChunk:
+    """
+    A chunk of a query result, as yielded by `iter_sql`.
+
+    Attributes:
+        data: Rows of the chunk, as a pandas DataFrame or a `pyarrow.Table`.
+        destination: Table holding the full query result, in the form
+            `project.dataset.table`.
+        page_token: Token of the page that follows this chunk, or None if this
+            is the last one. Pass it to `iter_sql` together with `destination`
+            to resume reading after this chunk.
+        rows: Number of rows read so far, including this chunk.
+        bytes: Number of bytes read so far, including this chunk.
+        total_rows: Number of rows in the full result, if known.
+    """
+
+    data: Union[pd.DataFrame, pa.Table]
+    destination: str
+    page_token: Optional[str]
+    rows: int
+    bytes: int
+    total_rows: Optional[int]
+
+
+@dataclass
+class JobStatistics:
+    """
+    Statistics of a finished BigQuery job, as returned by `download`.
+
+    Attributes:
+        job_id: Id of the job.
+        elapsed: Seconds spent waiting for the job to finish.
+        total_bytes_processed: Bytes processed by the query.
+        total_bytes_billed: Bytes billed for the query.
+        slot_millis: Slot milliseconds consumed by the job.
+        cache_hit: Whether the query result came from the BigQuery cache.
+    """
+
+    job_id: str
+    elapsed: float
+    total_bytes_processed: Optional[int] = None
+    total_bytes_billed: Optional[int] = None
+    slot_millis: Optional[int] = None
+    cache_hit: Optional[bool] = None
+
+
+@dataclass
+class DownloadResult:
+    """
+    Outcome of a single download, as returned by `download_many`.
+
+    Attributes:
+        savepath: File path the result was saved to, or None if the download
+            had none.
+        elapsed: Seconds spent on the download.
+        statistics: Statistics of the query job, if a query was run.
+        error: Exception raised by the download, if it failed.
+    """
 
-class _GoogleClient(TypedDict):
-    bigquery: bigquery_client.Client
-    storage: storage_client.Client
+    savepath: Optional[Path]
+    elapsed: float
+    statistics: Optional[JobStatistics] = None
+    error: Optional[Exception] = None
 
 
 def _set_config_variables(
@@ -62,10 +199,18 @@ def read_sql(
     from_file: bool = False,
     reauth: bool = False,
     use_bqstorage_api: bool = False,
-) -> pd.DataFrame:
+    output: str = "pandas",
+    use_cache: bool = False,
+    cache_ttl: Optional[float] = None,
+    maximum_bytes_billed: Optional[int] = None,
+    confirm: bool = False,
+) -> Union[pd.DataFrame, pa.Table, Iterator[pa.RecordBatch]]:
     """
-    Load data from BigQuery using a query. Just a wrapper around
-    `pandas.read_gbq`.
+    Load data from BigQuery using a query.
+
+    Queries run on the BigQuery and Storage clients shared by all calls with
+    the same credentials. DataFrames get the same nullable dtypes as
+    `pandas_gbq.read_gbq`, such as `Int64`, `boolean` and `dbdate`.
 
     Args:
         query: Valid SQL Standard Query to basedosdados.
@@ -81,16 +226,44 @@ def read_sql(
             [Enable API](https://console.cloud.google.com/apis/library/bigquerystorage.googleapis.com).
             You must also have the `bigquery.readsessions.create` permission on
             the project you are billing queries to.
+        output: Type of the result. Can be one of:
+            * `pandas`: a pandas DataFrame.
+            * `arrow`: a `pyarrow.Table`, without converting it to pandas.
+            * `batches`: an iterator of `pyarrow.RecordBatch`, fetched
+                incrementally so results larger than memory can be streamed.
+                With `use_bqstorage_api`, batches come from the BigQuery
+                Storage Read API.
+        use_cache: Store the result in a local cache, in
+            `~/.basedosdados/cache`, and reuse it when the same query is run
+            again. Cached results are discarded once a table read by the query
+            is modified. Not used with `output="batches"`.
+        cache_ttl: Maximum age, in seconds, of a cached result. Never expires
+            if None.
+        maximum_bytes_billed: Maximum number of bytes the query may process.
+            The query is estimated with a free dry run before it runs, and
+            refused if the estimate is higher. Defaults to
+            `config.maximum_bytes_billed`. No limit if both are None.
+        confirm: Ask for confirmation in the terminal, instead of refusing the
+            query, when the estimate is above `maximum_bytes_billed`.
 
     Returns:
-        Query result as a pandas DataFrame.
+        Query result as a pandas DataFrame, a `pyarrow.Table` or an iterator
+            of `pyarrow.RecordBatch`, depending on `output`.
+
+    Raises:
+        BaseDosDadosMaximumBytesBilledException: If the query would process
+            more than `maximum_bytes_billed` bytes.
     """
     billing_project_id, from_file = _set_config_variables(
         billing_project_id=billing_project_id,
         from_file=from_file,
     )
 
+    _check_output(output)
+
     try:
+        client = _google_client(billing_project_id, from_file, reauth)
+
         # Set a two hours timeout
         bigquery_storage_v1.client.BigQueryReadClient.read_rows = (
             partialmethod(
@@ -99,12 +272,50 @@ def read_sql(
             )  # type: ignore
         )
 
-        return read_gbq(
+        if use_cache and output != "batches":
+            return _read_sql_cached(
+                client,
+                query,
+                billing_project_id=billing_project_id,
+                use_bqstorage_api=use_bqstorage_api,
+                output=output,
+                cache_ttl=cache_ttl,
+                maximum_bytes_billed=maximum_bytes_billed,
+                confirm=confirm,
+            )
+
+        _check_bytes_processed(
+            client,
             query,
-            project_id=billing_project_id,
-            use_bqstorage_api=use_bqstorage_api,
-            credentials=_credentials(from_file=from_file, reauth=reauth),
-        )  # type: ignore
+            maximum_bytes_billed=maximum_bytes_billed,
+            confirm=confirm,
+        )
+
+        if output != "pandas":
+            return _read_sql_arrow(
+                client,
+                query,
+                use_bqstorage_api=use_bqstorage_api,
+                batches=output == "batches",
+            )
+
+        try:
+            table = _read_sql_arrow(
+                client, query, use_bqstorage_api=use_bqstorage_api
+            )
+        except GoogleAPICallError as e:
+            # report errors as pandas-gbq, which used to run these queries
+            raise GenericGBQException(f"Reason: {e}") from e
+        return _arrow_to_pandas(table)
+    except Forbidden as e:
+        raise BaseDosDadosAccessDeniedException from e
+
+    except BadRequest as e:
+        if re.search("[Pp]roject[ ]*I[Dd]", str(e)):
+            raise BaseDosDadosInvalidProjectIDException from e
+
+        raise e
+
     except GenericGBQException as e:
         if "Reason: 403" in str(e):
             raise BaseDosDadosAccessDeniedException from e
@@ -127,6 +338,236 @@ def read_sql(
         raise e
 
 
+def _read_sql_cached(
+    client: _GoogleClient,
+    query: str,
+    billing_project_id: str,
+    use_bqstorage_api: bool = False,
+    output: str = "pandas",
+    cache_ttl: Optional[float] = None,
+    maximum_bytes_billed: Optional[int] = None,
+    confirm: bool = False,
+) -> Union[pd.DataFrame, pa.Table]:
+    """
+    Load a query result from the local cache, running the query on a miss.
+    """
+    cache = QueryCache()
+    key = cache.key(query, billing_project_id)
+
+    table = cache.get(key, client["bigquery"], ttl=cache_ttl)
+    if table is None:
+        # a dry run is free, lists the tables the query reads and estimates
+        # the bytes it processes
+        dry_run = _dry_run(client, query)
+        _check_bytes_processed(
+            client,
+            query,
+            maximum_bytes_billed=maximum_bytes_billed,
+            confirm=confirm,
+            dry_run=dry_run,
+        )
+        table = _read_sql_arrow(
+            client, query, use_bqstorage_api=use_bqstorage_api
+        )
+        cache.set(
+            key,
+            table,
+            tables=[
+                f"{ref.project}.{ref.dataset_id}.{ref.table_id}"
+                for ref in dry_run.referenced_tables
+            ],
+        )
+
+    return table if output == "arrow" else _arrow_to_pandas(table)
+
+
+def estimate_bytes_processed(
+    query: str,
+    billing_project_id: Optional[str] = None,
+    from_file: bool = False,
+    reauth: bool = False,
+) -> int:
+    """
+    Estimate how many bytes a query will process, with a free dry run.
+
+    BigQuery bills queries by the bytes they process, so this is an estimate
+    of their cost before running them.
+
+    Args:
+        query: Valid SQL Standard Query to basedosdados.
+        billing_project_id: Project that will be billed. Find your Project ID
+            [here](https://console.cloud.google.com/projectselector2/home/dashboard).
+        from_file: Uses the credentials from file, located in
+            `~/.basedosdados/credentials/`.
+        reauth: Re-authorize Google Cloud Project in case you need to change
+            user or reset configurations.
+
+    Returns:
+        The number of bytes the query will process.
+    """
+    billing_project_id, from_file = _set_config_variables(
+        billing_project_id=billing_project_id,
+        from_file=from_file,
+    )
+    client = _google_client(billing_project_id, from_file, reauth)
+
+    try:
+        return _dry_run(client, query).total_bytes_processed or 0
+    except Forbidden as e:
+        raise BaseDosDadosAccessDeniedException from e
+
+
+def _dry_run(client: _GoogleClient, query: str) -> bigquery.QueryJob:
+    """
+    Validate a query without running it.
+    """
+    return client["bigquery"].query(
+        query,
+        job_config=bigquery.QueryJobConfig(
+            dry_run=True, use_query_cache=False
+        ),
+    )
+
+
+def _check_bytes_processed(
+    client: _GoogleClient,
+    query: str,
+    maximum_bytes_billed: Optional[int] = None,
+    confirm: bool = False,
+    dry_run: Optional[bigquery.QueryJob] = None,
+) -> None:
+    """
+    Refuse a query estimated to process more than `maximum_bytes_billed`.
+
+    Args:
+        client: BigQuery and Storage clients.
+        query: Valid SQL Standard Query.
+        maximum_bytes_billed: Maximum number of bytes the query may process.
+            Defaults to `config.maximum_bytes_billed`. Does nothing if both
+            are None.
+        confirm: Ask for confirmation in the terminal instead of refusing the
+            query. Queries are refused anyway if there is no terminal.
+        dry_run: Dry run of the query, if it was already run. Runs one if
+            None.
+
+    Returns:
+        None
+
+    Raises:
+        BaseDosDadosMaximumBytesBilledException: If the query would process
+            too many bytes and was not confirmed.
+    """
+    if maximum_bytes_billed is None:
+        maximum_bytes_billed = config.maximum_bytes_billed
+    if maximum_bytes_billed is None:
+        return
+
+    if dry_run is None:
+        dry_run = _dry_run(client, query)
+    total_bytes_processed = dry_run.total_bytes_processed or 0
+    logger.info(f"Query will process {total_bytes_processed / 1024**3:.2f} GB")
+    if total_bytes_processed <= maximum_bytes_billed:
+        return
+
+    if confirm and sys.stdin.isatty():
+        answer = input(
+            f"This query will process {total_bytes_processed / 1024**3:.2f} "
+            f"GB, above the maximum of {maximum_bytes_billed / 1024**3:.2f} "
+            "GB. Run it anyway? [y/N] "
+        )
+        if answer.strip().lower() in ("y", "yes"):
+            return
+
+    raise BaseDosDadosMaximumBytesBilledException(
+        total_bytes_processed, maximum_bytes_billed
+    )
+
+
+def _read_sql_arrow(
+    client: _GoogleClient,
+    query: str,
+    use_bqstorage_api: bool = False,
+    batches: bool = False,
+) -> Union[pa.Table, Iterator[pa.RecordBatch]]:
+    """
+    Run a query and fetch its result as Arrow data.
+
+    Args:
+        client: BigQuery and Storage clients.
+        query: Valid SQL Standard Query.
+        use_bqstorage_api: Whether to read the result with the BigQuery
+            Storage Read API.
+        batches: Whether to return an iterator of record batches instead of a
+            single table.
+
+    Returns:
+        A `pyarrow.Table` or an iterator of `pyarrow.RecordBatch`.
+    """
+    rows = client["bigquery"].query(query).result()
+    bqstorage_client = (
+        client["bigquery_storage"] if use_bqstorage_api else None
+    )
+
+    if batches:
+        return rows.to_arrow_iterable(bqstorage_client=bqstorage_client)
+
+    return rows.to_arrow(
+        bqstorage_client=bqstorage_client,
+        create_bqstorage_client=False,
+    )
+
+
+def _arrow_to_pandas(table: pa.Table) -> pd.DataFrame:
+    """
+    Convert Arrow data to a DataFrame with the dtypes of `pandas_gbq`.
+
+    Integers, booleans, dates and times get nullable dtypes. Dates and
+    timestamps out of the range of pandas are kept as Python objects.
+
+    Args:
+        table: Arrow data of a query result.
+
+    Returns:
+        The data as a pandas DataFrame.
+    """
+
+    def fits_in_pandas(column: pa.ChunkedArray) -> bool:
+        try:
+            column.cast(pa.timestamp("ns"))
+        except pa.ArrowInvalid:
+            return False
+        return True
+
+    date_as_object = not all(
+        fits_in_pandas(column)
+        for column in table.columns
+        if pa.types.is_date(column.type)
+    )
+    timestamp_as_object = not all(
+        fits_in_pandas(column)
+        for column in table.columns
+        if pa.types.is_timestamp(column.type)
+    )
+
+    def types_mapper(arrow_type: pa.DataType) -> Any:
+        if pa.types.is_int64(arrow_type):
+            return pd.Int64Dtype()
+        if pa.types.is_boolean(arrow_type):
+            return pd.BooleanDtype()
+        if pa.types.is_date(arrow_type) and not date_as_object:
+            return db_dtypes.DateDtype()
+        if pa.types.is_time(arrow_type):
+            return db_dtypes.TimeDtype()
+        return None
+
+    return table.to_pandas(
+        date_as_object=date_as_object,
+        timestamp_as_object=timestamp_as_object,
+        integer_object_nulls=True,
+        types_mapper=types_mapper,
+    )
+
+
 def read_table(
     dataset_id: str,
     table_id: str,
@@ -136,7 +577,12 @@ def read_table(
     from_file: bool = False,
     reauth: bool = False,
     use_bqstorage_api: bool = False,
-) -> pd.DataFrame:
+    output: str = "pandas",
+    direct_read: bool = False,
+    max_streams: int = 8,
+    columns: Optional[list[str]] = None,
+    filters: Optional[list[tuple[str, str, Any]]] = None,
+) -> Union[pd.DataFrame, pa.Table, Iterator[pa.RecordBatch]]:
     """
     Load data from BigQuery using `dataset_id` and `table_id`.
 
@@ -160,21 +606,68 @@ def read_table(
             [Enable API](https://console.cloud.google.com/apis/library/bigquerystorage.googleapis.com).
             You must also have the `bigquery.readsessions.create` permission on
             the project you are billing queries to.
+        output: Type of the result. Can be one of:
+            * `pandas`: a pandas DataFrame.
+            * `arrow`: a `pyarrow.Table`, without converting it to pandas.
+            * `batches`: an iterator of `pyarrow.RecordBatch`, fetched
+                incrementally so results larger than memory can be streamed.
+                With `use_bqstorage_api`, batches come from the BigQuery
+                Storage Read API.
+        direct_read: Read the table directly with the BigQuery Storage Read
+            API instead of running a query, which avoids the query cost and
+            latency. Falls back to a query for views or when `limit` is set.
+            Requires the `bigquery.readsessions.create` permission on the
+            billing project.
+        max_streams: Maximum number of Storage Read API streams read in
+            parallel when `direct_read` is set.
+        columns: Columns to read. Reads all columns if None.
+        filters: Conditions rows must match to be read, as a list of
+            `(column, operator, value)` tuples joined by `AND`, such as
+            `[("ano", "=", 2020), ("sigla_uf", "in", ["SP", "RJ"])]`.
+            Operators can be one of
+            ["="|"!="|"<>"|"<"|"<="|">"|">="|"in"|"not in"]. Filtering on
+            partition columns reduces the data scanned.
 
     Returns:
-        Query result as a pandas DataFrame.
+        Query result as a pandas DataFrame, a `pyarrow.Table` or an iterator
+            of `pyarrow.RecordBatch`, depending on `output`.
     """
     billing_project_id, from_file = _set_config_variables(
         billing_project_id=billing_project_id,
         from_file=from_file,
     )
-
-    query = f"""
-    SELECT *
-    FROM `{query_project_id}.{dataset_id}.{table_id}`"""
-
-    if limit is not None:
-        query += f" LIMIT {limit}"
+    _check_output(output)
+
+    if direct_read and limit is None:
+        client = _google_client(billing_project_id, from_file, reauth)
+        if _is_table(client, dataset_id, table_id, query_project_id):
+            try:
+                session = _create_read_session(
+                    client,
+                    dataset_id,
+                    table_id,
+                    query_project_id,
+                    max_streams=max_streams,
+                    selected_fields=_check_columns(columns),
+                    row_restriction=_compile_filters(filters),
+                )
+            except Forbidden as e:
+                raise BaseDosDadosAccessDeniedException from e
+
+            if output == "batches":
+                return _iter_read_session(client, session)
+
+            table = _read_session_to_arrow(client, session)
+            return table if output == "arrow" else _arrow_to_pandas(table)
+
+    query = _build_query(
+        dataset_id,
+        table_id,
+        query_project_id,
+        columns=columns,
+        filters=filters,
+        limit=limit,
+    )
 
     return read_sql(
         query,
@@ -182,8 +675,354 @@ def read_table(
         from_file=from_file,
         reauth=reauth,
         use_bqstorage_api=use_bqstorage_api,
+        output=output,
+    )
+
+
+def _check_output(output: str) -> None:
+    """
+    Check whether `output` is a supported result type.
+    """
+    if output not in _OUTPUT_TYPES:
+        raise BaseDosDadosException(
+            f"Output must be one of {_OUTPUT_TYPES}, got: {output}",
+        )
+
+
+def _build_query(
+    dataset_id: str,
+    table_id: str,
+    project_id: str = "basedosdados",
+    columns: Optional[list[str]] = None,
+    filters: Optional[list[tuple[str, str, Any]]] = None,
+    limit: Optional[int] = None,
+) -> str:
+    """
+    Build a query reading `columns` of the rows of a table matching `filters`.
+    """
+    selected = ", ".join(map(_quote, _check_columns(columns) or [])) or "*"
+    query = f"""
+    SELECT {selected}
+    FROM `{project_id}.{dataset_id}.{table_id}`"""
+
+    where = _compile_filters(filters)
+    if where:
+        query += f"\n    WHERE {where}"
+
+    if limit is not None:
+        query += f" LIMIT {int(limit)}"
+
+    return query
+
+
+def _check_columns(columns: Optional[list[str]]) -> Optional[list[str]]:
+    """
+    Check whether all column names are plain identifiers.
+    """
+    for column in columns or []:
+        if not isinstance(column, str) or not _IDENTIFIER.match(column):
+            raise BaseDosDadosException(f"Invalid column name: {column!r}")
+
+    return columns
+
+
+def _quote(column: str) -> str:
+    """
+    Quote a column name, which may be a reserved word such as `hash`.
+    """
+    return f"`{column}`"
+
+
+def _compile_filters(
+    filters: Optional[list[tuple[str, str, Any]]],
+) -> Optional[str]:
+    """
+    Compile `(column, operator, value)` filters into a SQL predicate.
+
+    The predicate is valid both in a query `WHERE` clause and as a Storage Read
+    API `row_restriction`. Column names are quoted with backticks and values
+    are rendered as quoted literals, never interpolated as they are.
+    """
+    if not filters:
+        return None
+
+    conditions = []
+    for condition in filters:
+        try:
+            column, operator, value = condition
+        except (TypeError, ValueError) as e:
+            raise BaseDosDadosException(
+                f"Filters must be (column, operator, value) tuples, got: {condition!r}"
+            ) from e
+
+        _check_columns([column])
+        column = _quote(column)
+        operator = str(operator).lower().strip()
+        if operator not in _FILTER_OPERATORS:
+            raise BaseDosDadosException(
+                f"Filter operator must be one of {_FILTER_OPERATORS}, got: {operator!r}"
+            )
+
+        if operator in ("in", "not in"):
+            if isinstance(value, (str, bytes)) or not value:
+                raise BaseDosDadosException(
+                    f"Filter operator {operator!r} needs a non-empty list of values"
+                )
+            values = ", ".join(_sql_literal(v) for v in value)
+            conditions.append(f"{column} {operator.upper()} ({values})")
+        elif value is None and operator in ("=", "!=", "<>"):
+            negation = "" if operator == "=" else "NOT "
+            conditions.append(f"{column} IS {negation}NULL")
+        else:
+            conditions.append(f"{column} {operator} {_sql_literal(value)}")
+
+    return " AND ".join(conditions)
+
+
+def _sql_literal(value: Any) -> str:
+    """
+    Render a Python value as a SQL literal.
+    """
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, numbers.Integral):
+        return str(int(value))
+    if isinstance(value, numbers.Real) and math.isfinite(value):
+        return repr(float(value))
+    if isinstance(value, str):
+        escaped = (
+            value.replace("\\", "\\\\")
+            .replace("'", "\\'")
+            .replace("\n", "\\n")
+            .replace("\r", "\\r")
+        )
+        return f"'{escaped}'"
+    if isinstance(value, datetime.datetime):
+        # DATETIME literals can't have a time zone
+        kind = "DATETIME" if value.utcoffset() is None else "TIMESTAMP"
+        return f"{kind} '{value.isoformat(sep=' ')}'"
+    if isinstance(value, datetime.date):
+        return f"DATE '{value.isoformat()}'"
+
+    raise BaseDosDadosException(f"Unsupported filter value: {value!r}")
+
+
+def _create_read_session(
+    client: _GoogleClient,
+    dataset_id: str,
+    table_id: str,
+    project_id: str = "basedosdados",
+    max_streams: int = 8,
+    selected_fields: Optional[list[str]] = None,
+    row_restriction: Optional[str] = None,
+) -> bigquery_storage_types.ReadSession:
+    """
+    Create a BigQuery Storage Read API session over a table.
+
+    Args:
+        client: BigQuery and Storage clients.
+        dataset_id: Dataset id available in `project_id`.
+        table_id: Table id available in `project_id.dataset_id`.
+        project_id: In case you want to read another project, defaults to
+            'basedosdados'.
+        max_streams: Maximum number of streams in the session. The API may
+            create fewer streams for small tables.
+        selected_fields: Columns to read. Reads all columns if empty.
+        row_restriction: SQL predicate rows must match to be read, such as
+            `ano = 2020 AND sigla_uf IN ("SP", "RJ")`.
+
+    Returns:
+        The read session, billed to the BigQuery client project.
+    """
+    requested_session = bigquery_storage_types.ReadSession(
+        table=f"projects/{project_id}/datasets/{dataset_id}/tables/{table_id}",
+        data_format=bigquery_storage_types.DataFormat.ARROW,
+        read_options=bigquery_storage_types.ReadSession.TableReadOptions(
+            selected_fields=selected_fields or [],
+            row_restriction=row_restriction or "",
+        ),
+    )
+
+    return client["bigquery_storage"].create_read_session(
+        parent=f"projects/{client['bigquery'].project}",
+        read_session=requested_session,
+        max_stream_count=max_streams,
+    )
+
+
+def _read_session_to_arrow(
+    client: _GoogleClient,
+    session: bigquery_storage_types.ReadSession,
+) -> pa.Table:
+    """
+    Read all streams of a session in parallel into a single `pyarrow.Table`.
+    """
+
+    def read_stream(stream):
+        return (
+            client["bigquery_storage"].read_rows(stream.name).to_arrow(session)
+        )
+
+    if not session.streams:
+        # empty tables produce sessions without streams
+        return pa.ipc.read_schema(
+            pa.py_buffer(session.arrow_schema.serialized_schema)
+        ).empty_table()
+
+    with ThreadPoolExecutor(max_workers=len(session.streams)) as executor:
+        tables = list(executor.map(read_stream, session.streams))
+
+    return pa.concat_tables(tables)
+
+
+def _iter_read_session(
+    client: _GoogleClient,
+    session: bigquery_storage_types.ReadSession,
+) -> Iterator[pa.RecordBatch]:
+    """
+    Iterate over the record batches of all streams of a session.
+
+    Streams are read in parallel, taking turns: the next batch of each stream
+    is fetched while the current one is consumed, so at most one batch per
+    stream is held in memory.
+    """
+
+    def next_batch(pages: Iterator[Any]) -> Optional[pa.RecordBatch]:
+        page = next(pages, None)
+        return None if page is None else page.to_arrow()
+
+    readers = [
+        iter(
+            client["bigquery_storage"]
+            .read_rows(stream.name)
+            .rows(session)
+            .pages
+        )
+        for stream in session.streams
+    ]
+    if not readers:
+        return
+
+    with ThreadPoolExecutor(max_workers=len(readers)) as executor:
+        window = deque(
+            (pages, executor.submit(next_batch, pages)) for pages in readers
+        )
+        try:
+            while window:
+                pages, future = window.popleft()
+                batch = future.result()
+                if batch is None:
+                    continue
+                window.append((pages, executor.submit(next_batch, pages)))
+                yield batch
+        finally:
+            # don't fetch more batches if the iteration is stopped early
+            for _, future in window:
+                future.cancel()
+
+
+def iter_sql(
+    query: Optional[str] = None,
+    billing_project_id: Optional[str] = None,
+    chunk_rows: int = 100_000,
+    output: str = "pandas",
+    from_file: bool = False,
+    reauth: bool = False,
+    destination: Optional[str] = None,
+    page_token: Optional[str] = None,
+    progress: bool = False,
+) -> Iterator[QueryChunk]:
+    """
+    Iterate over the result of a query in chunks of bounded size.
+
+    The query result is paged through its destination table, so only one chunk
+    is held in memory at a time.
+
+    * Reading a **query**:
+
+        `for chunk in iter_sql('select * from basedosdados.br_ibge_pib.municipio'):`
+
+    * Resuming from the last chunk read:
+
+        `iter_sql(destination=chunk.destination, page_token=chunk.page_token)`
+
+    Args:
+        query: Valid SQL Standard Query to basedosdados. Not required when
+            resuming from `destination`.
+        billing_project_id: Project that will be billed. Find your Project ID
+            [here](https://console.cloud.google.com/projectselector2/home/dashboard).
+        chunk_rows: Maximum number of rows per chunk. BigQuery may return
+            fewer rows per page for very wide rows.
+        output: Type of each chunk, `pandas` for a DataFrame or `arrow` for a
+            `pyarrow.Table`.
+        from_file: Uses the credentials from file, located in
+            `~/.basedosdados/credentials/`.
+        reauth: Re-authorize Google Cloud Project in case you need to change
+            user or reset configurations.
+        destination: Table holding a query result, in the form
+            `project.dataset.table`, as given by `QueryChunk.destination`. If
+            set, the query is not run again. Anonymous query results are kept
+            by BigQuery for about 24 hours.
+        page_token: Page to start reading from, as given by
+            `QueryChunk.page_token`.
+        progress: Whether to show a progress bar with rows and bytes read.
+
+    Yields:
+        `QueryChunk` objects, with the rows and the read progress.
+
+    Raises:
+        BaseDosDadosException: If neither `query` nor `destination` are filled
+            or if the output type is not supported.
+    """
+    billing_project_id, from_file = _set_config_variables(
+        billing_project_id=billing_project_id,
+        from_file=from_file,
     )
 
+    if query is None and destination is None:
+        raise BaseDosDadosException(
+            "Either query or destination should be filled.",
+        )
+
+    if output not in ("pandas", "arrow"):
+        raise BaseDosDadosException(
+            f"Output must be one of ('pandas', 'arrow'), got: {output}",
+        )
+
+    client = _google_client(billing_project_id, from_file, reauth)
+
+    if destination is None:
+        job = client["bigquery"].query(query)
+        _wait_for(job)
+        table_ref = job.destination
+    else:
+        table_ref = bigquery.TableReference.from_string(destination)
+
+    rows = client["bigquery"].list_rows(
+        table_ref, page_size=chunk_rows, page_token=page_token
+    )
+
+    n_rows, n_bytes = 0, 0
+    with tqdm(
+        unit="rows", desc="Read Query Chunk", disable=not progress
+    ) as pbar:
+        for batch in rows.to_arrow_iterable():
+            n_rows += batch.num_rows
+            n_bytes += batch.nbytes
+            pbar.total = rows.total_rows
+            pbar.set_postfix(bytes=n_bytes)
+            pbar.update(batch.num_rows)
+
+            data = pa.Table.from_batches([batch])
+            yield QueryChunk(
+                data=data.to_pandas() if output == "pandas" else data,
+                destination=f"{table_ref.project}.{table_ref.dataset_id}.{table_ref.table_id}",
+                page_token=rows.next_page_token,
+                rows=n_rows,
+                bytes=n_bytes,
+                total_rows=rows.total_rows,
+            )
+
 
 def download(
     savepath: Union[str, Path],
@@ -195,8 +1034,17 @@ def download(
     limit: Optional[int] = None,
     from_file: bool = False,
     reauth: bool = False,
-    compression: str = "GZIP",
-) -> None:
+    compression: Optional[str] = None,
+    max_workers: int = 8,
+    merge_shards: bool = True,
+    columns: Optional[list[str]] = None,
+    filters: Optional[list[tuple[str, str, Any]]] = None,
+    job_timeout: Optional[float] = None,
+    reuse_bucket: bool = False,
+    resumable: bool = False,
+    maximum_bytes_billed: Optional[int] = None,
+    confirm: bool = False,
+) -> Optional[JobStatistics]:
     """
     Download table or query result from basedosdados BigQuery (or other).
 
@@ -214,7 +1062,8 @@ def download(
 
 
     Args:
-        savepath: File path to save the result. Only supports `.csv`.
+        savepath: File path to save the result. Supports `.csv`, `.parquet`
+            and `.avro`.
         query: Valid SQL Standard Query to basedosdados. If query is available,
             `dataset_id` and `table_id` are not required.
         dataset_id: Dataset id available in basedosdados. It should always come
@@ -230,10 +1079,54 @@ def download(
             `~/.basedosdados/credentials/`.
         reauth: Re-authorize Google Cloud Project in case you need to change
             user or reset configurations.
-        compression: Compression type. Only `GZIP` is available for now.
+        compression: Compression type of the exported files. Defaults to
+            `GZIP` for `.csv`, `SNAPPY` for `.parquet` and `DEFLATE` for
+            `.avro`. Parquet also accepts `ZSTD` and `GZIP`, and Avro accepts
+            `SNAPPY`, which needs `cramjam` to merge the shards.
+        max_workers: Maximum number of exported files (shards) downloaded
+            concurrently from the temporary bucket.
+        merge_shards: Whether to merge the exported shards into a single file.
+            If False, `.parquet` and `.avro` results are saved as a dataset
+            directory at `savepath`, with one file per shard.
+        columns: Columns to download. Only used with `dataset_id` and
+            `table_id`. Downloads all columns if None.
+        filters: Conditions rows must match to be downloaded, as a list of
+            `(column, operator, value)` tuples joined by `AND`, such as
+            `[("ano", "=", 2020), ("sigla_uf", "in", ["SP", "RJ"])]`.
+            Operators can be one of
+            ["="|"!="|"<>"|"<"|"<="|">"|">="|"in"|"not in"]. Filtering on
+            partition columns reduces the data scanned.
+        job_timeout: Maximum number of seconds to wait for the query job. The
+            job is cancelled if it takes longer. Waits forever if None.
+        reuse_bucket: Export the table to a long-lived staging bucket of the
+            billing project, `basedosdados-tmp-<billing_project_id>`, under a
+            prefix unique to this download, instead of creating and deleting
+            a temporary bucket. The bucket is created on first use with a
+            lifecycle rule that deletes files left behind after one day.
+        resumable: Keep the exported files and the downloaded shards if the
+            download fails, and record them in a manifest next to `savepath`,
+            `<savepath>.manifest.json`. Calling `download` again with the same
+            `savepath` resumes from the manifest, without running the query
+            or the export again, and only fetches the shards that are missing
+            or do not match their size and CRC32C checksum. Resumable
+            downloads always export to the staging bucket of `reuse_bucket`,
+            so files of abandoned downloads expire with its lifecycle rule.
+        maximum_bytes_billed: Maximum number of bytes the query may process.
+            The query is estimated with a free dry run before it runs, and
+            refused if the estimate is higher. Defaults to
+            `config.maximum_bytes_billed`. No limit if both are None.
+        confirm: Ask for confirmation in the terminal, instead of refusing the
+            query, when the estimate is above `maximum_bytes_billed`.
+
+    Returns:
+        Statistics of the query job, such as bytes processed and cache hit, or
+            None if the table was exported without a query or the download
+            was resumed.
 
     Raises:
         Exception: If either `table_id`, `dataset_id` or `query` are empty.
+        BaseDosDadosMaximumBytesBilledException: If the query would process
+            more than `maximum_bytes_billed` bytes.
     """
     billing_project_id, from_file = _set_config_variables(
         billing_project_id=billing_project_id,
@@ -245,34 +1138,93 @@ def download(
             "Either table_id, dataset_id or query should be filled.",
         )
 
-    client = _google_client(billing_project_id, from_file, reauth)
+    if query and (columns or filters):
+        raise BaseDosDadosException(
+            "Columns and filters can only be used with table_id and dataset_id.",
+        )
 
     # makes sure that savepath is a filepath and not a folder
     savepath = _sets_savepath(
         Path(savepath) if isinstance(savepath, str) else savepath,
     )
+    destination_format, default_compression = _EXPORT_FORMATS[savepath.suffix]
+    compression = (compression or default_compression).upper()
+
+    if not merge_shards and destination_format == "CSV":
+        raise BaseDosDadosException(
+            "Unmerged shards are only supported for .parquet and .avro files.",
+        )
+    if (
+        merge_shards
+        and destination_format == "AVRO"
+        and compression == "SNAPPY"
+        and not _snappy_dependencies
+    ):
+        raise BaseDosDadosMissingDependencyException(
+            "Merging SNAPPY compressed Avro files requires cramjam. Please "
+            "install it with `pip install cramjam`, or use the DEFLATE "
+            "compression."
+        )
+
+    client = _google_client(billing_project_id, from_file, reauth)
+    project_id = query_project_id
+    statistics = None
+
+    source = _manifest_source(
+        query,
+        dataset_id,
+        table_id,
+        query_project_id,
+        columns=columns,
+        filters=filters,
+        limit=limit,
+    )
+    manifest = (
+        _read_manifest(
+            client, savepath, destination_format, compression, source
+        )
+        if resumable
+        else None
+    )
+    if manifest is not None:
+        logger.info(f"Resuming download of {savepath}")
 
     # if query is not defined (so it won't be overwritten) and if
-    # table is a view or external or if limit is specified,
-    # convert it to a query.
-    if not query and (
-        not _is_table(client, dataset_id, table_id, query_project_id) or limit
+    # table is a view or external or if limit, columns or filters are
+    # specified, convert it to a query.
+    if (
+        manifest is None
+        and not query
+        and (
+            not _is_table(client, dataset_id, table_id, query_project_id)
+            or limit
+            or columns
+            or filters
+        )
     ):
-        query = f"""
-        SELECT *
-          FROM {query_project_id}.{dataset_id}.{table_id}
-        """
+        query = _build_query(
+            dataset_id,  # type: ignore
+            table_id,  # type: ignore
+            query_project_id,
+            columns=columns,
+            filters=filters,
+            limit=limit,
+        )
 
-        if limit is not None:
-            query += f" limit {limit}"
+    if manifest is None and query:
+        _check_bytes_processed(
+            client,
+            query,
+            maximum_bytes_billed=maximum_bytes_billed,
+            confirm=confirm,
+        )
 
-    if query:
         # sql queries produces anonymous tables, whose names
         # can be found within `job._properties`
         job = client["bigquery"].query(query)
 
         # views may take longer: wait for job to finish.
-        _wait_for(job)
+        statistics = _wait_for(job, timeout=job_timeout)
 
         dest_table = job._properties["configuration"]["query"][
             "destinationTable"
@@ -287,10 +1239,99 @@ def download(
         dataset_id,  # type: ignore
         table_id,  # type: ignore
         savepath,
-        project_id,  # type: ignore
+        project_id,
         compression,
+        max_workers=max_workers,
+        destination_format=destination_format,
+        merge_shards=merge_shards,
+        reuse_bucket=reuse_bucket,
+        resumable=resumable,
+        manifest=manifest,
+        source=source,
+    )
+
+    return statistics
+
+
+def download_many(
+    downloads: list[dict[str, Any]],
+    max_concurrency: int = 4,
+    billing_project_id: Optional[str] = None,
+    from_file: bool = False,
+    reauth: bool = False,
+    raise_errors: bool = False,
+    **kwargs,
+) -> list[DownloadResult]:
+    """
+    Download many tables or query results concurrently.
+
+    Each download runs `download` in its own thread, so query jobs, extract
+    jobs and shard transfers of different tables overlap. All downloads share
+    the same BigQuery and Storage clients.
+
+    `download_many([dict(savepath='uf.csv', dataset_id='br_bd_diretorios_brasil', table_id='uf'), dict(savepath='pib.csv', query='select * from basedosdados.br_ibge_pib.municipio')])`
+
+    Args:
+        downloads: Arguments of each download, as accepted by `download`, such
+            as `savepath`, `query`, `dataset_id` and `table_id`.
+        max_concurrency: Maximum number of downloads running at the same time.
+        billing_project_id: Project that will be billed. Find your Project ID
+            [here](https://console.cloud.google.com/projectselector2/home/dashboard).
+        from_file: Uses the credentials from file, located in
+            `~/.basedosdados/credentials/`.
+        reauth: Re-authorize Google Cloud Project in case you need to change
+            user or reset configurations.
+        raise_errors: Whether to raise the first error found after all
+            downloads finish, instead of only reporting it in the results.
+        **kwargs: Arguments shared by all downloads, overridden by the ones in
+            `downloads`.
+
+    Returns:
+        The result of each download, in the same order as `downloads`.
+    """
+    billing_project_id, from_file = _set_config_variables(
+        billing_project_id=billing_project_id,
+        from_file=from_file,
     )
 
+    # authenticate once, before any thread needs the clients. The downloads
+    # get the same pooled clients, as they are keyed on the same arguments
+    _google_client(billing_project_id, from_file, reauth)
+
+    def run(download_kwargs: dict[str, Any]) -> DownloadResult:
+        download_kwargs = {**kwargs, **download_kwargs}
+        start = time.monotonic()
+        statistics, error = None, None
+        try:
+            statistics = download(
+                billing_project_id=billing_project_id,
+                from_file=from_file,
+                reauth=reauth,
+                **download_kwargs,
+            )
+        except Exception as e:
+            logger.error(
+                f"Download to {download_kwargs.get('savepath')} failed: {e}"
+            )
+            error = e
+
+        savepath = download_kwargs.get("savepath")
+        return DownloadResult(
+            savepath=Path(savepath) if savepath is not None else None,
+            elapsed=time.monotonic() - start,
+            statistics=statistics,
+            error=error,
+        )
+
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+        results = list(executor.map(run, downloads))
+
+    errors = [result.error for result in results if result.error is not None]
+    if raise_errors and errors:
+        raise errors[0]
+
+    return results
+
 
 def _direct_download(
     client: _GoogleClient,
@@ -300,14 +1341,29 @@ def _direct_download(
     project_id: str = "basedosdados",
     compression: str = "GZIP",
     extract: bool = True,
+    max_workers: int = 8,
+    destination_format: str = "CSV",
+    merge_shards: bool = True,
+    reuse_bucket: bool = False,
+    resumable: bool = False,
+    manifest: Optional[dict[str, Any]] = None,
+    source: Optional[dict[str, Any]] = None,
 ):
     """
     Download file to disk without the requirement of loading it in memory.
 
-    Creates a temporary file based on the `table_id` and the time of execution.
-    Also creates a temporary bucket using the `dataset_id` and the time of
-    execution. Moves the table to the temporary file and downloads it to disk.
-    In the end, removes the temporary bucket.
+    Creates a temporary file based on the `table_id`. Also creates a temporary
+    bucket named after the `dataset_id` and a random suffix. Moves the table
+    to the temporary file and downloads it to disk. In the end, removes the
+    temporary bucket.
+
+    With `reuse_bucket`, the table is moved to a prefix unique to this
+    download inside the staging bucket of the billing project instead, and
+    only the files under that prefix are removed in the end.
+
+    With `resumable`, the staging bucket is always used and the exported
+    shards are recorded in a manifest. Once the manifest is written, nothing
+    is removed unless the download completes.
 
     Args:
         client: BigQuery and Storage clients.
@@ -317,67 +1373,151 @@ def _direct_download(
         project_id: In case you want to query another project, by default
             'basedosdados'.
         compression: Compression type to use for exported files. Can be one of
-            ["NONE"|"GZIP"]. Defaults to GZIP.
+            ["NONE"|"GZIP"] for CSV, ["NONE"|"SNAPPY"|"ZSTD"|"GZIP"] for
+            PARQUET and ["NONE"|"SNAPPY"|"DEFLATE"] for AVRO. Defaults to GZIP.
         extract: Whether to extract the gzip file.
+        max_workers: Maximum number of shards downloaded concurrently.
+        destination_format: Exported file format. Can be one of
+            ["CSV"|"PARQUET"|"AVRO"]. Defaults to CSV.
+        merge_shards: Whether to merge the shards into a single file. If False,
+            the shards are moved into a directory at `savepath`.
+        reuse_bucket: Whether to use the staging bucket of the billing project
+            instead of a temporary bucket.
+        resumable: Whether to keep the exported and downloaded shards if the
+            download fails, so it can be resumed.
+        manifest: Manifest of an interrupted download to resume, as given by
+            `_read_manifest`. Exports the table again if None.
+        source: What is downloaded, as given by `_manifest_source`, recorded
+            in the manifest.
 
     Returns:
         None
     """
-    time_hash = str(hash(time.time()))
-
     # Bucket names must start and end with a number or letter.
     tmp_file_name = table_id
-    tmp_bucket_name = _clean_name(dataset_id + "_" + time_hash)
-    blob_path = f"gs://{tmp_bucket_name}/{tmp_file_name}-*"
-
-    # Creates temporary savepath
-    tmp_savepath = savepath.parent / "tmp"
+    if manifest is not None:
+        tmp_bucket_name = manifest["bucket"]
+        prefix = manifest["prefix"]
+        reuse_bucket = manifest["reuse_bucket"]
+    elif reuse_bucket or resumable:
+        # files left behind by abandoned resumable downloads expire with the
+        # lifecycle rule of the staging bucket
+        reuse_bucket = True
+        tmp_bucket_name = _staging_bucket_name(client)
+        prefix = f"{dataset_id}/{table_id}/{uuid.uuid4().hex}/"
+    else:
+        # unique even for downloads started at the same time, and within the
+        # 63 characters allowed in bucket names
+        tmp_bucket_name = _clean_name(dataset_id)[:31] + uuid.uuid4().hex
+        prefix = ""
+    blob_path = f"gs://{tmp_bucket_name}/{prefix}{tmp_file_name}-*"
+    completed = False
+
+    # Creates temporary savepath, unique to this savepath so that concurrent
+    # downloads to the same folder do not mix their shards. Shards left by a
+    # download that can't be resumed are removed, so they are not joined
+    tmp_savepath = savepath.parent / f"{savepath.name}.tmp"
+    if manifest is None:
+        shutil.rmtree(tmp_savepath, ignore_errors=True)
     tmp_savepath.mkdir(parents=True, exist_ok=True)
 
     try:
-        # create temporary bucket
-        _create_bucket(client, tmp_bucket_name)
+        if manifest is None:
+            if reuse_bucket:
+                _ensure_staging_bucket(client, tmp_bucket_name)
+            else:
+                # create temporary bucket
+                _create_bucket(client, tmp_bucket_name)
+
+            # move table to temporary file inside temporary bucket
+            _move_table_to_bucket(
+                client,
+                dataset_id,
+                table_id,
+                blob_path,
+                project_id,
+                compression,
+                destination_format,
+            )
+
+            if resumable:
+                manifest = _write_manifest(
+                    client,
+                    savepath,
+                    tmp_bucket_name,
+                    prefix,
+                    destination_format,
+                    compression,
+                    reuse_bucket,
+                    source,
+                )
 
-        # move table to temporary file inside temporary bucket
-        _move_table_to_bucket(
+        # download file from bucket directly to disk
+        _download_blob_from_bucket(
             client,
-            dataset_id,
-            table_id,
-            blob_path,
-            project_id,
-            compression,
+            tmp_bucket_name,
+            tmp_savepath,
+            _shard_suffix(destination_format, compression),
+            max_workers=max_workers,
+            prefix=prefix,
+            manifest=manifest,
         )
 
-        # download file from bucket directly to disk
-        _download_blob_from_bucket(client, tmp_bucket_name, tmp_savepath)
-
-        if compression == "GZIP" and extract:
-            _gzip_extract(tmp_savepath)
+        if not merge_shards:
+            _move_files(tmp_savepath, savepath)
+        elif destination_format == "PARQUET":
+            _join_parquet_files(tmp_savepath, savepath, compression)
+        elif destination_format == "AVRO":
+            _join_avro_files(tmp_savepath, savepath)
+        elif compression == "GZIP" and extract:
+            _gzip_join_files(tmp_savepath, savepath)
+        else:
+            _join_files(tmp_savepath, savepath)
 
-        _join_files(tmp_savepath, savepath)
+        completed = True
 
     except Exception as err:
         # TODO handle exceptions for 404 (not found), 403 (forbidden)
         raise Exception(err) from err
     finally:
-        # delete temporary bucket (even in the case of crashing)
-        _delete_bucket(client, tmp_bucket_name)
-        # delete temporary savepath
-        shutil.rmtree(tmp_savepath)
+        # delete temporary files (even in the case of crashing), unless a
+        # manifest records them to resume the download
+        if completed or manifest is None:
+            if reuse_bucket:
+                _delete_blobs(client, tmp_bucket_name, prefix)
+            else:
+                _delete_bucket(client, tmp_bucket_name)
+            # delete temporary savepath
+            shutil.rmtree(tmp_savepath)
+            _manifest_path(savepath).unlink(missing_ok=True)
 
 
 def _download_blob_from_bucket(
     client: _GoogleClient,
     bucket_name: str,
     savepath: Path,
+    suffix: str = ".csv.gz",
+    max_workers: int = 8,
+    prefix: str = "",
+    manifest: Optional[dict[str, Any]] = None,
 ) -> None:
     """
-    Download a blob from a bucket to the path specified.
+    Download all blobs from a bucket to the path specified.
+
+    The blobs are the shards of a single BigQuery extract job, so they are
+    fetched concurrently by a bounded thread pool that shares the storage
+    client (and its HTTP connection pool).
 
     Args:
         client: BigQuery and Storage clients.
         bucket_name: Name of the bucket for the file to be stored.
         savepath: Local path in which file should be stored in disk.
+        suffix: Extension given to the downloaded files.
+        max_workers: Maximum number of blobs downloaded concurrently.
+        prefix: Only download the blobs whose names start with `prefix`.
+        manifest: Manifest of the exported shards. Shards already downloaded
+            to `savepath` with the size and checksum in the manifest are
+            skipped.
 
     Returns:
         None
@@ -385,9 +1525,261 @@ def _download_blob_from_bucket(
     bucket = client["storage"].bucket(
         bucket_name, user_project=client["storage"].project
     )
-    for blob in bucket.list_blobs():
-        filepath = savepath / (blob.name.split("-")[-1] + ".csv.gz")
-        blob.download_to_filename(filepath)
+    blobs = list(bucket.list_blobs(prefix=prefix or None))
+
+    if manifest is not None:
+        shards = {shard["name"]: shard for shard in manifest["shards"]}
+        blobs = [
+            blob
+            for blob in blobs
+            if blob.name not in shards
+            or not _verify_file(
+                _shard_filepath(savepath, blob.name, suffix),
+                shards[blob.name]["size"],
+                shards[blob.name]["crc32c"],
+            )
+        ]
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = [
+            executor.submit(
+                _download_blob,
+                blob,
+                _shard_filepath(savepath, blob.name, suffix),
+            )
+            for blob in blobs
+        ]
+        # re-raise the first error, if any
+        for future in futures:
+            future.result()
+
+
+def _shard_filepath(savepath: Path, blob_name: str, suffix: str) -> Path:
+    """
+    Get the local file in which the shard `blob_name` is downloaded.
+    """
+    return savepath / (blob_name.split("-")[-1] + suffix)
+
+
+def _verify_file(
+    filepath: Path,
+    size: Optional[int],
+    crc32c: Optional[str],
+) -> bool:
+    """
+    Check whether `filepath` has the given size and CRC32C checksum.
+
+    Args:
+        filepath: Local file to be checked.
+        size: Expected size in bytes.
+        crc32c: Expected checksum, base64-encoded in big-endian byte order as
+            stored by GCS.
+
+    Returns:
+        Whether the file exists and matches both.
+    """
+    if not filepath.exists() or filepath.stat().st_size != size:
+        return False
+
+    checksum = google_crc32c.Checksum()
+    with filepath.open("rb") as f:
+        for chunk in iter(lambda: f.read(_BUFFER_SIZE), b""):
+            checksum.update(chunk)
+
+    return base64.b64encode(checksum.digest()).decode("utf-8") == crc32c
+
+
+def _manifest_path(savepath: Path) -> Path:
+    """
+    Get the path of the manifest of a resumable download to `savepath`.
+    """
+    return savepath.with_name(f"{savepath.name}.manifest.json")
+
+
+def _manifest_source(
+    query: Optional[str],
+    dataset_id: Optional[str],
+    table_id: Optional[str],
+    project_id: str = "basedosdados",
+    columns: Optional[list[str]] = None,
+    filters: Optional[list[tuple[str, str, Any]]] = None,
+    limit: Optional[int] = None,
+) -> dict[str, Any]:
+    """
+    Describe what a download reads, to tell whether a manifest was written
+    for the same download. It is made JSON compatible, so it compares equal
+    to the one read back from the manifest.
+    """
+    if query:
+        source = {"query": query}
+    else:
+        source = {
+            "table": f"{project_id}.{dataset_id}.{table_id}",
+            "columns": columns,
+            "filters": filters,
+            "limit": limit,
+        }
+    return json.loads(json.dumps(source, default=str))
+
+
+def _write_manifest(
+    client: _GoogleClient,
+    savepath: Path,
+    bucket_name: str,
+    prefix: str,
+    destination_format: str,
+    compression: str,
+    reuse_bucket: bool,
+    source: Optional[dict[str, Any]] = None,
+) -> dict[str, Any]:
+    """
+    Record the shards exported to a bucket in the manifest of `savepath`.
+
+    Args:
+        client: BigQuery and Storage clients.
+        savepath: Local path in which file should be stored in disk.
+        bucket_name: Name of the bucket the table was exported to.
+        prefix: Prefix of the exported shards.
+        destination_format: Exported file format.
+        compression: Compression type of the exported files.
+        reuse_bucket: Whether the bucket is the staging bucket of the billing
+            project, rather than a temporary bucket.
+        source: What is downloaded, as given by `_manifest_source`.
+
+    Returns:
+        The manifest.
+    """
+    bucket = client["storage"].bucket(
+        bucket_name, user_project=client["storage"].project
+    )
+    manifest = {
+        "bucket": bucket_name,
+        "prefix": prefix,
+        "reuse_bucket": reuse_bucket,
+        "source": source,
+        "destination_format": destination_format,
+        "compression": compression,
+        "shards": [
+            {"name": blob.name, "size": blob.size, "crc32c": blob.crc32c}
+            for blob in bucket.list_blobs(prefix=prefix or None)
+        ],
+    }
+
+    # write to a temporary file first so an interrupted write never leaves
+    # a partial manifest behind
+    path = _manifest_path(savepath)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+    return manifest
+
+
+def _read_manifest(
+    client: _GoogleClient,
+    savepath: Path,
+    destination_format: str,
+    compression: str,
+    source: Optional[dict[str, Any]] = None,
+) -> Optional[dict[str, Any]]:
+    """
+    Load the manifest of an interrupted download to `savepath`.
+
+    The manifest is discarded if it was written for another query, table,
+    format or compression, or if its shards are no longer in the bucket.
+
+    Args:
+        client: BigQuery and Storage clients.
+        savepath: Local path in which file should be stored in disk.
+        destination_format: Exported file format.
+        compression: Compression type of the exported files.
+        source: What is downloaded, as given by `_manifest_source`.
+
+    Returns:
+        The manifest, or None if there is no download to resume.
+    """
+    path = _manifest_path(savepath)
+    if not path.exists():
+        return None
+
+    manifest = json.loads(path.read_text(encoding="utf-8"))
+    if manifest.get("source") != source:
+        logger.info(f"Ignoring {path}: it was written for another download")
+        path.unlink()
+        return None
+    if (manifest["destination_format"], manifest["compression"]) != (
+        destination_format,
+        compression,
+    ):
+        logger.info(
+            f"Ignoring {path}: it was written for another format or compression"
+        )
+        return None
+
+    bucket = client["storage"].bucket(
+        manifest["bucket"], user_project=client["storage"].project
+    )
+    try:
+        names = {
+            blob.name
+            for blob in bucket.list_blobs(prefix=manifest["prefix"] or None)
+        }
+    except NotFound:
+        names = set()
+
+    if not {shard["name"] for shard in manifest["shards"]} <= names:
+        logger.info(f"Ignoring {path}: the exported files no longer exist")
+        path.unlink()
+        return None
+
+    return manifest
+
+
+def _download_blob(
+    blob: storage.Blob,
+    filepath: Path,
+    retries: int = 3,
+) -> None:
+    """
+    Download a single blob to `filepath`, retrying on failure.
+
+    The CRC32C checksum of the blob is computed as its bytes stream in and
+    compared to the one stored by GCS, and the size of the file is compared
+    to the size of the blob. Corrupted or truncated files are downloaded
+    again.
+
+    Args:
+        blob: Blob to be downloaded.
+        filepath: Local file in which the blob should be stored.
+        retries: Number of attempts before giving up.
+
+    Returns:
+        None
+
+    Raises:
+        BaseDosDadosException: If the blob is still corrupted after
+            `retries` attempts.
+    """
+    for attempt in range(1, retries + 1):
+        try:
+            blob.download_to_filename(filepath, checksum="crc32c")
+            size = filepath.stat().st_size
+            if blob.size is None or size == blob.size:
+                return
+            error = f"expected {blob.size} bytes, got {size}"
+        except DataCorruption as err:
+            error = str(err)
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(2**attempt)
+            continue
+
+        logger.warning(f"Downloaded {blob.name} is corrupted: {error}")
+        if attempt == retries:
+            raise BaseDosDadosException(
+                f"{blob.name} is still corrupted after {retries} downloads"
+            )
 
 
 def _create_bucket(
@@ -418,13 +1810,106 @@ def _create_bucket(
     )
 
 
+def _staging_bucket_name(client: _GoogleClient) -> str:
+    """
+    Get the name of the staging bucket of the billing project.
+    """
+    project = re.sub(r"[^a-z0-9-]+", "-", client["storage"].project.lower())
+    return f"basedosdados-tmp-{project}".strip("-")
+
+
+def _ensure_staging_bucket(client: _GoogleClient, bucket_name: str) -> None:
+    """
+    Create the staging bucket, unless it is already known to exist.
+
+    The bucket gets a lifecycle rule that deletes files older than
+    `_STAGING_BUCKET_TTL_DAYS`, so files of interrupted downloads do not pile
+    up.
+
+    Args:
+        client: BigQuery and Storage clients.
+        bucket_name: Name of the staging bucket.
+
+    Returns:
+        None
+    """
+    with _staging_buckets_lock:
+        if bucket_name in _staging_buckets:
+            return
+
+        storage_client = client["storage"]
+        if storage_client.lookup_bucket(bucket_name) is None:
+            bucket = storage_client.bucket(
+                bucket_name, user_project=storage_client.project
+            )
+            bucket.storage_class = "STANDARD"
+            bucket.add_lifecycle_delete_rule(age=_STAGING_BUCKET_TTL_DAYS)
+            try:
+                storage_client.create_bucket(
+                    bucket, location="US", user_project=storage_client.project
+                )
+            except Conflict:
+                # created concurrently by another process
+                pass
+
+        _staging_buckets.add(bucket_name)
+
+
+def _delete_blobs(
+    client: _GoogleClient,
+    bucket_name: str,
+    prefix: str = "",
+    max_workers: int = 8,
+) -> None:
+    """
+    Delete all blobs under a prefix.
+
+    Blobs are listed once and deleted in batch requests, which are sent
+    concurrently. Blobs deleted in the meantime are ignored.
+
+    Args:
+        client: BigQuery and Storage clients.
+        bucket_name: Name of the bucket.
+        prefix: Prefix of the blobs to be deleted. Deletes all blobs if empty.
+        max_workers: Maximum number of batch requests sent concurrently.
+
+    Returns:
+        None
+    """
+    storage_client = client["storage"]
+    blobs = list(
+        storage_client.bucket(
+            bucket_name, user_project=storage_client.project
+        ).list_blobs(prefix=prefix or None)
+    )
+
+    def delete_batch(batch_blobs: list[storage.Blob]) -> None:
+        # batches are thread local, so each thread sends its own request
+        try:
+            with storage_client.batch():
+                for blob in batch_blobs:
+                    blob.delete()
+        except NotFound:
+            # deleted since listed, e.g. by a lifecycle rule. The other calls
+            # of the batch are still applied
+            pass
+
+    # GCS accepts at most 100 calls per batch request
+    batches = [blobs[i : i + 100] for i in range(0, len(blobs), 100)]  # noqa
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        # re-raise the first error, if any
+        for _ in executor.map(delete_batch, batches):
+            pass
+
+
 def _delete_bucket(
     client: _GoogleClient,
     bucket_name: str,
 ) -> None:
     """Forceably deletes a bucket.
 
-    This method deletes all blobs from a bucket.
+    This method deletes all blobs from a bucket, in parallel batches, and
+    then the bucket itself. There is no limit on the number of blobs.
 
     Args:
         client: BigQuery and Storage clients.
@@ -433,20 +1918,21 @@ def _delete_bucket(
     Returns:
         None
     """
-    MAX_BLOBS = 256
-
     storage_client = client["storage"]
-    bucket = storage_client.get_bucket(bucket_name)
-
-    # NOTE: force=True implementation will not delete
-    # the temporary bucket if n_blobs >= 256
-    n_blobs = len(list(storage_client.list_blobs(bucket_name)))
-    if n_blobs >= MAX_BLOBS:
-        raise Exception(
-            f"""Your temporary bucket contains more than {MAX_BLOBS}. You should manually delete it (force=True will not be able to delete it.).""",
-        )
 
-    bucket.delete(force=True)
+    try:
+        _delete_blobs(client, bucket_name)
+    except NotFound:
+        # the bucket was never created, e.g. if its creation failed
+        return
+
+    try:
+        storage_client.bucket(
+            bucket_name, user_project=storage_client.project
+        ).delete()
+    except NotFound:
+        # deleted concurrently
+        pass
 
 
 def _move_table_to_bucket(
@@ -456,6 +1942,7 @@ def _move_table_to_bucket(
     blob_path: str,
     project_id: str = "basedosdados",
     compression: str = "GZIP",
+    destination_format: str = "CSV",
 ) -> None:
     """
     Move table from BigQuery to bucket.
@@ -470,7 +1957,10 @@ def _move_table_to_bucket(
         project_id: In case you want to query another project, defaults to
             'basedosdados'.
         compression: Compression type to use for exported files. Can be one of
-            ["NONE"|"GZIP"].
+            ["NONE"|"GZIP"|"SNAPPY"|"ZSTD"|"DEFLATE"], depending on the
+            `destination_format`.
+        destination_format: Exported file format. Can be one of
+            ["CSV"|"PARQUET"|"AVRO"].
 
     Returns:
         None
@@ -479,7 +1969,13 @@ def _move_table_to_bucket(
     dataset_ref = bigquery.DatasetReference(project_id, dataset_id)
     table_ref = dataset_ref.table(table_id)
 
-    job_config = bigquery.job.ExtractJobConfig(compression=compression)  # type: ignore
+    job_config = bigquery.job.ExtractJobConfig(
+        compression=compression,  # type: ignore
+        destination_format=destination_format,  # type: ignore
+    )
+    if destination_format == "AVRO":
+        # export DATE, TIMESTAMP etc. with their Avro logical types
+        job_config.use_avro_logical_types = True
 
     # perform transfer from bq to bucket
     extract_job = client_bigquery.extract_table(
@@ -489,39 +1985,158 @@ def _move_table_to_bucket(
         job_config=job_config,
     )
     # wait for API results
-    extract_job.result()
+    _wait_for(extract_job)
 
 
-def _gzip_extract(savepath: Path) -> None:
+def _gzip_join_files(tmp_savepath: Path, savepath: Path) -> None:
     """
-    Extract and replace gzip file.
+    Decompress all gzip files in `tmp_savepath` straight into `savepath`.
+
+    Each shard is streamed into the target file, so the uncompressed data is
+    never written to an intermediate file. The header line of every shard but
+    the first is skipped, and each shard is removed once it is consumed.
     """
+    files = sorted(tmp_savepath.glob("*.csv.gz"))
     try:
-        for file in savepath.glob("*"):
-            with gzip.open(file, "rb") as f_in:
-                with open(file.with_suffix(""), "wb") as f_out:
-                    shutil.copyfileobj(f_in, f_out)
-
-            os.remove(file)
-    except Exception as e:
+        with savepath.open("wb") as targetfile:
+            for i, file in enumerate(files):
+                with gzip.open(file, "rb") as f:
+                    if i > 0:
+                        f.readline()
+                    shutil.copyfileobj(f, targetfile, _BUFFER_SIZE)
+
+                os.remove(file)
+    except (OSError, EOFError) as e:
         raise Exception("GZIP file could not be extracted.") from e
 
 
 def _join_files(tmp_savepath: Path, savepath: Path) -> None:
     """
     Join all files in savepath.
+
+    Shards are joined in name order, which is the order BigQuery numbered
+    them in, so repeated downloads produce identical files. The header line of
+    every shard but the first is skipped and the rest is copied in binary.
     """
-    files = list(tmp_savepath.glob("*.csv"))
-    with savepath.open("a+") as targetfile:
+    files = sorted(tmp_savepath.glob("*.csv"))
+    with savepath.open("wb", buffering=0) as targetfile:
         for i, file in enumerate(files):
-            with file.open("r") as f:
+            with file.open("rb") as f:
                 if i > 0:
-                    next(f)
-                for line in f:
-                    targetfile.write(line)
+                    f.readline()
+                _copy_file(f, targetfile)
+
+            os.remove(file)
+
+
+def _join_parquet_files(
+    tmp_savepath: Path, savepath: Path, compression: str = "SNAPPY"
+) -> None:
+    """
+    Join all parquet files in savepath.
+
+    Row groups are copied one at a time, in shard order, so no more than a
+    single row group is held in memory.
+    """
+    files = sorted(tmp_savepath.glob("*.parquet"))
+    writer = None
+    try:
+        for file in files:
+            with file.open("rb") as f:
+                parquet_file = pq.ParquetFile(f)
+                if writer is None:
+                    writer = pq.ParquetWriter(
+                        savepath,
+                        parquet_file.schema_arrow,
+                        compression=compression.lower(),
+                    )
+                for i in range(parquet_file.num_row_groups):
+                    writer.write_table(parquet_file.read_row_group(i))
+
+            os.remove(file)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _join_avro_files(tmp_savepath: Path, savepath: Path) -> None:
+    """
+    Join all avro files in savepath.
+
+    The blocks of every shard are appended to the target without parsing
+    their records, but fastavro still decompresses each block and compresses
+    it again with the codec of the first shard.
+    """
+    if not _avro_dependencies:
+        raise BaseDosDadosMissingDependencyException(
+            "Optional dependencies for handling AVRO files are not installed. "
+            'Please install basedosdados with the "avro" extra'
+        )
+
+    files = sorted(tmp_savepath.glob("*.avro"))
+    with savepath.open("wb") as targetfile:
+        writer = None
+        for file in files:
+            with file.open("rb") as f:
+                blocks = fastavro.block_reader(f)
+                if writer is None:
+                    writer = fastavro.write.Writer(
+                        targetfile, blocks.writer_schema, codec=blocks.codec
+                    )
+                for block in blocks:
+                    writer.write_block(block)
 
             os.remove(file)
 
+        if writer is not None:
+            writer.flush()
+
+
+def _move_files(tmp_savepath: Path, savepath: Path) -> None:
+    """
+    Move all files in tmp_savepath into the `savepath` directory.
+    """
+    savepath.mkdir(parents=True, exist_ok=True)
+    for file in sorted(tmp_savepath.glob("*")):
+        shutil.move(str(file), str(savepath / file.name))
+
+
+def _shard_suffix(destination_format: str, compression: str) -> str:
+    """
+    Get the file extension of the shards exported in `destination_format`.
+    """
+    if destination_format == "PARQUET":
+        return ".parquet"
+    if destination_format == "AVRO":
+        return ".avro"
+    return ".csv.gz" if compression == "GZIP" else ".csv"
+
+
+def _copy_file(source: BinaryIO, target: BinaryIO) -> None:
+    """
+    Copy `source`, from its current position, to the end of `target`.
+
+    Uses the zero-copy `os.sendfile` where it supports regular files (Linux)
+    and falls back to a buffered copy elsewhere.
+    """
+    offset = source.tell()
+
+    if sys.platform.startswith("linux"):
+        size = os.fstat(source.fileno()).st_size
+        try:
+            while offset < size:
+                sent = os.sendfile(
+                    target.fileno(), source.fileno(), offset, size - offset
+                )
+                if sent == 0:
+                    break
+                offset += sent
+            return
+        except OSError:
+            source.seek(offset)
+
+    shutil.copyfileobj(source, target, _BUFFER_SIZE)
+
 
 def _is_table(
     client: _GoogleClient,
@@ -531,14 +2146,15 @@ def _is_table(
 ) -> bool:
     """
     Check whether a `table_id` is a view or not.
+
+    The table metadata is cached for `config.table_metadata_ttl` seconds.
     """
     if (dataset_id is None) or (table_id is None):
         return False
 
-    dataset_ref = bigquery.DatasetReference(project_id, dataset_id)
-    table_ref = dataset_ref.table(table_id)
-
-    table = client["bigquery"].get_table(table_ref)
+    table = table_metadata.get(
+        client["bigquery"], f"{project_id}.{dataset_id}.{table_id}"
+    )
 
     return table.table_type == "TABLE"
 
@@ -552,27 +2168,80 @@ def _clean_name(string: str) -> str:
     return re.sub(pattern, replace, string)
 
 
-def _wait_for(job: bigquery.QueryJob) -> None:
+def _wait_for(
+    job: Union[bigquery.QueryJob, bigquery.ExtractJob],
+    timeout: Optional[float] = None,
+    initial_delay: float = 1.0,
+    max_delay: float = 30.0,
+) -> JobStatistics:
     """
     Wait for BigQuery job to finish.
 
+    Each wait blocks on `job.result` until the job is done or the wait times
+    out, instead of polling. Waits grow exponentially, with jitter, up to
+    `max_delay`. The job is cancelled if `timeout` is reached or if the wait
+    is interrupted.
+
     Args:
-        job: `bigquery.job` object from a `bigquery.Client().query()` call.
+        job: `bigquery.job` object from a `bigquery.Client().query()` or
+            `bigquery.Client().extract_table()` call.
+        timeout: Maximum number of seconds to wait. Waits forever if None.
+        initial_delay: Seconds of the first wait.
+        max_delay: Maximum seconds of a single wait.
+
+    Returns:
+        Statistics of the finished job.
+
+    Raises:
+        BaseDosDadosException: If the job does not finish within `timeout`.
     """
-    while not job.done():
-        time.sleep(1)
+    start = time.monotonic()
+    delay = initial_delay
+
+    try:
+        while True:
+            wait = delay
+            if timeout is not None:
+                remaining = timeout - (time.monotonic() - start)
+                if remaining <= 0:
+                    job.cancel()
+                    raise BaseDosDadosException(
+                        f"Job {job.job_id} did not finish within {timeout} seconds and was cancelled."
+                    )
+                wait = min(wait, remaining)
+
+            try:
+                job.result(timeout=wait)
+                break
+            except FutureTimeoutError:
+                delay = min(max_delay, delay * 2 * random.uniform(0.75, 1.25))
+    except KeyboardInterrupt:
+        job.cancel()
+        raise
+
+    statistics = JobStatistics(
+        job_id=job.job_id,
+        elapsed=time.monotonic() - start,
+        total_bytes_processed=getattr(job, "total_bytes_processed", None),
+        total_bytes_billed=getattr(job, "total_bytes_billed", None),
+        slot_millis=getattr(job, "slot_millis", None),
+        cache_hit=getattr(job, "cache_hit", None),
+    )
+    logger.debug(f"BigQuery job finished: {statistics}")
+
+    return statistics
 
 
 def _sets_savepath(savepath: Path) -> Path:
     """
     Set savepath accordingly.
     """
-    if savepath.suffix == ".csv":
+    if savepath.suffix in _EXPORT_FORMATS:
         # make sure that path exists
         savepath.parent.mkdir(parents=True, exist_ok=True)
     else:
         raise BaseDosDadosException(
-            f"Only .csv files are supported, your filename has a diferent extension: {savepath.suffix}"
+            f"Only .csv, .parquet and .avro files are supported, your filename has a diferent extension: {savepath.suffix}"
         )
 
     return savepath
@@ -601,23 +2270,18 @@ def _credentials(
     return get_user_credentials(scopes)
 
 
-@lru_cache(256)
 def _google_client(
     billing_project_id: str,
     from_file: bool,
     reauth: bool,
 ) -> _GoogleClient:
     """
-    Get Google Cloud client for BigQuery and Storage.
+    Get Google Cloud client for BigQuery and Storage, from the pool of clients
+    shared by all threads.
     """
-    credentials = _credentials(from_file=from_file, reauth=reauth)
-    return {
-        "bigquery": bigquery.Client(
-            credentials=credentials,
-            project=billing_project_id,
-        ),
-        "storage": storage.Client(
-            credentials=credentials,
-            project=billing_project_id,
-        ),
-    }
+    return client_pool.get(
+        billing_project_id,
+        from_file,
+        reauth,
+        credentials=lambda: _credentials(from_file=from_file, reauth=reauth),
+    )
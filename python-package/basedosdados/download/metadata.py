@@ -2,9 +2,23 @@
 Functions to get metadata from BD's API.
 """
 
-from typing import Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from itertools import islice
+from typing import Any, Callable, Iterator, Optional
 
 from basedosdados.backend import Backend
+from basedosdados.core.metadata_cache import metadata_cache
+
+
+@lru_cache(maxsize=1)
+def _default_backend() -> Backend:
+    """
+    Backend used when none is given, shared so that its HTTP session and
+    cached responses are reused across calls.
+    """
+    return Backend(cache=metadata_cache)
 
 
 def get_datasets(
@@ -27,17 +41,10 @@ def get_datasets(
     Returns:
         List of datasets.
     """
-    backend = Backend() if backend is None else backend
-    result = backend.get_datasets(dataset_id, dataset_name, page, page_size)
-    for item in result.get("items", []) or []:
-        item["organization"] = item.get("organization", {}).get("name")
-        item["tags"] = [
-            i.get("name") for i in item.get("tags", {}).get("items")
-        ]
-        item["themes"] = [
-            i.get("name") for i in item.get("themes", {}).get("items")
-        ]
-    return result
+    backend = _default_backend() if backend is None else backend
+    return _format_datasets(
+        backend.get_datasets(dataset_id, dataset_name, page, page_size)
+    )
 
 
 def get_tables(
@@ -64,7 +71,7 @@ def get_tables(
         List of tables.
     """
 
-    backend = Backend() if backend is None else backend
+    backend = _default_backend() if backend is None else backend
     return backend.get_tables(
         dataset_id, table_id, table_name, page, page_size
     )
@@ -94,14 +101,157 @@ def get_columns(
         List of columns.
     """
 
-    backend = Backend() if backend is None else backend
+    backend = _default_backend() if backend is None else backend
+    return _format_columns(
+        backend.get_columns(table_id, column_id, columns_name, page, page_size)
+    )
+
+
+def iter_datasets(
+    dataset_id: Optional[str] = None,
+    dataset_name: Optional[str] = None,
+    page_size: int = 100,
+    max_concurrency: int = 4,
+    backend: Optional[Backend] = None,
+) -> Iterator[dict]:
+    """
+    Iterate over all datasets, either by `dataset_id` or `dataset_name`.
+
+    Pages are fetched concurrently, up to `max_concurrency` pages ahead of
+    the one being iterated over.
+
+    Args:
+        dataset_id: Dataset slug in Google BigQuery (GBQ).
+        dataset_name: Dataset name in Base dos Dados metadata.
+        page_size: Number of datasets fetched per request.
+        max_concurrency: Maximum number of pages fetched at the same time.
+        backend: Backend instance, injected automatically.
+
+    Yields:
+        Datasets, in the same form as the items of `get_datasets`.
+    """
+    return _iter_pages(
+        partial(
+            get_datasets,
+            dataset_id,
+            dataset_name,
+            page_size=page_size,
+            backend=backend,
+        ),
+        max_concurrency,
+    )
+
+
+def iter_tables(
+    dataset_id: Optional[str] = None,
+    table_id: Optional[str] = None,
+    table_name: Optional[str] = None,
+    page_size: int = 100,
+    max_concurrency: int = 4,
+    backend: Optional[Backend] = None,
+) -> Iterator[dict]:
+    """
+    Iterate over all tables, either by `dataset_id`, `table_id` or
+    `table_name`.
 
-    result = backend.get_columns(
-        table_id, column_id, columns_name, page, page_size
+    Pages are fetched concurrently, up to `max_concurrency` pages ahead of
+    the one being iterated over.
+
+    Args:
+        dataset_id: Dataset slug in Google BigQuery (GBQ).
+        table_id: Table slug in Google BigQuery (GBQ).
+        table_name: Table name in Base dos Dados metadata.
+        page_size: Number of tables fetched per request.
+        max_concurrency: Maximum number of pages fetched at the same time.
+        backend: Backend instance, injected automatically.
+
+    Yields:
+        Tables, in the same form as the items of `get_tables`.
+    """
+    return _iter_pages(
+        partial(
+            get_tables,
+            dataset_id,
+            table_id,
+            table_name,
+            page_size=page_size,
+            backend=backend,
+        ),
+        max_concurrency,
     )
-    for item in result.get("items", []) or []:
-        item["bigquery_type"] = item.pop("bigqueryType", {}).get("name")
-    return result
+
+
+def iter_columns(
+    table_id: Optional[str] = None,
+    column_id: Optional[str] = None,
+    columns_name: Optional[str] = None,
+    page_size: int = 100,
+    max_concurrency: int = 4,
+    backend: Optional[Backend] = None,
+) -> Iterator[dict]:
+    """
+    Iterate over all columns, either by `table_id`, `column_id` or
+    `column_name`.
+
+    Pages are fetched concurrently, up to `max_concurrency` pages ahead of
+    the one being iterated over.
+
+    Args:
+        table_id: Table slug in Google BigQuery (GBQ).
+        column_id: Column slug in Google BigQuery (GBQ).
+        column_name: Column name in Base dos Dados metadata.
+        page_size: Number of columns fetched per request.
+        max_concurrency: Maximum number of pages fetched at the same time.
+        backend: Backend instance, injected automatically.
+
+    Yields:
+        Columns, in the same form as the items of `get_columns`.
+    """
+    return _iter_pages(
+        partial(
+            get_columns,
+            table_id,
+            column_id,
+            columns_name,
+            page_size=page_size,
+            backend=backend,
+        ),
+        max_concurrency,
+    )
+
+
+def _iter_pages(
+    get_page: Callable[..., Any], max_concurrency: int
+) -> Iterator[dict]:
+    """
+    Iterate over the items of all pages, in order.
+
+    The first page gives the number of pages. The following ones are fetched
+    by a thread pool, keeping at most `max_concurrency` requests in flight.
+
+    Args:
+        get_page: Function returning a page, given its number as `page`.
+        max_concurrency: Maximum number of pages fetched at the same time.
+
+    Yields:
+        The items of each page.
+    """
+    first = get_page(page=1)
+    yield from first.get("items", []) or []
+
+    max_concurrency = max(1, max_concurrency)
+    pages = iter(range(2, (first.get("page_total") or 0) + 1))
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        window = deque(
+            executor.submit(get_page, page=page)
+            for page in islice(pages, max_concurrency)
+        )
+        while window:
+            result = window.popleft().result()
+            page = next(pages, None)
+            if page is not None:
+                window.append(executor.submit(get_page, page=page))
+            yield from result.get("items", []) or []
 
 
 def search(
@@ -122,10 +272,40 @@ def search(
     Returns:
         List of datasets and metadata.
     """
-    backend = Backend() if backend is None else backend
+    backend = _default_backend() if backend is None else backend
+    return _format_search(backend.search(q, page, page_size))
 
+
+def _format_datasets(result: dict) -> dict:
+    """
+    Flatten the organization, tags and themes of a page of datasets.
+    """
+    for item in result.get("items", []) or []:
+        item["organization"] = item.get("organization", {}).get("name")
+        item["tags"] = [
+            i.get("name") for i in item.get("tags", {}).get("items")
+        ]
+        item["themes"] = [
+            i.get("name") for i in item.get("themes", {}).get("items")
+        ]
+    return result
+
+
+def _format_columns(result: dict) -> dict:
+    """
+    Flatten the BigQuery type of a page of columns.
+    """
+    for item in result.get("items", []) or []:
+        item["bigquery_type"] = item.pop("bigqueryType", {}).get("name")
+    return result
+
+
+def _format_search(response: dict) -> list[dict]:
+    """
+    Keep the fields of each dataset of a search response.
+    """
     items = []
-    for item in backend.search(q, page, page_size).get("results", []):
+    for item in response.get("results", []):
         org = item.get("organizations")
         items.append(
             {
@@ -86,3 +86,20 @@ class BaseDosDadosAuthorizationException(BaseDosDadosException):
 
 class BaseDosDadosMissingDependencyException(BaseDosDadosException):
     """Exception raised if one of the optional dependencies is missing."""
+
+
+class BaseDosDadosMaximumBytesBilledException(BaseDosDadosException):
+    """Exception raised if a query would process more bytes than allowed."""
+
+    def __init__(self, total_bytes_processed: int, maximum_bytes_billed: int):
+        self.total_bytes_processed = total_bytes_processed
+        self.maximum_bytes_billed = maximum_bytes_billed
+        self.message = (
+            f"\nThis query would process {total_bytes_processed / 1024**3:.2f}"
+            f" GB, above the maximum of {maximum_bytes_billed / 1024**3:.2f}"
+            " GB.\nSelect only the columns you need and filter the rows, "
+            "preferably on partition columns such as `ano` and `sigla_uf`, to "
+            "scan less data.\nYou can also raise the limit with the "
+            "`maximum_bytes_billed` argument or `config.maximum_bytes_billed`."
+        )
+        super().__init__(self.message)
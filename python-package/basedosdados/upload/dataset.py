@@ -2,7 +2,6 @@
 Module for manage dataset to the server.
 """
 
-from functools import lru_cache
 from typing import Any, Optional
 
 from google.api_core.exceptions import Conflict
@@ -29,7 +28,6 @@ class Dataset(Base):
         self.dataset_id = dataset_id.replace("-", "_")
 
     @property
-    @lru_cache
     def dataset_config(self) -> dict[str, Any]:
         """
         Dataset config file.
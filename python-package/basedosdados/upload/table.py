@@ -6,7 +6,6 @@ import contextlib
 import inspect
 import textwrap
 from copy import deepcopy
-from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional, Union
 
@@ -16,6 +15,7 @@ from google.cloud.bigquery import SchemaField
 from loguru import logger
 
 from basedosdados.core.base import Base
+from basedosdados.core.table_metadata import table_metadata
 from basedosdados.exceptions import BaseDosDadosException
 from basedosdados.upload.connection import Connection
 from basedosdados.upload.dataset import Dataset
@@ -56,7 +56,6 @@ class Table(Base):
         self.table_full_name.update(dict(all=deepcopy(self.table_full_name)))
 
     @property
-    @lru_cache(256)
     def table_config(self) -> dict[str, Any]:
         """
         Load table config.
@@ -302,7 +301,9 @@ class Table(Base):
             msg = f"Table {self.dataset_id}.{self.table_id} does not exist in {mode}, please create first!"
             raise BaseDosDadosException(msg)
         else:
-            schema = self._get_table_obj(mode=mode).schema
+            schema = table_metadata.get(
+                self.client[f"bigquery_{mode}"], self.table_full_name[mode]
+            ).schema
 
         partition_dict = self._parser_blobs_to_partition_dict()
 
@@ -420,7 +421,9 @@ class Table(Base):
         """
 
         try:
-            ref = self._get_table_obj(mode=mode)
+            ref = table_metadata.get(
+                self.client[f"bigquery_{mode}"], self.table_full_name[mode]
+            )
         except google.api_core.exceptions.NotFound:
             ref = None
 
@@ -701,6 +704,7 @@ class Table(Base):
 
         try:
             self.client["bigquery_staging"].create_table(table)
+            table_metadata.invalidate(self.table_full_name["staging"])
         except google.api_core.exceptions.Forbidden as exc:
             if biglake_table:
                 raise BaseDosDadosException(
@@ -757,6 +761,7 @@ class Table(Base):
         fields = ["description", "schema"]
 
         self.client["bigquery_prod"].update_table(table, fields=fields)
+        table_metadata.invalidate(self.table_full_name[mode])
 
         logger.success(
             " {object} {object_id} was {action} in {mode}!",
@@ -805,6 +810,7 @@ class Table(Base):
         # create view using custon query
         if custom_publish_sql is not None:
             self.client["bigquery_prod"].query(custom_publish_sql).result()
+            table_metadata.invalidate(self.table_full_name["prod"])
             # update schema using a custom schema
             if custom_schema is not None:
                 self.update(custom_schema=custom_schema)
@@ -829,6 +835,7 @@ class Table(Base):
         if mode == "all":
             for m, n in self.table_full_name[mode].items():
                 self.client[f"bigquery_{m}"].delete_table(n, not_found_ok=True)
+                table_metadata.invalidate(n)
                 logger.info(
                     " {object} {object_id}_{mode} was {action}!",
                     object_id=self.table_id,
@@ -840,6 +847,7 @@ class Table(Base):
             self.client[f"bigquery_{mode}"].delete_table(
                 self.table_full_name[mode], not_found_ok=True
             )
+            table_metadata.invalidate(self.table_full_name[mode])
             logger.info(
                 " {object} {object_id}_{mode} was {action}!",
                 object_id=self.table_id,
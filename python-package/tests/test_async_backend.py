@@ -0,0 +1,210 @@
+"""
+Tests for the `AsyncBackend` class and the async metadata functions.
+"""
+
+import asyncio
+import threading
+
+from gql.transport.exceptions import TransportServerError
+
+from basedosdados.async_backend import AsyncBackend
+from basedosdados.core.metadata_cache import LRUCache
+from basedosdados.download import async_metadata
+
+
+class _Session:
+    """
+    Stand-in for an async GraphQL session, answering pages of datasets and
+    table config lookups, and failing the first `failures` requests.
+    """
+
+    def __init__(self, total=25, failures=0):
+        self.total = total
+        self.failures = failures
+        self.requests = []
+
+    async def execute(self, request, variable_values=None):
+        self.requests.append(variable_values)
+        if self.failures:
+            self.failures -= 1
+            raise TransportServerError("Service Unavailable", 503)
+        await asyncio.sleep(0)
+
+        variables = variable_values or {}
+        if "offset" in variables:
+            slugs = range(
+                variables["offset"],
+                min(variables["offset"] + variables["first"], self.total),
+            )
+            return {
+                "allDataset": {
+                    "edges": [
+                        {
+                            "node": {
+                                "slug": f"dataset_{i}",
+                                "organization": {"name": "IBGE"},
+                                "tags": {"edges": []},
+                                "themes": {"edges": []},
+                            }
+                        }
+                        for i in slugs
+                    ],
+                    "totalCount": self.total,
+                }
+            }
+        return {
+            name: {"edges": [{"node": {"table": {"slug": variables[name]}}}]}
+            for name in variables
+            if name.startswith("table_")
+        }
+
+
+def _backend(session, cache=None):
+    backend = AsyncBackend(cache=cache)
+
+    async def graphql_session():
+        return session
+
+    backend.graphql_session = graphql_session
+    return backend
+
+
+def test_get_datasets():
+    """
+    Test if pages of datasets are simplified as in `Backend`.
+    """
+
+    backend = _backend(_Session())
+    out = asyncio.run(backend.get_datasets(page=3, page_size=10))
+
+    assert [item["slug"] for item in out["items"]] == [
+        f"dataset_{i}" for i in range(20, 25)
+    ]
+    assert out["page"] == 3
+    assert out["page_total"] == 3
+
+
+def test_get_table_configs():
+    """
+    Test if batches of table configs are requested concurrently and returned
+    in order.
+    """
+
+    session = _Session()
+    backend = _backend(session)
+    tables = [("br_ibge_pib", f"table_{i}") for i in range(5)]
+    tables[3] = ("", "table_3")
+
+    out = asyncio.run(backend.get_table_configs(tables, batch_size=2))
+    assert len(session.requests) == 3
+    assert [config.get("slug") for config in out] == [
+        "table_0",
+        "table_1",
+        "table_2",
+        None,
+        "table_4",
+    ]
+    assert asyncio.run(backend.get_table_config("br_ibge_pib", "municipio"))
+
+
+def test_execute_query_retries(monkeypatch):
+    """
+    Test if requests failed by unavailable servers are retried.
+    """
+
+    monkeypatch.setattr("basedosdados.async_backend._RETRY_BACKOFF_FACTOR", 0)
+    session = _Session(failures=2)
+    out = asyncio.run(_backend(session).get_datasets())
+
+    assert len(session.requests) == 3
+    assert len(out["items"]) == 10
+
+
+def test_execute_query_cache():
+    """
+    Test if responses are cached per query and variables.
+    """
+
+    session = _Session()
+    backend = _backend(session, cache=LRUCache())
+
+    async def main():
+        for _ in range(3):
+            await backend.get_datasets(page_size=5)
+        await backend.get_datasets(page_size=5, page=2)
+
+    asyncio.run(main())
+    assert len(session.requests) == 2
+
+
+def test_iter_datasets():
+    """
+    Test if the async iterator yields all datasets in order.
+    """
+
+    backend = _backend(_Session(total=23))
+
+    async def main():
+        return [
+            dataset["slug"]
+            async for dataset in async_metadata.iter_datasets(
+                page_size=5, max_concurrency=2, backend=backend
+            )
+        ]
+
+    assert asyncio.run(main()) == [f"dataset_{i}" for i in range(23)]
+
+
+class _Client:
+    """
+    Stand-in for an async GraphQL client, recording whether it was closed.
+    """
+
+    def __init__(self):
+        self.closed = False
+
+    async def connect_async(self):
+        return _Session()
+
+    async def close_async(self):
+        self.closed = True
+
+
+def test_graphql_session_closed_with_loop():
+    """
+    Test if the session is closed when its event loop shuts down, and a new
+    one is opened in the next loop.
+    """
+
+    backend = AsyncBackend()
+    clients = []
+
+    def get_client():
+        clients.append(_Client())
+        return clients[-1]
+
+    backend._get_client = get_client
+
+    for _ in range(2):
+        asyncio.run(backend.get_datasets(page_size=5))
+
+    assert len(clients) == 2
+    assert all(client.closed for client in clients)
+
+
+def test_default_backend_per_thread():
+    """
+    Test if the default backend is shared within a thread only.
+    """
+
+    backends = []
+    thread = threading.Thread(
+        target=lambda: backends.append(async_metadata._default_backend())
+    )
+    thread.start()
+    thread.join()
+
+    assert (
+        async_metadata._default_backend() is async_metadata._default_backend()
+    )
+    assert backends[0] is not async_metadata._default_backend()
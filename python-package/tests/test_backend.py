@@ -1,4 +1,11 @@
+from types import SimpleNamespace
+
+from gql import Client
+from gql.transport.transport import Transport
+from graphql import ExecutionResult
+
 from basedosdados.backend import Backend
+from basedosdados.core.metadata_cache import LRUCache
 
 backend = Backend()
 
@@ -207,3 +214,197 @@ def test_simplify_response():
     out = backend._simplify_response(response)
     assert isinstance(out, dict)
     assert len(out) != 0
+
+
+def test_simplify_response_page_total():
+    """
+    Test if the number of pages counts the last, incomplete page.
+    """
+
+    response = {"allTable": {"edges": [], "totalCount": 25}}
+    out = backend._simplify_response(response, page_size=20)
+    assert out["allTable"]["page_size"] == 20
+    assert out["allTable"]["page_total"] == 2
+
+
+class _Transport(Transport):
+    """
+    Stand-in for a GraphQL transport, counting connections and requests.
+    """
+
+    def __init__(self):
+        self.connections = 0
+        self.requests = 0
+
+    def connect(self):
+        self.connections += 1
+
+    def execute(self, request, *args, **kwargs):
+        self.requests += 1
+        return ExecutionResult(data={"allDataset": {"totalCount": 0}})
+
+    def close(self):
+        pass
+
+
+def test_execute_query_reuses_session():
+    """
+    Test if all queries share the session of the backend client, unless
+    another client is given.
+    """
+
+    local_backend = Backend()
+    transport = _Transport()
+    local_backend.graphql_client = Client(transport=transport)
+
+    for _ in range(3):
+        local_backend._execute_query("query { allDataset { totalCount } }")
+    assert transport.connections == 1
+    assert transport.requests == 3
+
+    other_transport = _Transport()
+    local_backend._execute_query(
+        "query { allDataset { totalCount } }",
+        client=Client(transport=other_transport),
+    )
+    assert transport.requests == 3
+    assert other_transport.requests == 1
+
+    local_backend.close()
+    local_backend._execute_query("query { allDataset { totalCount } }")
+    assert transport.connections == 2
+
+
+class _ConfigTransport(_Transport):
+    """
+    Stand-in for a GraphQL transport answering table config lookups.
+    """
+
+    def execute(self, request, *args, **kwargs):
+        self.requests += 1
+        variables = request.variable_values
+        return ExecutionResult(
+            data={
+                name: {
+                    "edges": [{"node": {"table": {"slug": variables[name]}}}]
+                    if variables[name] != "missing"
+                    else []
+                }
+                for name in variables
+                if name.startswith("table_")
+            }
+        )
+
+
+def test_get_table_configs():
+    """
+    Test if many table configs are fetched in a single request per batch.
+    """
+
+    local_backend = Backend()
+    transport = _ConfigTransport()
+    local_backend.graphql_client = Client(transport=transport)
+
+    tables = [("br_ibge_pib", f"table_{i}") for i in range(5)]
+    tables[2] = ("br_ibge_pib", "missing")
+    tables[3] = ("", "table_3")
+
+    out = local_backend.get_table_configs(tables, batch_size=3)
+    assert transport.requests == 2
+    assert [config.get("slug") for config in out] == [
+        "table_0",
+        "table_1",
+        None,
+        None,
+        "table_4",
+    ]
+
+
+def test_execute_query_cache():
+    """
+    Test if responses are cached per query and variables until invalidated.
+    """
+
+    local_backend = Backend(cache=LRUCache())
+    transport = _Transport()
+    local_backend.graphql_client = Client(transport=transport)
+    query = "query { allDataset { totalCount } }"
+
+    for _ in range(3):
+        out = local_backend._execute_query(query, page_size=20)
+    assert transport.requests == 1
+    assert out["allDataset"]["page_size"] == 20
+
+    local_backend._execute_query(query, variables={"first": 1})
+    assert transport.requests == 2
+
+    local_backend.invalidate_cache(query)
+    local_backend._execute_query(query)
+    assert transport.requests == 3
+
+
+def test_execute_query_cache_not_found():
+    """
+    Test if lookups without results are not cached, so that metadata created
+    afterwards is found.
+    """
+
+    local_backend = Backend(cache=LRUCache())
+    transport = _ConfigTransport()
+    local_backend.graphql_client = Client(transport=transport)
+
+    for _ in range(2):
+        local_backend.get_table_configs([("br_ibge_pib", "missing")])
+    assert transport.requests == 2
+
+    for _ in range(2):
+        local_backend.get_table_configs([("br_ibge_pib", "municipio")])
+    assert transport.requests == 3
+
+
+class _Response:
+    def __init__(self, status_code, data=None, etag=None):
+        self.status_code = status_code
+        self.data = data
+        self.headers = {"ETag": etag} if etag else {}
+        self.text = ""
+
+    def json(self):
+        return self.data
+
+
+class _Session:
+    """
+    Stand-in for an HTTP session answering searches with an ETag.
+    """
+
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url, params, headers, timeout):
+        self.requests.append(headers)
+        if headers and headers["If-None-Match"] == '"1"':
+            return _Response(304)
+        return _Response(200, {"count": 1, "results": []}, etag='"1"')
+
+
+def test_search_cache(monkeypatch):
+    """
+    Test if expired search results are revalidated with their ETag.
+    """
+
+    local_backend = Backend(cache=LRUCache())
+    session = _Session()
+    local_backend._graphql_session = SimpleNamespace(
+        transport=SimpleNamespace(session=session)
+    )
+
+    assert local_backend.search("pib") == {"count": 1, "results": []}
+    assert local_backend.search("pib") == {"count": 1, "results": []}
+    assert session.requests == [None]
+
+    monkeypatch.setattr(local_backend.cache, "ttl", 0)
+    local_backend.invalidate_cache()
+    local_backend.search("pib")
+    assert local_backend.search("pib") == {"count": 1, "results": []}
+    assert session.requests == [None, None, {"If-None-Match": '"1"'}]
@@ -0,0 +1,113 @@
+"""
+Tests for the `QueryCache` class.
+"""
+
+import datetime
+import os
+import time
+from types import SimpleNamespace
+
+import pyarrow as pa
+
+from basedosdados.download.cache import QueryCache
+
+TABLE_ID = "basedosdados.br_ibge_pib.municipio"
+
+
+class _Client:
+    """
+    Stand-in for a BigQuery client, only answering `get_table`.
+    """
+
+    def __init__(self, modified: datetime.datetime):
+        self.modified = modified
+
+    def get_table(self, table_id):
+        return SimpleNamespace(modified=self.modified)
+
+
+def _past_client():
+    return _Client(datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc))
+
+
+def test_normalize():
+    """
+    Test if whitespace is collapsed only outside of quoted strings.
+    """
+
+    assert (
+        QueryCache.normalize("select *\n  from  t where a = 'x  y' ;")
+        == "select * from t where a = 'x  y'"
+    )
+
+
+def test_key():
+    """
+    Test if the key depends on the normalized query and the billing project.
+    """
+
+    cache = QueryCache()
+
+    assert cache.key("select 1", "a") == cache.key(" select   1;", "a")
+    assert cache.key("select 1", "a") != cache.key("select 1", "b")
+
+
+def test_get_set(tmp_path):
+    """
+    Test if a stored result is loaded back.
+    """
+
+    cache = QueryCache(path=tmp_path)
+    table = pa.table({"id": [1, 2, 3]})
+    key = cache.key("select 1", "a")
+
+    assert cache.get(key, _past_client()) is None
+    cache.set(key, table, tables=[TABLE_ID])
+    assert cache.get(key, _past_client()).equals(table)
+
+
+def test_get_ttl(tmp_path):
+    """
+    Test if entries older than the TTL are discarded.
+    """
+
+    cache = QueryCache(path=tmp_path)
+    key = cache.key("select 1", "a")
+    cache.set(key, pa.table({"id": [1]}), tables=[])
+
+    time.sleep(0.01)
+    assert cache.get(key, _past_client(), ttl=0) is None
+    assert not list(tmp_path.iterdir())
+
+
+def test_get_modified_table(tmp_path):
+    """
+    Test if entries are discarded once a source table is modified.
+    """
+
+    cache = QueryCache(path=tmp_path)
+    key = cache.key("select 1", "a")
+    cache.set(key, pa.table({"id": [1]}), tables=[TABLE_ID])
+
+    future = datetime.datetime.now(datetime.timezone.utc)
+    future += datetime.timedelta(days=1)
+    assert cache.get(key, _Client(future)) is None
+
+
+def test_evict(tmp_path):
+    """
+    Test if the least recently used entries are evicted.
+    """
+
+    cache = QueryCache(path=tmp_path)
+    keys = [cache.key(f"select {i}", "a") for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.set(key, pa.table({"id": list(range(1000))}), tables=[])
+        os.utime(tmp_path / f"{key}.parquet", (i, i))
+
+    cache.max_size = (tmp_path / f"{keys[0]}.parquet").stat().st_size * 2
+    cache._evict()
+
+    assert sorted(p.stem for p in tmp_path.glob("*.parquet")) == sorted(
+        keys[1:]
+    )
@@ -0,0 +1,234 @@
+"""
+Tests for the `CatalogSnapshot` class.
+"""
+
+import pytest
+from gql import Client
+from gql.transport.transport import Transport
+from graphql import ExecutionResult
+
+from basedosdados.backend import Backend
+from basedosdados.core.metadata_cache import LRUCache
+from basedosdados.download import metadata
+from basedosdados.download.catalog import CatalogSnapshot
+
+
+def _dataset(dataset_id, name, updated_at, tables):
+    return {
+        "_id": dataset_id,
+        "slug": dataset_id,
+        "name": name,
+        "description": f"Dados de {name}",
+        "createdAt": "2020-01-01",
+        "updatedAt": updated_at,
+        "organizations": {"items": [{"slug": "ibge", "name": "IBGE"}]},
+        "tags": {"items": [{"name": "economia"}]},
+        "themes": {"items": [{"name": "Economia"}]},
+        "tables": {
+            "items": [
+                {
+                    "_id": f"{dataset_id}.{table}",
+                    "slug": table,
+                    "name": table,
+                    "description": None,
+                    "numberRows": 10,
+                    "numberColumns": 1,
+                    "uncompressedFileSize": 100,
+                    "columns": {
+                        "items": [
+                            {
+                                "_id": f"{dataset_id}.{table}.id",
+                                "name": "id",
+                                "description": "Identificador",
+                                "observations": None,
+                                "bigqueryType": {"name": "INT64"},
+                            }
+                        ]
+                    },
+                }
+                for table in tables
+            ]
+        },
+    }
+
+
+class _Backend:
+    """
+    Stand-in for a backend, serving a catalog and recording detail requests.
+    """
+
+    def __init__(self, datasets):
+        self.datasets = datasets
+        self.fetched = []
+
+    def _execute_query(
+        self, query, variables, page=1, page_size=10, refresh=False
+    ):
+        if "dataset_id" in variables:
+            self.fetched.append(variables["dataset_id"])
+            dataset = self.datasets[variables["dataset_id"]]
+            return {"allDataset": {"items": [dataset]}}
+
+        datasets = list(self.datasets.values())
+        start = variables["offset"]
+        return {
+            "allDataset": {
+                "items": [
+                    {"_id": d["_id"], "updatedAt": d["updatedAt"]}
+                    for d in datasets[start : start + variables["first"]]
+                ],
+                "page": page,
+                "page_size": page_size,
+                "page_total": -(-len(datasets) // page_size),
+            }
+        }
+
+
+@pytest.fixture
+def backend():
+    return _Backend(
+        {
+            "br_ibge_pib": _dataset(
+                "br_ibge_pib", "Produto Interno Bruto", "1", ["municipio"]
+            ),
+            "br_inep_censo": _dataset(
+                "br_inep_censo", "Censo da Educação", "1", ["escola", "aluno"]
+            ),
+            "br_ms_sim": _dataset("br_ms_sim", "Mortalidade", "1", []),
+        }
+    )
+
+
+def test_sync(tmp_path, backend):
+    """
+    Test if a sync stores all datasets, tables and columns.
+    """
+
+    snapshot = CatalogSnapshot(tmp_path / "catalog.db")
+    snapshot.sync(backend, page_size=2)
+
+    assert snapshot.synced_at is not None
+    assert snapshot.get_datasets()["page_total"] == 1
+    assert len(snapshot.get_datasets()["items"]) == 3
+    assert len(snapshot.get_tables(dataset_id="br_inep_censo")["items"]) == 2
+    columns = snapshot.get_columns(table_id="br_ibge_pib.municipio")
+    assert columns["items"] == [
+        {
+            "name": "id",
+            "description": "Identificador",
+            "observations": None,
+            "bigqueryType": {"name": "INT64"},
+        }
+    ]
+
+
+def test_sync_incremental(tmp_path, backend):
+    """
+    Test if only updated datasets are fetched again and removed ones are
+    deleted.
+    """
+
+    snapshot = CatalogSnapshot(tmp_path / "catalog.db")
+    snapshot.sync(backend)
+
+    backend.fetched = []
+    backend.datasets["br_ibge_pib"] = _dataset(
+        "br_ibge_pib", "PIB", "2", ["municipio", "uf"]
+    )
+    del backend.datasets["br_ms_sim"]
+    snapshot.sync(backend)
+
+    assert backend.fetched == ["br_ibge_pib"]
+    assert [d["slug"] for d in snapshot.get_datasets()["items"]] == [
+        "br_ibge_pib",
+        "br_inep_censo",
+    ]
+    assert len(snapshot.get_tables(dataset_id="br_ibge_pib")["items"]) == 2
+    assert snapshot.search("mortalidade")["count"] == 0
+
+
+class _CatalogTransport(Transport):
+    """
+    Stand-in for a GraphQL transport serving the catalog of a `_Backend`.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def connect(self):
+        pass
+
+    def execute(self, request, *args, **kwargs):
+        response = self.backend._execute_query(
+            None, request.variable_values, page_size=100
+        )["allDataset"]
+        return ExecutionResult(
+            data={
+                "allDataset": {
+                    "edges": [{"node": item} for item in response["items"]]
+                }
+            }
+        )
+
+    def close(self):
+        pass
+
+
+def test_sync_incremental_cached_backend(tmp_path, backend):
+    """
+    Test if syncs with a caching backend don't miss updated datasets.
+    """
+
+    cached_backend = Backend(cache=LRUCache())
+    cached_backend.graphql_client = Client(
+        transport=_CatalogTransport(backend)
+    )
+
+    snapshot = CatalogSnapshot(tmp_path / "catalog.db")
+    snapshot.sync(cached_backend)
+
+    backend.fetched = []
+    backend.datasets["br_ibge_pib"] = _dataset(
+        "br_ibge_pib", "PIB", "2", ["municipio", "uf"]
+    )
+    snapshot.sync(cached_backend)
+
+    assert backend.fetched == ["br_ibge_pib"]
+    assert len(snapshot.get_tables(dataset_id="br_ibge_pib")["items"]) == 2
+
+
+def test_search(tmp_path, backend):
+    """
+    Test if search matches word prefixes, ignoring accents, and table names.
+    """
+
+    snapshot = CatalogSnapshot(tmp_path / "catalog.db")
+    snapshot.sync(backend)
+
+    assert [r["slug"] for r in snapshot.search("educacao")["results"]] == [
+        "br_inep_censo"
+    ]
+    assert [r["slug"] for r in snapshot.search("Produto Int")["results"]] == [
+        "br_ibge_pib"
+    ]
+    result = snapshot.search("escola")["results"][0]
+    assert result["slug"] == "br_inep_censo"
+    assert result["n_tables"] == 2
+    assert snapshot.search("")["count"] == 3
+
+
+def test_metadata_functions(tmp_path, backend):
+    """
+    Test if the metadata functions accept a snapshot as their backend.
+    """
+
+    snapshot = CatalogSnapshot(tmp_path / "catalog.db")
+    snapshot.sync(backend)
+
+    tables = metadata.get_tables(table_name="esc", backend=snapshot)
+    assert [table["slug"] for table in tables["items"]] == ["escola"]
+    assert [
+        dataset["slug"]
+        for dataset in metadata.search("censo", backend=snapshot)
+    ] == ["br_inep_censo"]
+    assert len(list(metadata.iter_tables(page_size=1, backend=snapshot))) == 3
@@ -0,0 +1,45 @@
+"""
+Tests for the `ClientPool` class.
+"""
+
+import threading
+
+from google.oauth2.credentials import Credentials
+
+from basedosdados.download.clients import ClientPool
+
+
+def test_get():
+    """
+    Test if clients are created once and share their HTTP session.
+    """
+
+    pool = ClientPool(max_connections=4)
+    calls = []
+
+    def credentials():
+        calls.append(1)
+        return Credentials(token="token")
+
+    clients = []
+
+    def get():
+        clients.append(pool.get("project", True, False, credentials))
+
+    threads = [threading.Thread(target=get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    client = clients[0]
+    assert len(calls) == 1
+    assert all(other is client for other in clients)
+    assert client["bigquery"].project == "project"
+    assert client["bigquery"]._http is client["storage"]._http
+    assert client["bigquery"]._http.adapters["https://"]._pool_maxsize == 4
+
+    pool.close()
+    assert pool.get("project", True, False, credentials) is not client
+    assert len(calls) == 2
+    pool.close()
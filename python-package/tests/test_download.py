@@ -2,17 +2,60 @@
 Tests for the `download` class.
 """
 
+import base64
+import datetime
+import gzip
 import shutil
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from pathlib import Path
+from types import SimpleNamespace
 
+import fastavro
+import google_crc32c
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
+from google.api_core.exceptions import NotFound
 from pandas_gbq.gbq import GenericGBQException
 
-from basedosdados import download, read_sql, read_table
+from basedosdados import (
+    config,
+    download,
+    download_many,
+    iter_sql,
+    read_sql,
+    read_table,
+)
+from basedosdados.download import download as download_module
+from basedosdados.download.download import (
+    _EXPORT_FORMATS,
+    _build_query,
+    _check_bytes_processed,
+    _compile_filters,
+    _delete_bucket,
+    _direct_download,
+    _download_blob,
+    _download_blob_from_bucket,
+    _gzip_join_files,
+    _iter_read_session,
+    _join_avro_files,
+    _join_files,
+    _join_parquet_files,
+    _manifest_source,
+    _read_manifest,
+    _sql_literal,
+    _verify_file,
+    _wait_for,
+    _write_manifest,
+)
 from basedosdados.exceptions import (
     BaseDosDadosAccessDeniedException,
     BaseDosDadosException,
+    BaseDosDadosMaximumBytesBilledException,
+    BaseDosDadosMissingDependencyException,
 )
 
 TEST_PROJECT_ID = "basedosdados-dev"
@@ -71,6 +114,137 @@ def test_download_large_file():
     assert (SAVEFILE).exists()
 
 
+def test_download_large_file_concurrent():
+    """
+    Test for the `download` function for a large file when shards are
+    downloaded concurrently.
+    """
+
+    download(
+        SAVEFILE,
+        dataset_id="br_ibge_pib",
+        table_id="municipio",
+        billing_project_id=TEST_PROJECT_ID,
+        from_file=True,
+        max_workers=4,
+    )
+
+    assert SAVEFILE.exists()
+
+
+def test_download_reuse_bucket():
+    """
+    Test for the `download` function when exporting through the staging bucket
+    of the billing project, twice in a row.
+    """
+
+    for _ in range(2):
+        download(
+            SAVEFILE,
+            dataset_id="br_ibge_pib",
+            table_id="municipio",
+            billing_project_id=TEST_PROJECT_ID,
+            limit=10,
+            from_file=True,
+            reuse_bucket=True,
+        )
+
+        assert SAVEFILE.exists()
+
+
+def test_download_many():
+    """
+    Test for the `download_many` function, with one failing download.
+    """
+
+    results = download_many(
+        [
+            dict(
+                savepath=SAVE_DIR / "many_uf.csv",
+                dataset_id="br_bd_diretorios_brasil",
+                table_id="uf",
+            ),
+            dict(
+                savepath=SAVE_DIR / "many_pib.csv",
+                query="select * from `basedosdados.br_ibge_pib.municipio`",
+            ),
+            dict(savepath=SAVE_DIR / "many_invalid.csv"),
+        ],
+        billing_project_id=TEST_PROJECT_ID,
+        from_file=True,
+        limit=10,
+    )
+
+    assert [result.savepath.name for result in results] == [
+        "many_uf.csv",
+        "many_pib.csv",
+        "many_invalid.csv",
+    ]
+    assert results[0].error is None and results[0].savepath.exists()
+    assert results[1].error is None and results[1].savepath.exists()
+    assert isinstance(results[2].error, BaseDosDadosException)
+
+
+def test_download_many_reauth_and_missing_savepath(monkeypatch):
+    """
+    Test if `download_many` passes `reauth` to every download and reports a
+    download without `savepath` in its result instead of failing the batch.
+    """
+
+    calls = []
+
+    def download(savepath, **kwargs):
+        calls.append(kwargs)
+
+    monkeypatch.setattr(download_module, "download", download)
+    monkeypatch.setattr(download_module, "_google_client", lambda *args: None)
+
+    results = download_many(
+        [dict(savepath="uf.csv", table_id="uf"), dict(table_id="pib")],
+        billing_project_id=TEST_PROJECT_ID,
+        reauth=True,
+    )
+
+    assert [call["reauth"] for call in calls] == [True]
+    assert results[0].savepath == Path("uf.csv") and results[0].error is None
+    assert results[1].savepath is None
+    assert isinstance(results[1].error, TypeError)
+
+
+def test_download_parquet():
+    """
+    Test for the `download` function when saving to a parquet file.
+    """
+
+    savefile = SAVE_DIR / "test.parquet"
+    download(
+        savefile,
+        dataset_id="br_ibge_pib",
+        table_id="municipio",
+        billing_project_id=TEST_PROJECT_ID,
+        limit=10,
+        from_file=True,
+    )
+
+    assert len(pd.read_parquet(savefile)) == 10
+
+
+def test_download_returns_job_statistics():
+    """
+    Test if the `download` function returns the statistics of the query job.
+    """
+
+    statistics = download(
+        SAVEFILE,
+        query="select * from `basedosdados.br_ibge_pib.municipio` limit 10",
+        billing_project_id=TEST_PROJECT_ID,
+        from_file=True,
+    )
+
+    assert statistics.total_bytes_processed is not None
+    assert statistics.cache_hit is not None
+
+
 def test_download_no_query_or_table():
     """
     Test if the `download` function raises an error when neither the query nor
@@ -99,6 +273,112 @@ def test_read_sql():
     )
 
 
+def test_read_sql_arrow():
+    """
+    Tests if read_sql returns a pyarrow Table or record batches when asked.
+    """
+
+    query = "select * from `basedosdados.br_ibge_pib.municipio` limit 10"
+
+    table = read_sql(
+        query=query,
+        billing_project_id=TEST_PROJECT_ID,
+        from_file=True,
+        output="arrow",
+    )
+    assert isinstance(table, pa.Table)
+    assert table.num_rows == 10
+
+    batches = read_sql(
+        query=query,
+        billing_project_id=TEST_PROJECT_ID,
+        from_file=True,
+        output="batches",
+    )
+    assert sum(batch.num_rows for batch in batches) == 10
+
+
+def test_read_sql_cache():
+    """
+    Tests if read_sql returns the same result when it is loaded from the local
+    cache.
+    """
+
+    query = "select * from `basedosdados.br_ibge_pib.municipio` limit 10"
+    kwargs = dict(billing_project_id=TEST_PROJECT_ID, from_file=True)
+
+    first = read_sql(query, use_cache=True, **kwargs)
+    second = read_sql(query, use_cache=True, **kwargs)
+
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_read_sql_maximum_bytes_billed():
+    """
+    Test if `read_sql` refuses queries estimated above `maximum_bytes_billed`.
+    """
+
+    with pytest.raises(BaseDosDadosMaximumBytesBilledException):
+        read_sql(
+            query="select * from `basedosdados.br_ibge_pib.municipio`",
+            billing_project_id=TEST_PROJECT_ID,
+            from_file=True,
+            maximum_bytes_billed=1,
+        )
+
+
+def test_read_sql_invalid_output():
+    """
+    Test if the `read_sql` function raises an error when the output type is
+    not supported.
+    """
+
+    with pytest.raises(BaseDosDadosException):
+        read_sql(
+            query="select 1",
+            billing_project_id=TEST_PROJECT_ID,
+            output="polars",
+        )
+
+
+def test_iter_sql():
+    """
+    Tests if iter_sql yields the query result in chunks and resumes from a
+    page token.
+    """
+
+    chunks = iter_sql(
+        query="select * from `basedosdados.br_ibge_pib.municipio` limit 10",
+        billing_project_id=TEST_PROJECT_ID,
+        from_file=True,
+        chunk_rows=4,
+    )
+    first = next(chunks)
+    assert isinstance(first.data, pd.DataFrame)
+    assert len(first.data) == 4
+    assert first.page_token is not None
+
+    resumed = iter_sql(
+        billing_project_id=TEST_PROJECT_ID,
+        from_file=True,
+        chunk_rows=4,
+        output="arrow",
+        destination=first.destination,
+        page_token=first.page_token,
+    )
+    assert sum(chunk.data.num_rows for chunk in resumed) == 6
+
+
+def test_iter_sql_no_query_or_destination():
+    """
+    Test if the `iter_sql` function raises an error when neither the query nor
+    the destination are provided.
+    """
+
+    with pytest.raises(BaseDosDadosException):
+        next(iter_sql(billing_project_id=TEST_PROJECT_ID))
+
+
 def test_read_sql_invalid_billing_project_id():
     """
     Test if the `read_sql` function raises an error when the billing project
@@ -211,3 +491,781 @@ def test_read_table():
         ),
         pd.DataFrame,
     )
+
+
+def test_read_table_direct_read():
+    """
+    Tests if read_table reads a whole table with the Storage Read API.
+    """
+
+    table = read_table(
+        dataset_id="br_bd_diretorios_brasil",
+        table_id="uf",
+        billing_project_id=TEST_PROJECT_ID,
+        from_file=True,
+        output="arrow",
+        direct_read=True,
+        max_streams=2,
+    )
+
+    assert isinstance(table, pa.Table)
+    assert table.num_rows == 27
+
+
+def test_read_table_columns_and_filters():
+    """
+    Tests if read_table only reads the requested columns and rows.
+    """
+
+    df = read_table(
+        dataset_id="br_ibge_pib",
+        table_id="municipio",
+        billing_project_id=TEST_PROJECT_ID,
+        from_file=True,
+        columns=["ano", "id_municipio", "pib"],
+        filters=[("ano", "=", 2010), ("id_municipio", "in", ["3550308"])],
+    )
+
+    assert list(df.columns) == ["ano", "id_municipio", "pib"]
+    assert len(df) == 1
+
+
+def test_compile_filters():
+    """
+    Test if filters are compiled into a safely quoted SQL predicate.
+    """
+
+    assert _compile_filters(None) is None
+    assert _compile_filters(
+        [
+            ("ano", ">=", 2020),
+            ("sigla_uf", "in", ["SP", "R'J"]),
+            ("data", "<", datetime.date(2021, 1, 1)),
+            ("id_municipio", "!=", None),
+            ("hash", "=", "a"),
+        ]
+    ) == (
+        "`ano` >= 2020 AND `sigla_uf` IN ('SP', 'R\\'J') "
+        "AND `data` < DATE '2021-01-01' AND `id_municipio` IS NOT NULL "
+        "AND `hash` = 'a'"
+    )
+
+
+def test_sql_literal_datetime():
+    """
+    Test if naive datetimes are rendered as DATETIME literals and aware ones
+    as TIMESTAMP literals.
+    """
+
+    naive = datetime.datetime(2021, 1, 1, 12, 30)
+    aware = naive.replace(tzinfo=datetime.timezone.utc)
+
+    assert _sql_literal(naive) == "DATETIME '2021-01-01 12:30:00'"
+    assert _sql_literal(aware) == "TIMESTAMP '2021-01-01 12:30:00+00:00'"
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        [("ano; DROP TABLE x", "=", 1)],
+        [("ano", "LIKE", "%")],
+        [("sigla_uf", "in", "SP")],
+        [("ano", "=", object())],
+        [("ano", 2020)],
+    ],
+)
+def test_compile_filters_invalid(filters):
+    """
+    Test if invalid filters raise an error instead of being interpolated.
+    """
+
+    with pytest.raises(BaseDosDadosException):
+        _compile_filters(filters)
+
+
+def test_build_query():
+    """
+    Test if the query selects only the requested columns and rows.
+    """
+
+    query = _build_query(
+        "br_ibge_pib",
+        "municipio",
+        columns=["ano", "pib"],
+        filters=[("ano", "=", 2010)],
+        limit=10,
+    )
+
+    assert "SELECT `ano`, `pib`" in query
+    assert "FROM `basedosdados.br_ibge_pib.municipio`" in query
+    assert "WHERE `ano` = 2010 LIMIT 10" in query
+    assert "SELECT *" in _build_query("br_ibge_pib", "municipio")
+
+
+def test_gzip_join_files(tmp_path):
+    """
+    Test if gzip shards are decompressed into a single file, keeping only the
+    first header.
+    """
+
+    shards = tmp_path / "tmp"
+    shards.mkdir()
+    for i, rows in enumerate([b"1,a\n2,b\n", b"3,c\n"]):
+        with gzip.open(shards / f"{i:012d}.csv.gz", "wb") as f:
+            f.write(b"id,name\n" + rows)
+
+    savepath = tmp_path / "test.csv"
+    _gzip_join_files(shards, savepath)
+
+    assert savepath.read_bytes() == b"id,name\n1,a\n2,b\n3,c\n"
+    assert not list(shards.iterdir())
+
+
+def test_join_files(tmp_path):
+    """
+    Test if shards are joined in name order, keeping only the first header.
+    """
+
+    shards = tmp_path / "tmp"
+    shards.mkdir()
+    (shards / "000000000001.csv").write_bytes(b"id,name\n3,c\n")
+    (shards / "000000000000.csv").write_bytes(b"id,name\n1,a\n2,b\n")
+
+    savepath = tmp_path / "test.csv"
+    _join_files(shards, savepath)
+
+    assert savepath.read_bytes() == b"id,name\n1,a\n2,b\n3,c\n"
+
+
+def test_join_parquet_files(tmp_path):
+    """
+    Test if parquet shards are merged into a single file, in name order.
+    """
+
+    shards = tmp_path / "tmp"
+    shards.mkdir()
+    pq.write_table(pa.table({"id": [3]}), shards / "000000000001.parquet")
+    pq.write_table(pa.table({"id": [1, 2]}), shards / "000000000000.parquet")
+
+    savepath = tmp_path / "test.parquet"
+    _join_parquet_files(shards, savepath)
+
+    assert pq.read_table(savepath).column("id").to_pylist() == [1, 2, 3]
+
+
+def test_join_avro_files(tmp_path):
+    """
+    Test if avro shards are merged into a single file, in name order.
+    """
+
+    schema = fastavro.parse_schema(
+        {
+            "type": "record",
+            "name": "Root",
+            "fields": [{"name": "id", "type": "long"}],
+        }
+    )
+    shards = tmp_path / "tmp"
+    shards.mkdir()
+    for i, rows in enumerate([[1, 2], [3]]):
+        with (shards / f"{i:012d}.avro").open("wb") as f:
+            fastavro.writer(
+                f, schema, [{"id": row} for row in rows], codec="deflate"
+            )
+
+    savepath = tmp_path / "test.avro"
+    _join_avro_files(shards, savepath)
+
+    with savepath.open("rb") as f:
+        assert [r["id"] for r in fastavro.reader(f)] == [1, 2, 3]
+
+
+def test_download_avro_snappy_without_cramjam(tmp_path, monkeypatch):
+    """
+    Test if SNAPPY Avro downloads fail before the export when their shards
+    can't be merged, and if Avro defaults to DEFLATE.
+    """
+
+    monkeypatch.setattr(download_module, "_snappy_dependencies", False)
+    with pytest.raises(BaseDosDadosMissingDependencyException):
+        download(
+            tmp_path / "test.avro",
+            query="select 1",
+            billing_project_id=TEST_PROJECT_ID,
+            compression="snappy",
+        )
+    assert _EXPORT_FORMATS[".avro"] == ("AVRO", "DEFLATE")
+
+
+class _Job:
+    """
+    Stand-in for a BigQuery job that finishes after a number of waits.
+    """
+
+    job_id = "job"
+    total_bytes_processed = 10
+    cache_hit = False
+
+    def __init__(self, waits):
+        self.waits = waits
+        self.cancelled = False
+
+    def result(self, timeout=None):
+        if self.waits > 0:
+            self.waits -= 1
+            time.sleep(timeout)
+            raise FutureTimeoutError
+        return []
+
+    def cancel(self):
+        self.cancelled = True
+
+
+def test_wait_for():
+    """
+    Test if `_wait_for` waits until the job is done and returns its statistics.
+    """
+
+    job = _Job(waits=2)
+    statistics = _wait_for(job, initial_delay=0.01)
+
+    assert job.waits == 0
+    assert statistics.job_id == "job"
+    assert statistics.total_bytes_processed == 10
+    assert statistics.cache_hit is False
+    assert statistics.slot_millis is None
+
+
+def test_wait_for_timeout():
+    """
+    Test if `_wait_for` cancels the job once the timeout is reached.
+    """
+
+    job = _Job(waits=1000)
+    with pytest.raises(BaseDosDadosException):
+        _wait_for(job, timeout=0.05, initial_delay=0.01)
+
+    assert job.cancelled
+
+
+class _StorageClient:
+    """
+    Stand-in for a Storage client, recording the blobs deleted per batch.
+    """
+
+    project = "project"
+
+    def __init__(self, n_blobs, missing_blobs=()):
+        self.blobs = [_Blob(self, f"table-{i:012d}") for i in range(n_blobs)]
+        self.missing_blobs = set(missing_blobs)
+        self.batches = []
+        self.deleted_buckets = []
+
+    def bucket(self, bucket_name, user_project=None):
+        return _Bucket(self, bucket_name)
+
+    def batch(self):
+        return _Batch(self)
+
+    def lookup_bucket(self, bucket_name):
+        return _Bucket(self, bucket_name)
+
+
+class _Bucket:
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+
+    def list_blobs(self, prefix=None):
+        return iter(self.client.blobs)
+
+    def delete(self):
+        self.client.deleted_buckets.append(self.name)
+
+
+class _Batch:
+    def __init__(self, client):
+        self.client = client
+
+    def __enter__(self):
+        self.client._batch = []
+        self.client.batches.append(self.client._batch)
+
+    def __exit__(self, *args):
+        # like GCS, apply every call and then raise the error of a failed one
+        if self.client.missing_blobs.intersection(self.client._batch):
+            raise NotFound("blob not found")
+
+
+class _Blob:
+    size = 0
+    crc32c = "AAAAAA=="
+
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+
+    def delete(self):
+        self.client._batch.append(self.name)
+
+
+def test_delete_bucket():
+    """
+    Test if buckets with many blobs are emptied in batches and deleted.
+    """
+
+    storage_client = _StorageClient(n_blobs=1000)
+    _delete_bucket({"storage": storage_client}, "bucket")
+
+    assert len(storage_client.batches) == 10
+    assert sum(len(batch) for batch in storage_client.batches) == 1000
+    assert storage_client.deleted_buckets == ["bucket"]
+
+
+def test_delete_bucket_missing_blob():
+    """
+    Test if a blob deleted since the bucket was listed doesn't prevent the
+    bucket from being deleted.
+    """
+
+    storage_client = _StorageClient(
+        n_blobs=250, missing_blobs=["table-000000000150"]
+    )
+    _delete_bucket({"storage": storage_client}, "bucket")
+
+    assert len(storage_client.batches) == 3
+    assert storage_client.deleted_buckets == ["bucket"]
+
+
+def test_direct_download_resumable_failed_export(tmp_path, monkeypatch):
+    """
+    Test if a resumable download that fails before writing its manifest
+    exports to the staging bucket and removes the exported files.
+    """
+
+    def _move_table_to_bucket(client, dataset_id, table_id, blob_path, *args):
+        buckets.append(blob_path)
+        raise BaseDosDadosException("Extract job failed")
+
+    buckets = []
+    monkeypatch.setattr(
+        download_module, "_move_table_to_bucket", _move_table_to_bucket
+    )
+    storage_client = _StorageClient(n_blobs=2)
+    savepath = tmp_path / "test.csv"
+
+    with pytest.raises(Exception, match="Extract job failed"):
+        _direct_download(
+            {"storage": storage_client},
+            "dataset",
+            "table",
+            savepath,
+            resumable=True,
+        )
+
+    assert buckets[0].startswith("gs://basedosdados-tmp-project/")
+    assert storage_client.batches == [[b.name for b in storage_client.blobs]]
+    assert storage_client.deleted_buckets == []
+    assert not (tmp_path / "test.csv.tmp").exists()
+
+
+def test_read_manifest_other_source(tmp_path):
+    """
+    Test if a manifest is only resumed by a download of the same query or
+    table, columns, filters and limit.
+    """
+
+    client = {"storage": _StorageClient(n_blobs=2)}
+    savepath = tmp_path / "test.csv"
+    source = _manifest_source(
+        None, "dataset", "table", filters=[("data", ">=", datetime.date.min)]
+    )
+    _write_manifest(
+        client, savepath, "bucket", "", "CSV", "GZIP", True, source
+    )
+
+    assert _read_manifest(client, savepath, "CSV", "GZIP", source) is not None
+    assert (
+        _read_manifest(
+            client,
+            savepath,
+            "CSV",
+            "GZIP",
+            _manifest_source("select 1", None, None),
+        )
+        is None
+    )
+    assert not (tmp_path / "test.csv.manifest.json").exists()
+
+
+def test_direct_download_removes_stale_shards(tmp_path, monkeypatch):
+    """
+    Test if shards left by a download that can't be resumed are not joined
+    into the file of a new export.
+    """
+
+    def _download_blob_from_bucket(client, bucket_name, savepath, *args, **kw):
+        (savepath / "000000000000.csv").write_bytes(b"id\n1\n")
+
+    monkeypatch.setattr(download_module, "_create_bucket", lambda *args: None)
+    monkeypatch.setattr(
+        download_module, "_move_table_to_bucket", lambda *args: None
+    )
+    monkeypatch.setattr(
+        download_module,
+        "_download_blob_from_bucket",
+        _download_blob_from_bucket,
+    )
+    savepath = tmp_path / "test.csv"
+    (tmp_path / "test.csv.tmp").mkdir()
+    (tmp_path / "test.csv.tmp" / "000000000001.csv").write_bytes(b"id\n2\n")
+
+    _direct_download(
+        {"storage": _StorageClient(n_blobs=0)},
+        "dataset",
+        "table",
+        savepath,
+        compression="NONE",
+    )
+
+    assert savepath.read_bytes() == b"id\n1\n"
+
+
+def test_direct_download_unique_buckets(tmp_path, monkeypatch):
+    """
+    Test if downloads started at the same time get different buckets.
+    """
+
+    buckets = []
+    monkeypatch.setattr(
+        download_module,
+        "_create_bucket",
+        lambda client, bucket_name: buckets.append(bucket_name),
+    )
+    monkeypatch.setattr(
+        download_module, "_move_table_to_bucket", lambda *args: None
+    )
+    monkeypatch.setattr(download_module.time, "time", lambda: 0.0)
+
+    for name in ["a.csv", "b.csv"]:
+        _direct_download(
+            {"storage": _StorageClient(n_blobs=0)},
+            "br_ibge_pib",
+            "municipio",
+            tmp_path / name,
+            compression="NONE",
+        )
+
+    assert len(set(buckets)) == 2
+    assert all(len(bucket) <= 63 for bucket in buckets)
+
+
+class _ShardBlob:
+    """
+    Stand-in for an exported shard, recording whether it was downloaded.
+    """
+
+    def __init__(self, name, content):
+        self.name = name
+        self.content = content
+        self.size = len(content)
+        self.crc32c = base64.b64encode(
+            google_crc32c.Checksum(content).digest()
+        ).decode("utf-8")
+        self.downloaded = False
+
+    def download_to_filename(self, filename, checksum=None):
+        self.downloaded = True
+        Path(filename).write_bytes(self.content)
+
+
+class _TruncatedBlob(_ShardBlob):
+    """
+    Stand-in for a shard whose first downloads are truncated.
+    """
+
+    def __init__(self, name, content, truncated):
+        super().__init__(name, content)
+        self.truncated = truncated
+        self.downloads = 0
+
+    def download_to_filename(self, filename, checksum=None):
+        self.downloads += 1
+        content = self.content
+        if self.downloads <= self.truncated:
+            content = content[:-1]
+        Path(filename).write_bytes(content)
+
+
+def test_verify_file(tmp_path):
+    """
+    Test if files are checked against their size and CRC32C checksum.
+    """
+
+    blob = _ShardBlob("table-000000000000", b"id\n1\n")
+    filepath = tmp_path / "000000000000.csv"
+
+    assert not _verify_file(filepath, blob.size, blob.crc32c)
+    filepath.write_bytes(b"id\n2\n")
+    assert not _verify_file(filepath, blob.size, blob.crc32c)
+    filepath.write_bytes(blob.content)
+    assert _verify_file(filepath, blob.size, blob.crc32c)
+
+
+def test_download_blob_from_bucket_resume(tmp_path):
+    """
+    Test if shards already downloaded and verified are skipped on resume.
+    """
+
+    storage_client = _StorageClient(n_blobs=0)
+    storage_client.blobs = [
+        _ShardBlob(f"table-{i:012d}", f"id\n{i}\n".encode()) for i in range(3)
+    ]
+    manifest = {
+        "shards": [
+            {"name": blob.name, "size": blob.size, "crc32c": blob.crc32c}
+            for blob in storage_client.blobs
+        ]
+    }
+    (tmp_path / "000000000000.csv").write_bytes(b"id\n0\n")
+    (tmp_path / "000000000001.csv").write_bytes(b"id\n")
+
+    _download_blob_from_bucket(
+        {"storage": storage_client},
+        "bucket",
+        tmp_path,
+        ".csv",
+        manifest=manifest,
+    )
+
+    assert [blob.downloaded for blob in storage_client.blobs] == [
+        False,
+        True,
+        True,
+    ]
+    assert (tmp_path / "000000000001.csv").read_bytes() == b"id\n1\n"
+
+
+def test_download_blob_truncated(tmp_path):
+    """
+    Test if truncated shards are downloaded again, up to the retry limit.
+    """
+
+    filepath = tmp_path / "000000000000.csv"
+    blob = _TruncatedBlob("table-000000000000", b"id\n1\n", truncated=2)
+    _download_blob(blob, filepath)
+
+    assert blob.downloads == 3
+    assert filepath.read_bytes() == blob.content
+
+    blob = _TruncatedBlob("table-000000000000", b"id\n1\n", truncated=3)
+    with pytest.raises(BaseDosDadosException):
+        _download_blob(blob, filepath)
+
+
+class _DryRunClient:
+    """
+    Stand-in for a BigQuery client whose dry runs process a number of bytes.
+    """
+
+    def __init__(self, total_bytes_processed):
+        self.total_bytes_processed = total_bytes_processed
+        self.queries = 0
+
+    def query(self, query, job_config=None):
+        self.queries += 1
+        return SimpleNamespace(
+            total_bytes_processed=self.total_bytes_processed
+        )
+
+
+def test_check_bytes_processed():
+    """
+    Test if queries are only refused above `maximum_bytes_billed`.
+    """
+
+    client = {"bigquery": _DryRunClient(total_bytes_processed=100)}
+
+    _check_bytes_processed(client, "select 1")
+    assert client["bigquery"].queries == 0
+
+    _check_bytes_processed(client, "select 1", maximum_bytes_billed=100)
+    with pytest.raises(BaseDosDadosMaximumBytesBilledException):
+        _check_bytes_processed(client, "select 1", maximum_bytes_billed=99)
+    # there is no terminal to confirm the query in
+    with pytest.raises(BaseDosDadosMaximumBytesBilledException):
+        _check_bytes_processed(
+            client, "select 1", maximum_bytes_billed=99, confirm=True
+        )
+
+
+class _QueryClient:
+    """
+    Stand-in for a BigQuery client answering queries with an Arrow table.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.queries = 0
+        self.dry_runs = 0
+
+    def query(self, query, job_config=None):
+        if job_config is not None and job_config.dry_run:
+            self.dry_runs += 1
+            return SimpleNamespace(
+                total_bytes_processed=1,
+                referenced_tables=[
+                    SimpleNamespace(
+                        project="basedosdados",
+                        dataset_id="br_ibge_pib",
+                        table_id="municipio",
+                    )
+                ],
+            )
+        self.queries += 1
+        return SimpleNamespace(result=lambda: self)
+
+    def to_arrow(self, bqstorage_client=None, create_bqstorage_client=True):
+        return self.table
+
+    def get_table(self, table_id):
+        return SimpleNamespace(
+            modified=datetime.datetime(
+                2020, 1, 1, tzinfo=datetime.timezone.utc
+            )
+        )
+
+
+def _nullable_table():
+    return pa.table(
+        {
+            "id": pa.array([1, None], pa.int64()),
+            "flag": pa.array([True, None], pa.bool_()),
+            "data": pa.array([datetime.date(2020, 1, 1), None], pa.date32()),
+            "valor": pa.array([1.5, None], pa.float64()),
+        }
+    )
+
+
+def test_read_sql_pandas_pooled_client(monkeypatch):
+    """
+    Test if DataFrames are read with the pooled clients and get the nullable
+    dtypes of pandas-gbq.
+    """
+
+    bigquery_client = _QueryClient(_nullable_table())
+    monkeypatch.setattr(
+        download_module,
+        "_google_client",
+        lambda *args: {"bigquery": bigquery_client},
+    )
+
+    df = read_sql("select 1", billing_project_id=TEST_PROJECT_ID)
+
+    assert bigquery_client.queries == 1
+    assert df.dtypes.astype(str).to_dict() == {
+        "id": "Int64",
+        "flag": "boolean",
+        "data": "dbdate",
+        "valor": "float64",
+    }
+
+
+def test_read_sql_cache_dtypes(tmp_path, monkeypatch):
+    """
+    Test if cached results have the dtypes of uncached ones and if a cache
+    miss runs a single dry run.
+    """
+
+    bigquery_client = _QueryClient(_nullable_table())
+    monkeypatch.setattr(
+        download_module,
+        "_google_client",
+        lambda *args: {"bigquery": bigquery_client},
+    )
+    monkeypatch.setattr(config, "project_config_path", str(tmp_path))
+    kwargs = dict(billing_project_id=TEST_PROJECT_ID, maximum_bytes_billed=10)
+
+    uncached = read_sql("select 1", **kwargs)
+    bigquery_client.dry_runs = 0
+    first = read_sql("select 1", use_cache=True, **kwargs)
+    assert bigquery_client.dry_runs == 1
+
+    second = read_sql("select 1", use_cache=True, **kwargs)
+    assert bigquery_client.queries == 2
+    pd.testing.assert_frame_equal(first, uncached)
+    pd.testing.assert_frame_equal(second, uncached)
+
+
+def test_read_table_direct_read_dtypes(monkeypatch):
+    """
+    Test if tables read directly get the same dtypes as when queried.
+    """
+
+    monkeypatch.setattr(download_module, "_google_client", lambda *args: {})
+    monkeypatch.setattr(download_module, "_is_table", lambda *args: True)
+    monkeypatch.setattr(
+        download_module, "_create_read_session", lambda *args, **kw: None
+    )
+    monkeypatch.setattr(
+        download_module,
+        "_read_session_to_arrow",
+        lambda *args: _nullable_table(),
+    )
+
+    df = read_table(
+        "dataset",
+        "table",
+        billing_project_id=TEST_PROJECT_ID,
+        direct_read=True,
+    )
+
+    assert df.dtypes.astype(str).to_dict() == {
+        "id": "Int64",
+        "flag": "boolean",
+        "data": "dbdate",
+        "valor": "float64",
+    }
+
+
+class _ReadRowsClient:
+    """
+    Stand-in for a BigQuery Storage client whose streams wait for each other
+    before returning their first page, so they must be read in parallel.
+    """
+
+    def __init__(self, n_streams, n_pages):
+        self.n_pages = n_pages
+        self.barrier = threading.Barrier(n_streams, timeout=5)
+
+    def read_rows(self, name):
+        return SimpleNamespace(
+            rows=lambda session: SimpleNamespace(pages=self._pages(name))
+        )
+
+    def _pages(self, name):
+        self.barrier.wait()
+        for i in range(self.n_pages):
+            batch = pa.record_batch([pa.array([f"{name}-{i}"])], ["page"])
+            yield SimpleNamespace(to_arrow=lambda batch=batch: batch)
+
+
+def test_iter_read_session_parallel():
+    """
+    Test if the streams of a read session are read in parallel and all of
+    their batches are yielded.
+    """
+
+    session = SimpleNamespace(
+        streams=[SimpleNamespace(name=f"stream_{i}") for i in range(3)]
+    )
+    client = {"bigquery_storage": _ReadRowsClient(n_streams=3, n_pages=2)}
+
+    pages = [
+        batch.column(0)[0].as_py()
+        for batch in _iter_read_session(client, session)
+    ]
+
+    assert sorted(pages) == [
+        f"stream_{i}-{j}" for i in range(3) for j in range(2)
+    ]
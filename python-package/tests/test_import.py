@@ -0,0 +1,96 @@
+"""
+Tests for the lazy imports of the package.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+from basedosdados import _LAZY_ATTRIBUTES
+
+# Modules that take most of the import time
+HEAVY_MODULES = [
+    "pandas",
+    "pandas_gbq",
+    "pyarrow",
+    "pydata_google_auth",
+    "googleapiclient.discovery",
+    "google.cloud.bigquery",
+    "google.cloud.bigquery_storage_v1",
+    "google.cloud.bigquery_connection_v1",
+    "google.cloud.storage",
+]
+
+
+def _imported_modules(
+    code: str, modules: list[str] = HEAVY_MODULES
+) -> set[str]:
+    """
+    Run `code` in a new interpreter and get which of `modules` it imported.
+    """
+    script = (
+        f"import sys\n{code}\n"
+        f"print(*[m for m in {modules!r} if m in sys.modules])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", script],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return set(result.stdout.split())
+
+
+def test_import_is_lazy():
+    """
+    Test if importing the package does not import heavy modules.
+    """
+
+    assert _imported_modules("import basedosdados") == set()
+
+
+def test_metadata_import_is_lazy():
+    """
+    Test if using the metadata functions does not import heavy modules.
+    """
+
+    assert (
+        _imported_modules("import basedosdados as bd\nbd.get_tables") == set()
+    )
+
+
+@pytest.mark.parametrize(
+    "name", ["read_sql", "download", "Table", "Base", "Backend"]
+)
+def test_lazy_attributes(name):
+    """
+    Test if lazy attributes resolve to the objects of their submodules.
+    """
+
+    import basedosdados
+
+    assert getattr(basedosdados, name).__name__ == name
+    assert name in dir(basedosdados)
+
+
+def test_download_is_function():
+    """
+    Test if `download` is the function, not the subpackage of the same name.
+    """
+
+    import basedosdados
+    import basedosdados.download.metadata  # noqa: F401
+
+    assert callable(basedosdados.download)
+
+
+def test_import_loads_no_submodules():
+    """
+    Test if importing the package does not import the submodules behind its
+    lazy attributes, which is what kept the import slow.
+    """
+
+    submodules = sorted(set(_LAZY_ATTRIBUTES.values()))
+
+    assert _imported_modules("import basedosdados", submodules) == set()
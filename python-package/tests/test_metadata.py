@@ -152,3 +152,51 @@ def test_search_size():
 
     out = metadata.search(q="", backend=backend)
     assert len(out) > 0
+
+
+class _Backend:
+    """
+    Stand-in for a backend with `n_tables` tables, recording pages requested.
+    """
+
+    def __init__(self, n_tables):
+        self.n_tables = n_tables
+        self.pages = []
+
+    def get_tables(self, dataset_id, table_id, table_name, page, page_size):
+        self.pages.append(page)
+        start = (page - 1) * page_size
+        return {
+            "items": [
+                {"slug": f"table_{i}"}
+                for i in range(start, min(start + page_size, self.n_tables))
+            ],
+            "page": page,
+            "page_size": page_size,
+            "page_total": -(-self.n_tables // page_size),
+        }
+
+
+def test_iter_tables():
+    """
+    Test if all tables are iterated over, in order, including the last page.
+    """
+
+    backend = _Backend(n_tables=25)
+
+    out = list(metadata.iter_tables(page_size=10, backend=backend))
+    assert [table["slug"] for table in out] == [
+        f"table_{i}" for i in range(25)
+    ]
+    assert sorted(backend.pages) == [1, 2, 3]
+
+
+def test_iter_tables_empty():
+    """
+    Test if iterating over no tables requests a single page.
+    """
+
+    backend = _Backend(n_tables=0)
+
+    assert list(metadata.iter_tables(backend=backend)) == []
+    assert backend.pages == [1]
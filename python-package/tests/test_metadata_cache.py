@@ -0,0 +1,108 @@
+"""
+Tests for the caches of responses of the metadata backend.
+"""
+
+import pytest
+
+from basedosdados.constants import config
+from basedosdados.core.metadata_cache import (
+    DiskCache,
+    LRUCache,
+    MemoryCache,
+    MetadataCache,
+)
+
+
+@pytest.fixture(params=["memory", "lru", "disk"])
+def cache(request, tmp_path):
+    if request.param == "memory":
+        return MemoryCache()
+    if request.param == "lru":
+        return LRUCache()
+    return DiskCache(tmp_path / "metadata_cache")
+
+
+def test_key():
+    """
+    Test if keys ignore whitespace in the query and the order of variables.
+    """
+
+    key = MetadataCache.key("query { a }", {"x": 1, "y": 2})
+    assert key == MetadataCache.key("query {\n    a\n}", {"y": 2, "x": 1})
+    assert key != MetadataCache.key("query { a }", {"x": 1, "y": 3})
+    assert MetadataCache.key("query { a }") == MetadataCache.key(
+        "query { a }", {}
+    )
+
+
+def test_abstract():
+    """
+    Test if the base class can't be used without storage.
+    """
+
+    with pytest.raises(TypeError):
+        MetadataCache()
+
+
+def test_get_set(cache):
+    """
+    Test if stored responses are returned until invalidated.
+    """
+
+    assert cache.get("a") is None
+    cache.set("a", {"allDataset": {"items": []}}, etag='"1"')
+    cache.set("b", {})
+
+    entry = cache.get("a")
+    assert entry.value == {"allDataset": {"items": []}}
+    assert entry.etag == '"1"'
+    assert not entry.expired
+
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    cache.invalidate()
+    assert cache.get("b") is None
+
+
+def test_ttl(cache, monkeypatch):
+    """
+    Test if expired responses are dropped, unless they can be revalidated
+    with their ETag.
+    """
+
+    monkeypatch.setattr(config, "metadata_cache_ttl", 0)
+    cache.set("a", {})
+    cache.set("b", {}, etag='"1"')
+
+    assert cache.get("a") is None
+    assert cache.get("b").expired
+
+    cache.ttl = 60
+    cache.set("a", {})
+    assert not cache.get("a").expired
+
+
+def test_lru_max_size():
+    """
+    Test if the least recently used responses are evicted.
+    """
+
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a").value == 1
+    assert cache.get("c").value == 3
+
+
+def test_disk_cache_is_shared(tmp_path):
+    """
+    Test if responses stored on disk are seen by other instances.
+    """
+
+    DiskCache(tmp_path).set("a", {"x": [1, 2]})
+    assert DiskCache(tmp_path).get("a").value == {"x": [1, 2]}
@@ -0,0 +1,111 @@
+"""
+Tests for the `TableMetadataCache` class.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from google.api_core.exceptions import NotFound
+
+from basedosdados.constants import config
+from basedosdados.core.table_metadata import TableMetadataCache
+
+TABLE_ID = "basedosdados.br_ibge_pib.municipio"
+
+
+class _Client:
+    """
+    Stand-in for a BigQuery client, counting `get_table` requests.
+    """
+
+    project = "basedosdados"
+
+    def __init__(self, tables):
+        self.tables = tables
+        self.requests = 0
+
+    def get_table(self, table_id):
+        self.requests += 1
+        if table_id not in self.tables:
+            raise NotFound(table_id)
+        return SimpleNamespace(
+            table_type="TABLE",
+            schema=[],
+            num_rows=10,
+            num_bytes=100,
+            modified=None,
+        )
+
+
+def test_get():
+    """
+    Test if metadata is fetched once per table while it is fresh.
+    """
+
+    cache = TableMetadataCache()
+    client = _Client([TABLE_ID])
+
+    metadata = cache.get(client, TABLE_ID)
+    # ids without project use the project of the client
+    assert cache.get(client, "br_ibge_pib.municipio") is metadata
+    assert client.requests == 1
+    assert metadata.table_id == TABLE_ID
+    assert metadata.table_type == "TABLE"
+    assert metadata.num_rows == 10
+
+
+def test_get_ttl(monkeypatch):
+    """
+    Test if metadata older than `config.table_metadata_ttl` is fetched again.
+    """
+
+    monkeypatch.setattr(config, "table_metadata_ttl", -1)
+    cache = TableMetadataCache()
+    client = _Client([TABLE_ID])
+
+    cache.get(client, TABLE_ID)
+    cache.get(client, TABLE_ID)
+    assert client.requests == 2
+
+
+def test_get_not_found():
+    """
+    Test if missing tables raise and are not cached.
+    """
+
+    cache = TableMetadataCache()
+    client = _Client([])
+
+    for _ in range(2):
+        with pytest.raises(NotFound):
+            cache.get(client, TABLE_ID)
+    assert client.requests == 2
+
+
+def test_invalidate():
+    """
+    Test if invalidated tables are fetched again.
+    """
+
+    cache = TableMetadataCache()
+    client = _Client([TABLE_ID])
+
+    cache.get(client, TABLE_ID)
+    cache.invalidate(TABLE_ID)
+    cache.get(client, TABLE_ID)
+    assert client.requests == 2
+
+
+def test_max_size():
+    """
+    Test if the least recently used tables are evicted.
+    """
+
+    tables = [f"basedosdados.dataset.table_{i}" for i in range(3)]
+    cache = TableMetadataCache(max_size=2)
+    client = _Client(tables)
+
+    for table_id in tables:
+        cache.get(client, table_id)
+    cache.get(client, tables[0])
+    assert client.requests == 4